@@ -0,0 +1,285 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Battle AI Module
+
+Search-based choice of Attack ('1'), Ability ('2') or Run ('3') in a
+SimpleBattle, for either side: as the player's policy it is an auto-play
+bot, as the enemy's it makes enemies that flee fights they would lose.
+
+A battle is reduced to (player health, enemy health, ability cooldown,
+side to move); damage per hit is fixed for a matchup, so that is all
+that changes. Expectimax searches it: the player maximizes, the enemy
+minimizes, and the coin flips in the rules (attempt_escape and
+critical abilities such as the rogue's) are averaged. Values are from the player's side:
+winning is worth about 1, losing -1, either side escaping 0.
+
+Searches deepen one ply at a time until max_depth or the time budget
+runs out, keeping the answer of the last finished depth. Every state
+valued is kept in a transposition table, which survives between turns
+of the same matchup, so later turns mostly look results up.
+
+Usage: python battle_ai.py [class] [enemy_type] [battles]
+"""
+
+import sys
+import time
+
+import character_manager
+import combat_system
+
+ATTACK = '1'
+ABILITY = '2'
+RUN = '3'
+
+ACTION_NAMES = {ATTACK: "Attack", ABILITY: "Ability", RUN: "Run"}
+
+# Chance that attempt_escape succeeds
+ESCAPE_CHANCE = 0.5
+
+# Values of the end states, from the player's side
+WIN = 1.0
+LOSS = -1.0
+ESCAPED = 0.0
+
+DEFAULT_DEPTH = 12
+DEFAULT_TIME_BUDGET = 0.002
+
+# Nodes between clock checks
+TIME_CHECK_INTERVAL = 256
+
+# The table is cleared when it grows past this many states
+MAX_TABLE_SIZE = 200000
+
+class _OutOfTime(Exception):
+    """Raised inside a search when the time budget is spent"""
+
+def ability_outcomes(character, ability):
+    """
+    Describe what a compiled ability (see combat_system.compile_ability)
+    does for character, as chance outcomes
+
+    Returns: List of (probability, damage to the enemy, health restored)
+    """
+    definition = ability['definition']
+    if ability['effect'] == 'heal':
+        return [(1.0, 0, definition['AMOUNT'])]
+
+    base = character.get(definition['STAT'], 0)
+    if ability['effect'] == 'critical':
+        chance = definition['CHANCE']
+        return [(chance, base * definition['MULTIPLIER'], 0),
+                (1 - chance, base * definition.get('FAIL_MULTIPLIER', 1), 0)]
+    return [(1.0, base * definition['MULTIPLIER'], 0)]
+
+# ============================================================================
+# POLICY
+# ============================================================================
+
+class ExpectimaxPolicy:
+    """
+    Chooses battle actions by expectimax search
+
+    Give one to SimpleBattle as player_policy or enemy_policy.
+    """
+
+    def __init__(self, max_depth=DEFAULT_DEPTH, time_budget=DEFAULT_TIME_BUDGET):
+        """
+        max_depth is in plies (one side's move); time_budget is in seconds
+        per decision (None for no limit)
+        """
+        self.max_depth = max_depth
+        self.time_budget = time_budget
+        self.table = {}
+        self.model = None
+        self.deadline = None
+        self.stats = {'decisions': 0, 'nodes': 0, 'table_hits': 0, 'depth_reached': 0, 'seconds': 0.0}
+
+    def choose_action(self, battle, side='player'):
+        """
+        Pick the best action for one side of a SimpleBattle
+
+        Returns: '1' (Attack), '2' (Ability) or '3' (Run)
+        """
+        start = time.perf_counter()
+        scores = self.score_actions(battle, side)
+        self.stats['decisions'] += 1
+        self.stats['seconds'] += time.perf_counter() - start
+
+        best = None
+        for action in scores:
+            if best is None:
+                best = action
+            elif side == 'player' and scores[action] > scores[best]:
+                best = action
+            elif side == 'enemy' and scores[action] < scores[best]:
+                best = action
+        return best
+
+    def score_actions(self, battle, side='player'):
+        """
+        Value every action available to one side
+
+        Returns: Dictionary of {action: expected value for the player}
+                 from the deepest search finished within the budget
+        """
+        self._use_model(battle)
+        state = self._state(battle)
+        self.deadline = None
+        if self.time_budget is not None:
+            self.deadline = time.perf_counter() + self.time_budget
+
+        scores = {}
+        depth = 1
+        while depth <= self.max_depth:
+            try:
+                current = {}
+                for action in self._actions(side, state[2]):
+                    current[action] = self._action_value(state, side, action, depth)
+            except _OutOfTime:
+                break
+            scores = current
+            self.stats['depth_reached'] = depth
+            depth += 1
+
+        if not scores:
+            # Not even one ply fit in the budget; judge on the spot
+            for action in self._actions(side, state[2]):
+                scores[action] = self._action_value(state, side, action, 0)
+        return scores
+
+    # ------------------------------------------------------------------
+    # Model
+    # ------------------------------------------------------------------
+
+    def _use_model(self, battle):
+        """Describe the matchup; the table is kept only while it is unchanged"""
+        character = battle.character
+        enemy = battle.enemy
+        ability = combat_system.get_class_ability(character.get('class', 'Warrior'))
+        model = {
+            'player_damage': combat_system.calculate_damage(character, enemy),
+            'enemy_damage': combat_system.calculate_damage(enemy, character),
+            'player_max': max(1, character.get('max_health', 1)),
+            'enemy_max': max(1, enemy.get('max_health', 1)),
+            'ability': (),
+            'ability_number': None,
+            'ability_cooldown': 0,
+        }
+        if ability is not None:
+            model['ability'] = tuple(ability_outcomes(character, ability))
+            model['ability_number'] = combat_system.ability_numbers[ability['id']]
+            model['ability_cooldown'] = ability['cooldown']
+        if model != self.model or len(self.table) > MAX_TABLE_SIZE:
+            self.model = model
+            self.table = {}
+
+    def _state(self, battle):
+        """Return (player health, enemy health, cooldown) for the turn being played"""
+        cooldown = 0
+        number = self.model['ability_number']
+        if number is not None and number < len(battle.ability_last_turn):
+            cooldown = battle.ability_last_turn[number] + self.model['ability_cooldown'] - battle.turn_counter
+        return (battle.character['health'], battle.enemy['health'], max(0, cooldown))
+
+    def _actions(self, side, cooldown):
+        """Actions a side can take"""
+        if side == 'enemy':
+            return [ATTACK, RUN]
+        if cooldown == 0 and self.model['ability']:
+            return [ATTACK, ABILITY, RUN]
+        return [ATTACK, RUN]
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def _value(self, player_health, enemy_health, cooldown, side, depth):
+        """Expected value of a state with side to move"""
+        model = self.model
+        if enemy_health <= 0:
+            return WIN + 0.5 * player_health / model['player_max']
+        if player_health <= 0:
+            return LOSS
+        if depth <= 0:
+            return player_health / model['player_max'] - enemy_health / model['enemy_max']
+
+        key = (player_health, enemy_health, cooldown, side)
+        entry = self.table.get(key)
+        if entry is not None and entry[0] >= depth:
+            self.stats['table_hits'] += 1
+            return entry[1]
+
+        self.stats['nodes'] += 1
+        if self.deadline is not None and self.stats['nodes'] % TIME_CHECK_INTERVAL == 0:
+            if time.perf_counter() > self.deadline:
+                raise _OutOfTime()
+
+        state = (player_health, enemy_health, cooldown)
+        best = None
+        for action in self._actions(side, cooldown):
+            value = self._action_value(state, side, action, depth)
+            if best is None or (side == 'player' and value > best) or (side == 'enemy' and value < best):
+                best = value
+
+        self.table[key] = (depth, best)
+        return best
+
+    def _action_value(self, state, side, action, depth):
+        """Expected value of one side taking an action in state"""
+        player_health, enemy_health, cooldown = state
+        model = self.model
+
+        if depth <= 0:
+            return self._value(player_health, enemy_health, cooldown, side, 0)
+
+        if side == 'player':
+            if action == ATTACK:
+                return self._value(player_health, enemy_health - model['player_damage'], cooldown, 'enemy', depth - 1)
+            if action == ABILITY:
+                total = 0.0
+                for chance, damage, healing in model['ability']:
+                    healed = min(model['player_max'], player_health + healing)
+                    total += chance * self._value(healed, enemy_health - damage, model['ability_cooldown'], 'enemy', depth - 1)
+                return total
+            return (ESCAPE_CHANCE * ESCAPED
+                    + (1 - ESCAPE_CHANCE) * self._value(player_health, enemy_health, cooldown, 'enemy', depth - 1))
+
+        # The enemy's move ends the turn, bringing the ability a turn closer
+        next_cooldown = max(0, cooldown - 1)
+        if action == ATTACK:
+            return self._value(player_health - model['enemy_damage'], enemy_health, next_cooldown, 'player', depth - 1)
+        return (ESCAPE_CHANCE * ESCAPED
+                + (1 - ESCAPE_CHANCE) * self._value(player_health, enemy_health, next_cooldown, 'player', depth - 1))
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    import random
+    import renderer
+
+    char_class = sys.argv[1] if len(sys.argv) > 1 else "Rogue"
+    enemy_type = sys.argv[2] if len(sys.argv) > 2 else "dragon"
+    battles = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+
+    renderer.set_renderer(renderer.new_renderer("silent"))
+    for label, make_policy in [("always attack", lambda: None), ("expectimax bot", ExpectimaxPolicy)]:
+        random.seed(163)
+        policy = make_policy()
+        outcomes = {'player': 0, 'enemy': 0, 'none': 0}
+        i = 0
+        while i < battles:
+            character = character_manager.create_character("Bot", char_class)
+            battle = combat_system.SimpleBattle(character, combat_system.create_enemy(enemy_type),
+                                                player_policy=policy)
+            outcomes[battle.start_battle()['winner']] += 1
+            i += 1
+
+        line = f"{label:>15}: won {outcomes['player']}, lost {outcomes['enemy']}, escaped {outcomes['none']}"
+        if policy is not None:
+            stats = policy.stats
+            line += (f" | {stats['seconds'] / max(stats['decisions'], 1) * 1000:.3f} ms per decision, "
+                     f"{stats['table_hits']} table hits, {stats['nodes']} nodes")
+        print(line)
+    renderer.set_renderer(None)
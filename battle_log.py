@@ -0,0 +1,379 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Battle Log Module
+
+Every battle records what happened as a compact stream of events, so a
+finished battle can be audited or reproduced later. A log is a bytearray:
+
+    header   MAGIC, then each combatant's name, class (or enemy type),
+             health, max_health, strength and magic as it was when the
+             battle started
+    events   one byte holding the event kind (high 4 bits) and the actor
+             (low 4 bits; 15 means the actor number follows), then the
+             event's fields
+
+Numbers are unsigned varints (7 bits per byte), so an ordinary attack
+costs 3 bytes and a whole turn well under 10. Random draws are logged
+too: replay() rebuilds every combatant's health from the events alone,
+and rerun_battle() plays the battle again through SimpleBattle feeding it
+the recorded draws and status effects, which must give back the same log
+byte for byte.
+
+Logs are stored many to a file, each prefixed with its length (see
+append_log and read_logs).
+
+Usage: python battle_log.py <log_file> [--show=N]
+"""
+
+import sys
+
+MAGIC = b"QB\x01"
+
+# Event kinds
+TURN = 0      # a new turn starts
+ATTACK = 1    # target, damage: a basic attack
+ABILITY = 2   # ability: the actor uses a special ability (effects follow)
+DAMAGE = 3    # target, damage: damage from an ability or status effect
+HEAL = 4      # target, amount: from an ability or status effect
+ESCAPE = 5    # success (1 or 0)
+DRAW = 6      # value: a random draw (a choice index, or random() in 1/65536ths)
+END = 7       # winner: 0 nobody (escaped), 1 player side, 2 enemy side
+STATUS = 8    # target, effect, duration, amount (signed): a status effect starts (see status_effects)
+
+EVENT_NAMES = ["turn", "attack", "ability", "damage", "heal", "escape", "draw", "end", "status"]
+
+# Number of fields each event kind carries
+EVENT_FIELDS = [0, 2, 1, 2, 2, 1, 1, 1, 4]
+
+WINNER_CODES = {'none': 0, 'player': 1, 'enemy': 2}
+WINNERS = ['none', 'player', 'enemy']
+
+# Resolution of logged random() draws
+DRAW_SCALE = 65536
+
+# Actor numbers from here on are written after the event byte
+EXTENDED_ACTOR = 15
+
+# ============================================================================
+# ENCODING
+# ============================================================================
+
+def _put(data, value):
+    """Append value as an unsigned varint"""
+    if value < 0:
+        raise ValueError(f"Battle log values must not be negative (got {value})")
+    while value >= 0x80:
+        data.append((value & 0x7F) | 0x80)
+        value >>= 7
+    data.append(value)
+
+def _get(data, offset):
+    """Read a varint; returns (value, next offset)"""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+def signed(value):
+    """Map a signed number onto the unsigned values a field holds (0, -1, 1, -2, ... -> 0, 1, 2, 3, ...)"""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+def unsigned_to_signed(value):
+    """Undo signed()"""
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+def _put_text(data, text):
+    encoded = text.encode("utf-8")
+    _put(data, len(encoded))
+    data.extend(encoded)
+
+def _get_text(data, offset):
+    length, offset = _get(data, offset)
+    return bytes(data[offset:offset + length]).decode("utf-8"), offset + length
+
+def start_log(combatants):
+    """
+    Start a log for a battle between combatants (character or enemy
+    dictionaries); an actor number is a combatant's position in the list
+
+    Returns: The log (a bytearray holding the header)
+    """
+    data = bytearray(MAGIC)
+    _put(data, len(combatants))
+    for combatant in combatants:
+        _put_text(data, combatant.get('name', ''))
+        _put_text(data, combatant.get('class', combatant.get('type', '')))
+        _put(data, max(0, combatant.get('health', 0)))
+        _put(data, max(0, combatant.get('max_health', 0)))
+        _put(data, max(0, combatant.get('strength', 0)))
+        _put(data, max(0, combatant.get('magic', 0)))
+    return data
+
+def record(data, kind, actor, *fields):
+    """
+    Append one event to a log
+    """
+    if actor < EXTENDED_ACTOR:
+        data.append(kind << 4 | actor)
+    else:
+        data.append(kind << 4 | EXTENDED_ACTOR)
+        _put(data, actor)
+    for value in fields:
+        _put(data, value)
+
+# ============================================================================
+# DECODING
+# ============================================================================
+
+def read_header(data):
+    """
+    Read the combatants a log starts with
+
+    Returns: Tuple of (list of combatant dictionaries, offset of the first event)
+    Raises: ValueError if data is not a battle log
+    """
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        raise ValueError("Not a battle log")
+    offset = len(MAGIC)
+    count, offset = _get(data, offset)
+    combatants = []
+    i = 0
+    while i < count:
+        name, offset = _get_text(data, offset)
+        kind, offset = _get_text(data, offset)
+        health, offset = _get(data, offset)
+        max_health, offset = _get(data, offset)
+        strength, offset = _get(data, offset)
+        magic, offset = _get(data, offset)
+        combatants.append({'name': name, 'class': kind, 'health': health, 'max_health': max_health,
+                           'strength': strength, 'magic': magic})
+        i += 1
+    return combatants, offset
+
+def iter_events(data):
+    """
+    Yield every event in a log as (kind, actor, fields tuple)
+    """
+    offset = read_header(data)[1]
+    end = len(data)
+    while offset < end:
+        byte = data[offset]
+        offset += 1
+        kind = byte >> 4
+        actor = byte & 0x0F
+        if actor == EXTENDED_ACTOR:
+            actor, offset = _get(data, offset)
+        fields = []
+        i = 0
+        while i < EVENT_FIELDS[kind]:
+            value, offset = _get(data, offset)
+            fields.append(value)
+            i += 1
+        yield kind, actor, tuple(fields)
+
+# ============================================================================
+# REPLAY
+# ============================================================================
+
+def replay(data, until_turn=None):
+    """
+    Rebuild a battle from its log
+
+    until_turn stops before that turn starts, giving the state a bug
+    report needs to be reproduced from.
+
+    Returns: Dictionary with 'combatants' (health as rebuilt), 'turns',
+             'winner' ('player', 'enemy', 'none', or None if the log has
+             no END event) and 'history' (every combatant's health at the
+             end of each turn)
+    """
+    combatants = read_header(data)[0]
+    turns = 0
+    winner = None
+    history = []
+
+    for kind, actor, fields in iter_events(data):
+        if kind == TURN:
+            if turns:
+                history.append([combatant['health'] for combatant in combatants])
+            if until_turn is not None and turns + 1 >= until_turn:
+                return {'combatants': combatants, 'turns': turns, 'winner': None, 'history': history}
+            turns += 1
+        elif kind == ATTACK or kind == DAMAGE:
+            target = combatants[fields[0]]
+            target['health'] = max(0, target['health'] - fields[1])
+        elif kind == HEAL:
+            target = combatants[fields[0]]
+            target['health'] = min(target['max_health'], target['health'] + fields[1])
+        elif kind == END:
+            winner = WINNERS[fields[0]]
+
+    if turns:
+        history.append([combatant['health'] for combatant in combatants])
+    return {'combatants': combatants, 'turns': turns, 'winner': winner, 'history': history}
+
+class ReplayRandom:
+    """
+    Stands in for the random module, answering with the draws recorded
+    in a log, in order
+    """
+
+    def __init__(self, data):
+        self.draws = [fields[0] for kind, actor, fields in iter_events(data) if kind == DRAW]
+        self.position = 0
+
+    def _next(self):
+        if self.position >= len(self.draws):
+            raise ValueError("The battle made more random draws than the log recorded")
+        value = self.draws[self.position]
+        self.position += 1
+        return value
+
+    def random(self):
+        return self._next() / DRAW_SCALE
+
+    def choice(self, seq):
+        return seq[self._next()]
+
+def rerun_battle(data, character, enemy, player_policy=None, enemy_policy=None):
+    """
+    Fight a logged battle again with the recorded random draws
+
+    character and enemy must be as they were when the battle started
+    (fresh copies are fine; they are changed by the battle). Policies
+    must decide the same way they did the first time (for battle_ai,
+    the same max_depth and no time budget). Status effects are started
+    again right after the event logged before them, so policies given
+    here must not start them a second time.
+
+    Returns: Tuple of (battle result dictionary, the new log)
+    """
+    import combat_system
+    import renderer
+    import status_effects
+
+    battle = combat_system.SimpleBattle(character, enemy, rng=ReplayRandom(data),
+                                        player_policy=player_policy, enemy_policy=enemy_policy)
+    effect_ids = list(status_effects.STATUS_EFFECTS)
+    combatants = [character, enemy]
+
+    def start_status(fields):
+        battle.apply_status(combatants[fields[0]], effect_ids[fields[1]], fields[2], unsigned_to_signed(fields[3]))
+
+    # Effects logged before the first turn were started before the battle;
+    # the rest follow the event the log has just before them
+    scheduled = []
+    started = False
+    position = 0
+    for kind, actor, fields in iter_events(data):
+        if kind == TURN:
+            started = True
+        if kind == STATUS:
+            if started:
+                scheduled.append((position, fields))
+            else:
+                start_status(fields)
+        position += 1
+
+    if scheduled:
+        record = battle._record
+        recorded = [0]
+
+        def record_and_start_status(kind, actor, *fields):
+            record(kind, actor, *fields)
+            recorded[0] += 1
+            while scheduled and scheduled[0][0] == recorded[0]:
+                start_status(scheduled.pop(0)[1])
+
+        battle._record = record_and_start_status
+
+    renderer.set_renderer(renderer.new_renderer("silent"), this_thread=True)
+    try:
+        result = battle.start_battle()
+    finally:
+        renderer.set_renderer(None, this_thread=True)
+    return result, battle.log
+
+# ============================================================================
+# FILES
+# ============================================================================
+
+def append_log(log_file, data):
+    """
+    Append one log to a log file
+    """
+    prefix = bytearray()
+    _put(prefix, len(data))
+    with open(log_file, "ab") as f:
+        f.write(prefix)
+        f.write(data)
+
+def read_logs(log_file):
+    """
+    Yield every log stored in a log file
+    """
+    with open(log_file, "rb") as f:
+        contents = f.read()
+    offset = 0
+    while offset < len(contents):
+        length, offset = _get(contents, offset)
+        yield contents[offset:offset + length]
+        offset += length
+
+# ============================================================================
+# DISPLAY
+# ============================================================================
+
+def format_log(data):
+    """
+    Describe a log, one event per line
+
+    Returns: List of strings
+    """
+    combatants = read_header(data)[0]
+    lines = []
+    i = 0
+    while i < len(combatants):
+        combatant = combatants[i]
+        lines.append(f"[{i}] {combatant['name']} ({combatant['class']}) HP {combatant['health']}/"
+                     f"{combatant['max_health']} STR {combatant['strength']} MAG {combatant['magic']}")
+        i += 1
+
+    for kind, actor, fields in iter_events(data):
+        if kind == END:
+            lines.append(f"end: {WINNERS[fields[0]]}")
+        else:
+            lines.append(f"{EVENT_NAMES[kind]} by {actor}: {' '.join(str(value) for value in fields)}".rstrip(": "))
+    return lines
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python battle_log.py <log_file> [--show=N]")
+        sys.exit(2)
+
+    show = 0
+    for arg in sys.argv[2:]:
+        if arg.startswith("--show="):
+            show = int(arg[len("--show="):])
+
+    count = 0
+    header_bytes = 0
+    event_bytes = 0
+    total_turns = 0
+    for data in read_logs(sys.argv[1]):
+        if count < show:
+            print("\n".join(format_log(data)))
+            print()
+        header = read_header(data)[1]
+        count += 1
+        header_bytes += header
+        event_bytes += len(data) - header
+        total_turns += replay(data)['turns']
+
+    print(f"{count} battles, {total_turns} turns: {header_bytes} header bytes, {event_bytes} event bytes "
+          f"({event_bytes / max(total_turns, 1):.1f} per turn)")
@@ -0,0 +1,341 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark Module
+
+Times the game's heavy paths on seeded synthetic data (see
+synthetic_data) at a chosen scale, and compares each throughput with a
+stored baseline so regressions show up as numbers.
+
+Each benchmark returns how many operations it performed; the best of a
+few repeats is kept. Baselines live in data/benchmark_results.json,
+one set per scale.
+
+Usage: python benchmark.py [scale] [--save-baseline] [--check] [--only=name,name] [--profile=MODES]
+"""
+
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import character_manager
+import catalog_validator
+import combat_system
+import game_data
+import inventory_system
+import party_battle
+import profiling
+import quest_handler
+import renderer
+import status_effects
+import synthetic_data
+from custom_exceptions import InventoryFullError, ItemNotFoundError
+
+RESULTS_FILE = "data/benchmark_results.json"
+
+# A benchmark this much slower than its baseline is a regression
+REGRESSION_THRESHOLD = 0.25
+
+# Characters, save files and battles stay at most this many per run
+MAX_CHARACTERS = 5000
+
+# Cold availability indexes built per run (each build walks the catalog)
+MAX_INDEX_BUILDS = 100
+
+# ============================================================================
+# SETUP
+# ============================================================================
+
+def build_workload(scale, seed=163, directory=None):
+    """
+    Generate the data every benchmark works on
+
+    scale is the number of quests and items; characters (and save files)
+    are scale // 10, capped at MAX_CHARACTERS.
+
+    Returns: Dictionary with 'scale', 'seed', 'directory', 'quest_file',
+             'item_file', 'save_directory', 'quests', 'items', 'characters'
+    """
+    if directory is None:
+        directory = tempfile.mkdtemp(prefix="quest_bench_")
+    quest_file, item_file = synthetic_data.write_catalog_files(directory, scale, scale, seed)
+
+    quests = game_data.load_quests(quest_file)
+    items = game_data.load_items(item_file)
+    characters = synthetic_data.generate_characters(
+        min(max(scale // 10, 1), MAX_CHARACTERS), quests, items, seed)
+
+    return {
+        'scale': scale,
+        'seed': seed,
+        'directory': directory,
+        'quest_file': quest_file,
+        'item_file': item_file,
+        'save_directory': os.path.join(directory, "saves"),
+        'quests': quests,
+        'items': items,
+        'characters': characters,
+    }
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+
+def bench_load_quests(workload):
+    """Parse and validate the quest file"""
+    game_data.load_quests(workload['quest_file'])
+    return workload['scale']
+
+def bench_load_items(workload):
+    """Parse the item file"""
+    game_data.load_items(workload['item_file'])
+    return workload['scale']
+
+def bench_validate_catalogs(workload):
+    """Validate both catalogs in one pass"""
+    catalog_validator.validate_catalogs(workload['quests'], workload['items'])
+    return 2 * workload['scale']
+
+def bench_save_load(workload):
+    """Save every character, then load every save back"""
+    characters = workload['characters']
+    synthetic_data.write_save_files(characters, workload['save_directory'])
+    i = 0
+    while i < len(characters):
+        character_manager.load_character(characters[i]['name'], workload['save_directory'],
+                                         quest_data_dict=workload['quests'])
+        i += 1
+    return 2 * len(characters)
+
+def bench_inventory(workload):
+    """Fill, equip from, use and empty each character's inventory"""
+    items = workload['items']
+    item_ids = list(items)
+    ops = 0
+    for source in workload['characters']:
+        character = character_manager.create_character(source['name'], source['class'])
+        i = 0
+        while True:
+            try:
+                inventory_system.add_item_to_inventory(character, item_ids[i % len(item_ids)])
+            except InventoryFullError:
+                break
+            ops += 1
+            i += 1
+
+        for item_id in list(character['inventory']):
+            item = items[item_id]
+            try:
+                if inventory_system.is_equippable(item):
+                    inventory_system.equip_item(character, item_id, item)
+                else:
+                    inventory_system.use_item(character, item_id, item)
+            except ItemNotFoundError:
+                pass
+            ops += 1
+        inventory_system.clear_inventory(character)
+        ops += 1
+    return ops
+
+def bench_quest_availability(workload):
+    """List available quests for characters with no index yet"""
+    quests = workload['quests']
+    characters = workload['characters'][:MAX_INDEX_BUILDS]
+    quest_handler.get_quest_graph(quests)
+    for character in characters:
+        character.pop('quest_index', None)
+        quest_handler.get_available_quests(character, quests)
+    return len(characters)
+
+def bench_battles(workload):
+    """Fight one battle per character with output dropped"""
+    random.seed(workload['seed'])
+    renderer.set_renderer(renderer.new_renderer("silent"), this_thread=True)
+    try:
+        turns = 0
+        for source in workload['characters']:
+            character = character_manager.create_character(source['name'], source['class'])
+            battle = combat_system.SimpleBattle(character, combat_system.create_enemy("orc"))
+            battle.start_battle()
+            turns += battle.turn_counter
+        return turns
+    finally:
+        renderer.set_renderer(None, this_thread=True)
+
+def bench_raid(workload):
+    """Fight one initiative-ordered battle of every character against as many goblins"""
+    rng = random.Random(workload['seed'])
+    renderer.set_renderer(renderer.new_renderer("silent"), this_thread=True)
+    try:
+        party = [character_manager.create_character(source['name'], source['class'])
+                 for source in workload['characters']]
+        enemies = [combat_system.create_enemy("goblin") for source in workload['characters']]
+        return party_battle.PartyBattle(party, enemies, rng=rng).start_battle()['turns']
+    finally:
+        renderer.set_renderer(None, this_thread=True)
+
+def bench_status_effects(workload):
+    """Stack one status effect per character on two combatants and run them all out"""
+    rng = random.Random(workload['seed'])
+    engine = status_effects.StatusEngine()
+    count = len(workload['characters'])
+    combatants = [{'name': name, 'health': count * 1000, 'max_health': count * 1000, 'strength': 10}
+                  for name in ("Hero", "Dragon")]
+    effect_ids = list(status_effects.STATUS_EFFECTS)
+    i = 0
+    while i < count:
+        engine.apply(rng.choice(combatants), rng.choice(effect_ids), duration=rng.randint(1, 200))
+        i += 1
+    while engine.active:
+        engine.advance()
+    return count
+
+# (name, function, unit) in run order
+BENCHMARKS = [
+    ("load_quests", bench_load_quests, "quests"),
+    ("load_items", bench_load_items, "items"),
+    ("validate_catalogs", bench_validate_catalogs, "records"),
+    ("save_load", bench_save_load, "saves+loads"),
+    ("inventory", bench_inventory, "ops"),
+    ("quest_availability", bench_quest_availability, "characters"),
+    ("battles", bench_battles, "turns"),
+    ("raid", bench_raid, "turns"),
+    ("status_effects", bench_status_effects, "effects"),
+]
+
+# ============================================================================
+# RUNNING
+# ============================================================================
+
+def run_benchmarks(scale=10000, seed=163, repeat=3, only=None):
+    """
+    Build the workload and run each benchmark repeat times
+
+    Returns: Dictionary of {benchmark name: {'ops', 'unit', 'seconds',
+             'ops_per_second'}} using the fastest repeat
+    """
+    workload = build_workload(scale, seed)
+    results = {}
+    try:
+        for name, function, unit in BENCHMARKS:
+            if only and name not in only:
+                continue
+
+            best = None
+            ops = 0
+            i = 0
+            while i < repeat:
+                start = time.perf_counter()
+                ops = function(workload)
+                seconds = time.perf_counter() - start
+                if best is None or seconds < best:
+                    best = seconds
+                i += 1
+
+            results[name] = {
+                'ops': ops,
+                'unit': unit,
+                'seconds': best,
+                'ops_per_second': ops / best if best > 0 else 0.0,
+            }
+    finally:
+        shutil.rmtree(workload['directory'], ignore_errors=True)
+    return results
+
+def compare_to_baseline(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    Compare throughputs with a baseline
+
+    Returns: Dictionary of {benchmark name: change}, where change is the
+             relative throughput difference (-0.3 = 30% slower), or None
+             when there is no baseline for that benchmark; plus
+             'regressions', the names slower than threshold
+    """
+    changes = {}
+    regressions = []
+    for name in results:
+        base = baseline.get(name) if baseline else None
+        if not base or not base.get('ops_per_second'):
+            changes[name] = None
+            continue
+        change = results[name]['ops_per_second'] / base['ops_per_second'] - 1
+        changes[name] = change
+        if change < -threshold:
+            regressions.append(name)
+    changes['regressions'] = regressions
+    return changes
+
+# ============================================================================
+# RESULTS FILE
+# ============================================================================
+
+def load_baselines(results_file=RESULTS_FILE):
+    """
+    Read the stored baselines
+
+    Returns: Dictionary of {scale (as a string): results}; empty if the
+             file doesn't exist
+    """
+    if not os.path.exists(results_file):
+        return {}
+    with open(results_file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def save_baseline(results, scale, results_file=RESULTS_FILE):
+    """
+    Store results as the baseline for this scale, keeping other scales
+    and the benchmarks not in results (so a run with only= adds to them)
+    """
+    baselines = load_baselines(results_file)
+    baselines.setdefault(str(scale), {}).update(results)
+    with open(results_file, "w", encoding="utf-8") as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+# ============================================================================
+# DISPLAY
+# ============================================================================
+
+def display_benchmark_results(results, changes, scale):
+    """
+    Display results with their change from the baseline
+    """
+    lines = [
+        f"\n=== BENCHMARKS (scale {scale}) ===",
+        "| {:<18} | {:>12} | {:>14} | {:>9} |".format("Benchmark", "ops/second", "unit", "vs base"),
+        "-" * 66,
+    ]
+    for name in results:
+        result = results[name]
+        change = changes.get(name)
+        versus = "-" if change is None else f"{change * 100:+.1f}%"
+        lines.append("| {:<18} | {:>12.1f} | {:>14} | {:>9} |".format(
+            name, result['ops_per_second'], result['unit'], versus))
+    if changes['regressions']:
+        lines.append(f"REGRESSIONS: {', '.join(changes['regressions'])}")
+    renderer.show("benchmark_results", "\n".join(lines), scale=scale, results=results, changes=changes)
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    scale = int(args[0]) if args else 10000
+    only = None
+    for arg in sys.argv[1:]:
+        if arg.startswith("--only="):
+            only = arg[len("--only="):].split(",")
+
+    results = profiling.run_profiled("benchmark", run_benchmarks, scale, only=only)
+    changes = compare_to_baseline(results, load_baselines().get(str(scale)))
+    display_benchmark_results(results, changes, scale)
+
+    if "--save-baseline" in sys.argv:
+        save_baseline(results, scale)
+        print(f"Baseline for scale {scale} saved to {RESULTS_FILE}")
+    if "--check" in sys.argv and changes['regressions']:
+        sys.exit(1)
@@ -0,0 +1,308 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Catalog Validator Module
+
+Checks the quest and item catalogs in one pass and collects every problem
+into a single report, instead of stopping at the first bad record:
+invalid records, duplicate or mismatched IDs, missing prerequisites,
+prerequisite cycles, quests that can never be reached, bad objectives,
+unknown item types, and quests that require a lower level than their
+prerequisite. Runs in time linear in the size of the catalogs.
+
+Usage: python catalog_validator.py [quest_file] [item_file]
+"""
+
+import sys
+
+import game_data
+import inventory_system
+import quest_handler
+import renderer
+from custom_exceptions import InvalidDataFormatError, MissingDataFileError
+
+# Problems that make a catalog unusable; anything else is a warning
+WARNING_KINDS = ["level_inconsistency"]
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+def new_report():
+    """
+    Create an empty validation report
+
+    Returns: Dictionary with:
+        'ok': True while no errors have been added
+        'errors' / 'warnings': lists of problems, each a dictionary with
+                   'kind', 'source' ('quest' or 'item'), 'id' and 'message'
+        'counts': {kind: number of problems of that kind}
+        'quests_checked' / 'items_checked': records examined
+    """
+    return {
+        "ok": True,
+        "errors": [],
+        "warnings": [],
+        "counts": {},
+        "quests_checked": 0,
+        "items_checked": 0,
+    }
+
+def add_problem(report, kind, source, record_id, message):
+    """
+    Record one problem in the report
+    """
+    problem = {"kind": kind, "source": source, "id": record_id, "message": message}
+    if kind in WARNING_KINDS:
+        report["warnings"].append(problem)
+    else:
+        report["errors"].append(problem)
+        report["ok"] = False
+    report["counts"][kind] = report["counts"].get(kind, 0) + 1
+
+# ============================================================================
+# VALIDATION
+# ============================================================================
+
+def validate_catalogs(quest_data_dict, item_data_dict=None, report=None, item_types=None):
+    """
+    Validate the quest catalog and (optionally) the item catalog
+
+    Returns: The report (see new_report)
+    """
+    if report is None:
+        report = new_report()
+
+    validate_quest_catalog(quest_data_dict, report)
+    if item_data_dict is not None:
+        validate_item_catalog(item_data_dict, report, item_types)
+    return report
+
+def validate_quest_catalog(quest_data_dict, report):
+    """
+    Add every problem in the quest catalog to the report
+
+    One pass checks records and links each quest to its prerequisite; a
+    walk down from the root quests then finds what can be reached, and
+    the remaining quests are split into cycles and quests stuck behind a
+    missing prerequisite or a cycle.
+    """
+    field = game_data.get_record_field
+    prerequisite = {}
+    unlocks = {}
+    levels = {}
+    broken = set()
+    roots = []
+
+    report["quests_checked"] += len(quest_data_dict)
+
+    for quest_id in quest_data_dict:
+        quest = quest_data_dict[quest_id]
+
+        for error in game_data.quest_data_errors(quest):
+            add_problem(report, "invalid_record", "quest", quest_id, error)
+
+        record_id = field(quest, "quest_id")
+        if record_id and record_id != quest_id:
+            add_problem(report, "id_mismatch", "quest", quest_id, f"record says quest_id {record_id!r}")
+
+        try:
+            levels[quest_id] = int(field(quest, "required_level"))
+        except (TypeError, ValueError):
+            pass
+
+        objective = field(quest, "objective")
+        if objective and objective != "NONE":
+            try:
+                quest_handler.parse_quest_objective(objective)
+            except InvalidDataFormatError as e:
+                add_problem(report, "invalid_objective", "quest", quest_id, str(e))
+
+        prereq_id = field(quest, "prerequisite")
+        if not prereq_id or prereq_id == "NONE":
+            roots.append(quest_id)
+        elif prereq_id not in quest_data_dict:
+            broken.add(quest_id)
+            add_problem(report, "missing_prerequisite", "quest", quest_id,
+                        f"prerequisite {prereq_id!r} is not in the catalog")
+        elif prereq_id == quest_id:
+            # Already reported by quest_data_errors
+            broken.add(quest_id)
+        else:
+            prerequisite[quest_id] = prereq_id
+            unlocks.setdefault(prereq_id, []).append(quest_id)
+
+    # Level check: a quest should not unlock below its prerequisite's level
+    for quest_id in prerequisite:
+        prereq_id = prerequisite[quest_id]
+        if quest_id in levels and prereq_id in levels and levels[prereq_id] > levels[quest_id]:
+            add_problem(report, "level_inconsistency", "quest", quest_id,
+                        f"requires level {levels[quest_id]} but prerequisite {prereq_id!r} requires level {levels[prereq_id]}")
+
+    # Everything reachable from a root quest can eventually be accepted.
+    # Each quest has one parent, so a child is never queued twice
+    reached = set(roots)
+    order = list(roots)
+    for quest_id in order:
+        children = unlocks.get(quest_id)
+        if children:
+            reached.update(children)
+            order.extend(children)
+
+    if len(reached) == len(quest_data_dict):
+        return report
+
+    # Each quest has at most one prerequisite, so following prerequisites
+    # from an unreached quest either dead-ends on a broken link or loops;
+    # every quest is walked at most once
+    walk_of = {}
+    on_cycle = set()
+    walk_number = 0
+    for quest_id in quest_data_dict:
+        if quest_id in reached or quest_id in walk_of:
+            continue
+
+        walk = []
+        node = quest_id
+        while node is not None and node not in reached and node not in walk_of:
+            walk_of[node] = walk_number
+            walk.append(node)
+            node = prerequisite.get(node)
+
+        if node is not None and walk_of.get(node) == walk_number:
+            cycle = walk[walk.index(node):]
+            on_cycle.update(cycle)
+            add_problem(report, "cycle", "quest", node,
+                        f"prerequisite cycle: {' -> '.join(reversed(cycle))} -> {cycle[-1]}")
+        walk_number += 1
+
+    for quest_id in quest_data_dict:
+        if quest_id not in reached and quest_id not in on_cycle and quest_id not in broken:
+            add_problem(report, "unreachable", "quest", quest_id,
+                        "depends on a quest with a missing prerequisite or a cycle")
+
+    return report
+
+def validate_item_catalog(item_data_dict, report, item_types=None):
+    """
+    Add every problem in the item catalog to the report
+
+    item_types are the equippable item types; defaults to the active
+    equipment slot layout.
+    """
+    field = game_data.get_record_field
+    if item_types is None:
+        item_types = inventory_system.slots_by_item_type
+    valid_types = set(item_types)
+    valid_types.add("consumable")
+
+    report["items_checked"] += len(item_data_dict)
+
+    for item_id in item_data_dict:
+        item = item_data_dict[item_id]
+
+        for error in game_data.item_data_errors(item):
+            add_problem(report, "invalid_record", "item", item_id, error)
+
+        record_id = field(item, "item_id")
+        if record_id and record_id != item_id:
+            add_problem(report, "id_mismatch", "item", item_id, f"record says item_id {record_id!r}")
+
+        item_type = field(item, "type")
+        if item_type and str(item_type).lower() not in valid_types:
+            add_problem(report, "unknown_item_type", "item", item_id,
+                        f"type {item_type!r} is not consumable or an equipment slot type")
+
+    return report
+
+# ============================================================================
+# LOADING
+# ============================================================================
+
+def read_catalog(data_file, id_field, source, report):
+    """
+    Read a block-format data file into {record_id: record}
+
+    Records without an ID, or repeating an earlier ID, are reported and
+    skipped.
+
+    Raises: MissingDataFileError, InvalidDataFormatError (from read_data_blocks)
+    """
+    catalog = {}
+    blocks = game_data.read_data_blocks(data_file)
+    i = 0
+    while i < len(blocks):
+        record_id = blocks[i].get(id_field)
+        if not record_id:
+            add_problem(report, "missing_id", source, f"#{i + 1}", f"record #{i + 1} has no {id_field}")
+        elif record_id in catalog:
+            add_problem(report, "duplicate_id", source, record_id, f"{id_field} {record_id!r} appears more than once")
+        else:
+            catalog[record_id] = blocks[i]
+        i += 1
+    return catalog
+
+def validate_files(quest_file="data/quests.txt", item_file="data/items.txt",
+                   slot_file="data/equipment_slots.txt"):
+    """
+    Read and validate the quest and item data files
+
+    Returns: The report (see new_report)
+    """
+    report = new_report()
+    quests = read_catalog(quest_file, "QUEST_ID", "quest", report)
+    items = read_catalog(item_file, "ITEM_ID", "item", report)
+
+    # Item types come from the equipment slot layout when there is one
+    item_types = set(inventory_system.slots_by_item_type)
+    try:
+        slots = game_data.load_equipment_slots(slot_file)
+        for slot_id in slots:
+            item_types.add(slots[slot_id]["ITEM_TYPE"])
+    except MissingDataFileError:
+        pass
+
+    return validate_catalogs(quests, items, report, item_types)
+
+# ============================================================================
+# DISPLAY
+# ============================================================================
+
+def display_validation_report(report, max_lines=50):
+    """
+    Display a validation report, listing up to max_lines problems
+    """
+    lines = [
+        "\n=== CATALOG VALIDATION ===",
+        f"Checked {report['quests_checked']} quests and {report['items_checked']} items: "
+        f"{len(report['errors'])} errors, {len(report['warnings'])} warnings",
+    ]
+
+    problems = report["errors"] + report["warnings"]
+    shown = min(len(problems), max_lines)
+    i = 0
+    while i < shown:
+        problem = problems[i]
+        label = "WARNING" if problem["kind"] in WARNING_KINDS else "ERROR"
+        lines.append(f"[{label}] {problem['source']} {problem['id']!r} ({problem['kind']}): {problem['message']}")
+        i += 1
+    if len(problems) > shown:
+        lines.append(f"... and {len(problems) - shown} more")
+
+    renderer.show("validation_report", "\n".join(lines), **report)
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    quest_file = sys.argv[1] if len(sys.argv) > 1 else "data/quests.txt"
+    item_file = sys.argv[2] if len(sys.argv) > 2 else "data/items.txt"
+
+    try:
+        report = validate_files(quest_file, item_file)
+    except (MissingDataFileError, InvalidDataFormatError) as e:
+        print(f"Could not read catalog: {e}")
+        sys.exit(2)
+
+    display_validation_report(report)
+    sys.exit(0 if report["ok"] else 1)
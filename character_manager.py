@@ -11,13 +11,23 @@ AI Usage: I defined the base character structure, class names, and all core func
           and ensures correct exception handling as required by the project.
 """
 
+import math
 import os
-import shutil 
+import threading
+import zlib
+
+import renderer
+from inventory_system import get_item_modifiers, get_equipment, EQUIPMENT_STATS
+from quest_handler import (
+    quest_ids_to_bits, bits_to_quest_ids, encode_quest_bits,
+    decode_quest_bits, is_save_bitset, get_quest_graph, get_quest_stats
+)
 from custom_exceptions import (
     InvalidCharacterClassError,
     CharacterNotFoundError,
     SaveFileCorruptedError,
     InvalidSaveDataError,
+    InvalidDataFormatError,
     CharacterDeadError
 )
 
@@ -29,6 +39,13 @@ BASE_STATS_MAP = {
     "Cleric":  {"health": 100, "strength": 10, "magic": 15},
 }
 
+# Equipment-affected stats that have a level-based base value
+BASE_STAT_KEYS = {
+    "max_health": "base_health",
+    "strength": "base_strength",
+    "magic": "base_magic",
+}
+
 # ============================================================================
 # CHARACTER MANAGEMENT FUNCTIONS (I/O)
 # ============================================================================
@@ -72,13 +89,98 @@ def create_character(name, character_class):
         "inventory": [],
         "equipped_weapon": "NONE",
         "equipped_armor": "NONE",
+        "equipment": {},
+        
+        # Equipment bonuses per slot, plus their running totals per stat
+        "slot_modifiers": {},
+        "equipment_bonuses": {},
+        
+        # Cached combat/display values (see get_derived_stats)
+        "derived_stats": None,
         "active_quests": [],
-        "completed_quests": []
+        "completed_quests": [],
+
+        # Running quest totals (see quest_handler.get_quest_stats)
+        "quest_stats": {"total_xp": 0, "total_gold": 0, "completed": 0},
+
+        # Objective counters for active quests: {quest_id: count}
+        "quest_progress": {}
     }
+    # The completed list the quest totals were counted from
+    character["quest_stats_list"] = character["completed_quests"]
 
     return character
 
 
+# ============================================================================
+# QUEST BIT REGISTRY
+# ============================================================================
+
+# Saved quest bitsets number quests by this file in the save directory:
+# one quest ID per line, line n being bit n. IDs are only ever appended,
+# so adding, removing or reordering quests in the catalog never changes
+# what an existing save means.
+QUEST_BITS_FILE = "quest_bits.txt"
+
+# {registry path: {'ids', 'position', 'crcs'}}, see get_quest_bit_registry
+_quest_bit_registries = {}
+_registry_lock = threading.Lock()
+
+def get_quest_bit_registry(save_directory, reload=False):
+    """
+    Get the quest bit registry of a save directory, reading it the first time
+    
+    Returns: Dictionary with 'ids' (bit -> quest ID), 'position'
+             (quest ID -> bit) and 'crcs' (crcs[n - 1] is the CRC-32 of
+             the first n IDs joined by newlines)
+    """
+    path = os.path.join(save_directory, QUEST_BITS_FILE)
+    with _registry_lock:
+        registry = _quest_bit_registries.get(path)
+        if registry is None or reload:
+            registry = {'ids': [], 'position': {}, 'crcs': []}
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    _add_registry_ids(registry, [line.strip() for line in f if line.strip()])
+            _quest_bit_registries[path] = registry
+        return registry
+
+def register_quest_bits(save_directory, quest_ids):
+    """
+    Give every quest ID not yet in the save directory's registry the next
+    bit number, appending it to the registry file
+    
+    Returns: The registry (see get_quest_bit_registry)
+    Raises: OSError if the registry file can't be written
+    """
+    registry = get_quest_bit_registry(save_directory)
+    with _registry_lock:
+        new_ids = []
+        seen = set()
+        for quest_id in quest_ids:
+            if quest_id not in registry['position'] and quest_id not in seen:
+                seen.add(quest_id)
+                new_ids.append(quest_id)
+        if new_ids:
+            with open(os.path.join(save_directory, QUEST_BITS_FILE), "a", encoding="utf-8") as f:
+                f.write("".join(quest_id + "\n" for quest_id in new_ids))
+            _add_registry_ids(registry, new_ids)
+    return registry
+
+def _add_registry_ids(registry, quest_ids):
+    """Number quest IDs after the ones a registry already has"""
+    crc = registry['crcs'][-1] if registry['crcs'] else 0
+    for quest_id in quest_ids:
+        separator = "\n" if registry['ids'] else ""
+        crc = zlib.crc32((separator + quest_id).encode("utf-8"), crc)
+        registry['position'][quest_id] = len(registry['ids'])
+        registry['ids'].append(quest_id)
+        registry['crcs'].append(crc)
+
+def _registry_prefix(registry, count):
+    """Identify the first count IDs of a registry, as saved in QUEST_BITS"""
+    return f"{count}:{registry['crcs'][count - 1] if count else 0:08x}"
+
 def save_character(character, save_directory="data/save_games"):
     """
     Save character to file
@@ -94,6 +196,57 @@ def save_character(character, save_directory="data/save_games"):
         # Lists should be saved as comma-separated values
         return ",".join(character.get(key, [])) or "NONE"
 
+    # Slot bonuses are saved as "slot=stat:value;slot=stat:value"
+    def modifiers_to_str():
+        slot_modifiers = character.get("slot_modifiers", {})
+        entries = []
+        for slot in slot_modifiers:
+            for stat_name in slot_modifiers[slot]:
+                entries.append(f"{slot}={stat_name}:{slot_modifiers[slot][stat_name]}")
+        return ";".join(entries) or "NONE"
+
+    # Extra slots (head, rings...) are saved as "slot=item_id;slot=item_id"
+    def equipment_to_str():
+        equipment = character.get("equipment", {})
+        entries = []
+        for slot in equipment:
+            entries.append(f"{slot}={equipment[slot]}")
+        return ";".join(entries) or "NONE"
+
+    # Quest lists of characters with a quest index are saved as bitsets
+    # over the save directory's quest bit registry; otherwise (or if the
+    # registry can't be written) as plain lists
+    quest_bits = "NONE"
+    active_quests = list_to_str("active_quests")
+    completed_quests = list_to_str("completed_quests")
+    registry = None
+    if character.get("quest_index") is not None:
+        try:
+            registry = register_quest_bits(save_directory, character.get("active_quests", [])
+                                           + character.get("completed_quests", []))
+        except OSError:
+            pass
+    if registry is not None:
+        quest_bits = _registry_prefix(registry, len(registry["ids"]))
+        active_quests = encode_quest_bits(quest_ids_to_bits(character.get("active_quests", []), registry)[0])
+        completed_quests = encode_quest_bits(quest_ids_to_bits(character.get("completed_quests", []), registry)[0])
+
+    # Quest totals are saved as "total_xp,total_gold,completed"
+    quest_stats = character.get("quest_stats")
+    if quest_stats is not None:
+        quest_stats = f"{quest_stats['total_xp']},{quest_stats['total_gold']},{quest_stats['completed']}"
+    else:
+        quest_stats = "NONE"
+
+    # Objective counters are saved as "quest_id=count;quest_id=count"
+    def progress_to_str():
+        progress = character.get("quest_progress", {})
+        entries = []
+        for quest_id in progress:
+            if progress[quest_id]:
+                entries.append(f"{quest_id}={progress[quest_id]}")
+        return ";".join(entries) or "NONE"
+
     # Define the data structure to be saved
     save_data = [
         ("NAME", character["name"]),
@@ -112,9 +265,14 @@ def save_character(character, save_directory="data/save_games"):
         ("BASE_MAGIC", str(character["base_magic"])),
         ("EQUIPPED_WEAPON", character.get("equipped_weapon") or "NONE"),
         ("EQUIPPED_ARMOR", character.get("equipped_armor") or "NONE"),
+        ("EQUIPMENT", equipment_to_str()),
+        ("EQUIPMENT_MODIFIERS", modifiers_to_str()),
         ("INVENTORY", list_to_str("inventory")),
-        ("ACTIVE_QUESTS", list_to_str("active_quests")),
-        ("COMPLETED_QUESTS", list_to_str("completed_quests")),
+        ("QUEST_BITS", quest_bits),
+        ("ACTIVE_QUESTS", active_quests),
+        ("COMPLETED_QUESTS", completed_quests),
+        ("QUEST_STATS", quest_stats),
+        ("QUEST_PROGRESS", progress_to_str()),
     ]
 
     try:
@@ -133,10 +291,15 @@ def save_character(character, save_directory="data/save_games"):
     return True
 
 
-def load_character(character_name, save_directory="data/save_games"):
+def load_character(character_name, save_directory="data/save_games", quest_data_dict=None):
     """
     Load character from save file
     
+    Quest lists saved as bitsets are decoded with the save directory's
+    quest bit registry. quest_data_dict is only needed for saves from
+    before the registry (QUEST_CATALOG), which must be loaded with the
+    quest catalog they were written against.
+    
     Raises: CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError
     """
 
@@ -194,10 +357,96 @@ def load_character(character_name, save_directory="data/save_games"):
             # Parse comma-separated lists back into Python lists
             return [] if s.upper() in ("", "NONE") else s.split(",")
 
+        # Helper to parse quest lists saved either as IDs or as bitsets
+        def parse_quests_str(s):
+            if not is_save_bitset(s):
+                return parse_list_str(s)
+            if "QUEST_BITS" in data:
+                return parse_registry_bits(s)
+            if quest_data_dict is None:
+                raise InvalidSaveDataError("Quest catalog required to load this save file")
+            graph = get_quest_graph(quest_data_dict)
+            if data.get("QUEST_CATALOG") != graph["fingerprint"]:
+                raise InvalidSaveDataError("Save file was written against a different quest catalog")
+            try:
+                bits = decode_quest_bits(s)
+            except InvalidDataFormatError as e:
+                raise InvalidSaveDataError(str(e))
+            if bits >> len(graph["ids"]):
+                raise InvalidSaveDataError("Quest bitset refers to quests outside the catalog")
+            return bits_to_quest_ids(bits, graph)
+
+        # Helper to decode a bitset over the save directory's registry
+        def parse_registry_bits(s):
+            try:
+                count = int(data["QUEST_BITS"].split(":", 1)[0])
+            except ValueError:
+                raise InvalidSaveDataError(f"Invalid QUEST_BITS value '{data['QUEST_BITS']}'")
+            registry = get_quest_bit_registry(save_directory)
+            if count > len(registry["ids"]) or _registry_prefix(registry, count) != data["QUEST_BITS"]:
+                # Another process may have changed the file since we read it
+                registry = get_quest_bit_registry(save_directory, reload=True)
+            if count > len(registry["ids"]) or _registry_prefix(registry, count) != data["QUEST_BITS"]:
+                raise InvalidSaveDataError(f"Quest bit registry {QUEST_BITS_FILE} is missing or does not match this save")
+            try:
+                bits = decode_quest_bits(s)
+            except InvalidDataFormatError as e:
+                raise InvalidSaveDataError(str(e))
+            if bits >> count:
+                raise InvalidSaveDataError("Quest bitset refers to quests outside the registry")
+            return bits_to_quest_ids(bits, registry)
+
+        # Helper to parse quest totals ("total_xp,total_gold,completed")
+        def parse_quest_stats_str(s):
+            if s.upper() in ("", "NONE"):
+                return None
+            total_xp, total_gold, completed = s.split(",")
+            return {"total_xp": int(total_xp), "total_gold": int(total_gold), "completed": int(completed)}
+
+        # Helper to parse objective counters ("quest_id=count;...")
+        def parse_progress_str(s):
+            progress = {}
+            if s.upper() in ("", "NONE"):
+                return progress
+            entries = s.split(";")
+            i = 0
+            while i < len(entries):
+                quest_id, count = entries[i].split("=", 1)
+                progress[quest_id] = int(count)
+                i += 1
+            return progress
+
         # Helper to parse equipment (NONE -> None)
         def parse_equipment_str(s):
             return None if s.upper() in ("", "NONE") else s
 
+        # Helper to parse slot bonuses ("slot=stat:value;...")
+        def parse_modifiers_str(s):
+            slot_modifiers = {}
+            if s.upper() in ("", "NONE"):
+                return slot_modifiers
+            entries = s.split(";")
+            i = 0
+            while i < len(entries):
+                slot, effect = entries[i].split("=", 1)
+                stat_name, value = effect.split(":", 1)
+                slot_modifiers.setdefault(slot, {})[stat_name] = int(value)
+                i += 1
+            return slot_modifiers
+
+        # Helper to parse extra slots ("slot=item_id;...")
+        def parse_slots_str(s):
+            equipment = {}
+            if s.upper() in ("", "NONE"):
+                return equipment
+            entries = s.split(";")
+            i = 0
+            while i < len(entries):
+                slot, item_id = entries[i].split("=", 1)
+                equipment[slot] = item_id
+                i += 1
+            return equipment
+
         # Rebuild character dictionary
         character = {
             "name": data["NAME"],
@@ -218,11 +467,21 @@ def load_character(character_name, save_directory="data/save_games"):
             
             "equipped_weapon": parse_equipment_str(data["EQUIPPED_WEAPON"]),
             "equipped_armor": parse_equipment_str(data["EQUIPPED_ARMOR"]),
+            "equipment": parse_slots_str(data.get("EQUIPMENT", "NONE")),
             
             "inventory": parse_list_str(data["INVENTORY"]),
-            "active_quests": parse_list_str(data["ACTIVE_QUESTS"]),
-            "completed_quests": parse_list_str(data["COMPLETED_QUESTS"])
+            "active_quests": parse_quests_str(data["ACTIVE_QUESTS"]),
+            "completed_quests": parse_quests_str(data["COMPLETED_QUESTS"]),
+            "quest_stats": parse_quest_stats_str(data.get("QUEST_STATS", "NONE")),
+            "quest_progress": parse_progress_str(data.get("QUEST_PROGRESS", "NONE")),
+
+            # Older saves have no modifiers; recalculate_stats rebuilds them
+            "slot_modifiers": parse_modifiers_str(data.get("EQUIPMENT_MODIFIERS", "NONE")),
         }
+        character["equipment_bonuses"] = total_slot_modifiers(character["slot_modifiers"])
+        character["derived_stats"] = None
+        if character["quest_stats"] is not None:
+            character["quest_stats_list"] = character["completed_quests"]
         
     except ValueError as e:
         # Catch errors from int() conversion
@@ -231,6 +490,11 @@ def load_character(character_name, save_directory="data/save_games"):
     # Final structure and type validation
     validate_character_data(character)
 
+    # Saves without quest totals, or with totals that don't match the
+    # completed list, get them rebuilt from quest history
+    if quest_data_dict is not None:
+        get_quest_stats(character, quest_data_dict)
+
     return character
 
 
@@ -298,7 +562,7 @@ def gain_experience(character, xp_amount):
     # Level-up loop
     while True:
         current_level = character["level"]
-        needed = current_level * 100 # Level up formula: level_up_xp = current_level * 100
+        needed = get_xp_to_next_level(current_level)
 
         if character["experience"] >= needed:
             character["experience"] -= needed
@@ -309,21 +573,43 @@ def gain_experience(character, xp_amount):
             character["base_strength"] += 2
             character["base_magic"] += 2
             
-            # Update current stats to reflect the new base values
-            character["max_health"] = character["base_health"]
-            character["strength"] = character["base_strength"]
-            character["magic"] = character["base_magic"]
-
             leveled = True
         else:
             break
             
-    # Restore health to full max_health after leveling (before equipment recalculation)
+    # Rebuild stats from the new base values plus equipment bonuses,
+    # then restore health to full max_health
     if leveled:
+        apply_base_and_bonuses(character)
         character["health"] = character["max_health"]
 
     return leveled
 
+def get_xp_to_next_level(level):
+    """
+    XP needed to go from level to level + 1 (level_up_xp = level * 100)
+    """
+    return level * 100
+
+def get_total_xp_for_level(level):
+    """
+    Total XP a new level 1 character must earn to reach level
+    
+    Sum of get_xp_to_next_level over levels 1 .. level - 1.
+    """
+    return 50 * level * (level - 1)
+
+def get_level_for_total_xp(total_xp):
+    """
+    Level reached by a new level 1 character after earning total_xp
+    
+    Inverse of get_total_xp_for_level: the largest level whose total is
+    at most total_xp.
+    """
+    if total_xp <= 0:
+        return 1
+    return (1 + math.isqrt(1 + 4 * (total_xp // 50))) // 2
+
 def add_gold(character, amount):
     """
     Add gold to character's inventory
@@ -383,6 +669,151 @@ def revive_character(character):
     character["health"] = half
     return True
 
+# ============================================================================
+# STAT RECALCULATION
+# ============================================================================
+
+def total_slot_modifiers(slot_modifiers):
+    """
+    Sum per-slot equipment bonuses into one total per stat
+    
+    Returns: Dictionary of {stat_name: total}
+    """
+    totals = {}
+    for slot in slot_modifiers:
+        modifiers = slot_modifiers[slot]
+        for stat_name in modifiers:
+            totals[stat_name] = totals.get(stat_name, 0) + modifiers[stat_name]
+    return totals
+
+def apply_base_and_bonuses(character):
+    """
+    Set current stats to base values plus the running equipment totals
+    
+    Does not touch health; callers decide how health should follow.
+    """
+    bonuses = character.get("equipment_bonuses", {})
+
+    # Stats without a base value (defense, attack) come only from equipment
+    i = 0
+    while i < len(EQUIPMENT_STATS):
+        stat_name = EQUIPMENT_STATS[i]
+        base_value = 0
+        if stat_name in BASE_STAT_KEYS:
+            base_value = character.get(BASE_STAT_KEYS[stat_name], 1)
+        character[stat_name] = base_value + bonuses.get(stat_name, 0)
+        i += 1
+
+    if character["max_health"] < 1:
+        character["max_health"] = 1
+
+    character["derived_stats"] = None
+
+def recalculate_stats(character, item_data_dict):
+    """
+    Rebuild all stats from base values and the equipped items' catalog data
+    
+    Equipping and unequipping update stats incrementally, so this full
+    rebuild is only needed when the item catalog itself changes (for
+    example right after loading a save).
+    """
+    # Store current health percentage before reset
+    old_max_h = character.get("max_health", 1)
+    current_health_ratio = character.get("health", 0) / old_max_h if old_max_h > 0 else 1.0
+
+    # Rebuild each slot's bonuses from the catalog
+    slot_modifiers = {}
+    equipment = get_equipment(character)
+    for slot in equipment:
+        item_details = item_data_dict.get(equipment[slot])
+        if item_details:
+            modifiers = get_item_modifiers(item_details)
+            if modifiers:
+                slot_modifiers[slot] = dict(modifiers)
+
+    character["slot_modifiers"] = slot_modifiers
+    character["equipment_bonuses"] = total_slot_modifiers(slot_modifiers)
+    apply_base_and_bonuses(character)
+
+    # Restore health at the same percentage of the new max_health
+    new_max_h = character["max_health"]
+    restored_health = int(new_max_h * current_health_ratio)
+    if restored_health > new_max_h:
+        restored_health = new_max_h
+    if restored_health < 0:
+        restored_health = 0
+    character["health"] = restored_health
+
+    return True
+
+def calculate_derived_stats(combatant):
+    """
+    Calculate the values combat and display code read every turn
+    
+    Works for characters and enemies alike.
+    
+    Returns: Dictionary with 'attack_power', 'spell_power' and 'damage_reduction'
+    """
+    strength = combatant.get("strength", 0)
+    return {
+        "attack_power": strength,
+        "spell_power": combatant.get("magic", 0),
+        # Defenders shrug off a quarter of their strength, plus their
+        # defense (from armor), in damage
+        "damage_reduction": strength // 4 + combatant.get("defense", 0),
+    }
+
+def get_derived_stats(combatant):
+    """
+    Get cached derived stats, calculating them only when stale
+    
+    The cache is cleared whenever a slot changes, a permanent stat
+    effect is applied, or the character levels up.
+    """
+    derived = combatant.get("derived_stats")
+    if derived is None:
+        derived = calculate_derived_stats(combatant)
+        combatant["derived_stats"] = derived
+    return derived
+
+# ============================================================================
+# DISPLAY
+# ============================================================================
+
+def display_character_stats(character):
+    """
+    Display the character's stats and equipment
+    """
+    if not renderer.enabled():
+        return
+
+    derived = get_derived_stats(character)
+    equipment = get_equipment(character)
+
+    lines = [
+        f"\n=== {character['name']} the {character['class']} ===",
+        f"Level: {character['level']} (XP: {character['experience']}/{get_xp_to_next_level(character['level'])})",
+        f"Health: {character['health']}/{character['max_health']}",
+        f"Strength: {character['strength']} | Magic: {character['magic']} | Defense: {character.get('defense', 0)}",
+        f"Attack Power: {derived['attack_power']} | Spell Power: {derived['spell_power']}",
+        f"Gold: {character['gold']}",
+    ]
+    if not equipment:
+        lines.append("Equipment: None")
+    else:
+        lines.append("Equipment:")
+        for slot in equipment:
+            lines.append(f"  {slot}: {equipment[slot]}")
+
+    renderer.show("character_stats", "\n".join(lines),
+                  name=character['name'], character_class=character['class'],
+                  level=character['level'], experience=character['experience'],
+                  health=character['health'], max_health=character['max_health'],
+                  strength=character['strength'], magic=character['magic'],
+                  defense=character.get('defense', 0), gold=character['gold'],
+                  attack_power=derived['attack_power'], spell_power=derived['spell_power'],
+                  equipment=dict(equipment))
+
 # ============================================================================
 # VALIDATION
 # ============================================================================
@@ -465,8 +896,4 @@ if __name__ == "__main__":
     # except CharacterNotFoundError:
     #     print("Character not found")
     # except SaveFileCorruptedError:
-<<<<<<< HEAD
-    #     print("Save file corrupted")
-=======
     #     print("Save file corrupted")
->>>>>>> effbbc7ea9df0b4db805e3ed41175a57fcc9c474
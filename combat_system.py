@@ -12,6 +12,14 @@ AI Usage: I defined the module structure and constraints. The AI implemented the
 """
 import random
 import math # Used for floor division equivalence
+from array import array
+
+import battle_log
+import event_bus
+import renderer
+import status_effects
+
+from character_manager import get_derived_stats
 
 from custom_exceptions import (
     InvalidTargetError,
@@ -34,9 +42,9 @@ def create_enemy(enemy_type):
     enemy_type = enemy_type.lower()
     
     enemy_stats = {
-        'goblin': {'name': 'Goblin', 'health': 50, 'strength': 8, 'magic': 2, 'xp_reward': 25, 'gold_reward': 10, 'type': 'goblin'},
-        'orc': {'name': 'Orc', 'health': 80, 'strength': 12, 'magic': 5, 'xp_reward': 50, 'gold_reward': 25, 'type': 'orc'},
-        'dragon': {'name': 'Dragon', 'health': 200, 'strength': 25, 'magic': 15, 'xp_reward': 200, 'gold_reward': 100, 'type': 'dragon'}
+        'goblin': {'name': 'Goblin', 'health': 50, 'strength': 8, 'magic': 2, 'speed': 12, 'xp_reward': 25, 'gold_reward': 10, 'type': 'goblin'},
+        'orc': {'name': 'Orc', 'health': 80, 'strength': 12, 'magic': 5, 'speed': 9, 'xp_reward': 50, 'gold_reward': 25, 'type': 'orc'},
+        'dragon': {'name': 'Dragon', 'health': 200, 'strength': 25, 'magic': 15, 'speed': 6, 'xp_reward': 200, 'gold_reward': 100, 'type': 'dragon'}
     }
     
     if enemy_type not in enemy_stats:
@@ -70,16 +78,38 @@ class SimpleBattle:
     """
     Simple turn-based combat system
     
-    Manages combat between character and enemy
+    Manages combat between character and enemy. Everything that happens
+    is recorded in self.log (see battle_log); the character is actor 0
+    and the enemy actor 1.
     """
     
-    def __init__(self, character, enemy):
-        """Initialize battle with character and enemy"""
+    def __init__(self, character, enemy, rng=None, player_policy=None, enemy_policy=None):
+        """
+        Initialize battle with character and enemy
+        
+        rng supplies random() and choice(); the random module by default.
+        A policy picks actions for its side with
+        choose_action(battle, side) -> '1' (Attack), '2' (Ability) or
+        '3' (Run), see battle_ai; without one the player always attacks
+        and so does the enemy.
+        """
         self.character = character
         self.enemy = enemy
         self.combat_active = False
         self.turn_counter = 0
-        self.player_last_ability_turn = 0 # Simple cooldown tracker
+        # Turn each ability was last used, by ability number (see abilities)
+        self.ability_last_turn = array('l', [0]) * len(abilities)
+        self.rng = rng if rng is not None else random
+        self.player_policy = player_policy
+        self.enemy_policy = enemy_policy
+        self.log = None
+        # Damage table: [character hits enemy, enemy hits character], each
+        # (attacker derived stats, defender derived stats, damage) or None
+        self.damage_table = [None, None]
+        # Status effects (see apply_status), created with the first one
+        self.status = None
+        # Effects started before the log was, logged when the battle starts
+        self.unlogged_status = []
     
     def start_battle(self):
         """
@@ -94,62 +124,167 @@ class SimpleBattle:
             
         self.combat_active = True
         self.turn_counter = 0
+        self.log = battle_log.start_log([self.character, self.enemy])
+        for effect in self.unlogged_status:
+            self._log_status(effect)
+        self.unlogged_status = []
         display_battle_log(f"A wild {self.enemy['name']} attacks!")
 
-        while self.combat_active:
-            self.turn_counter += 1
-            
-            # --- 1. Player Turn ---
-            display_combat_stats(self.character, self.enemy)
-            display_battle_log(f"--- Turn {self.turn_counter} ---")
-            
-            # Get player action (This assumes interactive input outside the class)
-            # For demonstration, we'll force a basic attack unless they can run
-            
-            # Get player choice (usually input(), but we'll simulate an action)
-            # Action: 1=Attack, 2=Ability, 3=Run
-            player_choice = '1' # Default to attack
-            
-            # This is where interactive input would go:
-            # player_choice = input("1. Attack | 2. Ability | 3. Run: ")
-            
-            try:
-                # We handle the player action
-                if player_choice == '1':
-                    self.basic_attack(self.character, self.enemy)
-                elif player_choice == '2':
-                    # NOTE: Simplified ability usage; assumes no separate inventory management
-                    self.use_special_ability()
-                elif player_choice == '3':
-                    if self.attempt_escape():
-                        display_battle_log(f"{self.character['name']} successfully escaped!")
-                        self.combat_active = False
-                        break
-                    else:
-                        display_battle_log(f"{self.character['name']} failed to escape!")
-                else:
-                    display_battle_log("Invalid choice. Skipping turn...")
-                    
-            except AbilityOnCooldownError as e:
-                display_battle_log(f"Action failed: {e}")
-                continue # Player loses a turn
-            
-            # --- 2. Check End Condition after Player Turn ---
+        try:
+            while self.combat_active:
+                result = self._play_turn()
+                if result is not None:
+                    self._record(battle_log.END, 0, battle_log.WINNER_CODES[result['winner']])
+                    return result
+
+            self._record(battle_log.END, 0, battle_log.WINNER_CODES['none'])
+            return {'winner': 'none', 'xp_gained': 0, 'gold_gained': 0}
+        finally:
+            # Status effects end with the battle; stat changes must not stick
+            if self.status is not None:
+                self.status.clear()
+
+    def _record(self, kind, actor, *fields):
+        """Add an event to the battle log, if the battle has one"""
+        if self.log is not None:
+            battle_log.record(self.log, kind, actor, *fields)
+
+    def _actor(self, combatant):
+        """Return a combatant's actor number in the log"""
+        return 0 if combatant is self.character else 1
+
+    def _draw_random(self, actor):
+        """Draw a random float in [0, 1), logged at battle_log.DRAW_SCALE resolution"""
+        step = int(self.rng.random() * battle_log.DRAW_SCALE)
+        self._record(battle_log.DRAW, actor, step)
+        return step / battle_log.DRAW_SCALE
+
+    def _draw_choice(self, actor, options):
+        """Pick one of options at random, logging which"""
+        index = options.index(self.rng.choice(options))
+        self._record(battle_log.DRAW, actor, index)
+        return options[index]
+
+    def _play_turn(self):
+        """
+        Play one round: the player acts, then the enemy
+        
+        Returns: Battle results if the battle was won or lost this turn,
+                 otherwise None (combat_active is cleared on escape)
+        """
+        self.turn_counter += 1
+        self._record(battle_log.TURN, 0)
+        
+        # --- 0. Status Effects ---
+        if self.status is not None:
+            self._tick_status()
             winner = self.check_battle_end()
             if winner:
                 self.combat_active = False
                 return self._handle_victory(winner)
+        
+        # --- 1. Player Turn ---
+        display_combat_stats(self.character, self.enemy)
+        display_battle_log(f"--- Turn {self.turn_counter} ---")
+        
+        # Get player action (This assumes interactive input outside the class)
+        # Action: 1=Attack, 2=Ability, 3=Run
+        player_choice = '1' # Default to attack
+        stunned = self._is_stunned(self.character)
+        if self.player_policy is not None and not stunned:
+            player_choice = self.player_policy.choose_action(self, 'player')
+            # The policy may have started status effects, a stun among them
+            stunned = self._is_stunned(self.character)
+        if stunned:
+            display_battle_log(f"{self.character['name']} is stunned!")
+            player_choice = None
+        
+        # This is where interactive input would go:
+        # player_choice = input("1. Attack | 2. Ability | 3. Run: ")
+        
+        try:
+            # We handle the player action
+            if player_choice == '1':
+                self.basic_attack(self.character, self.enemy)
+            elif player_choice == '2':
+                # NOTE: Simplified ability usage; assumes no separate inventory management
+                self.use_special_ability()
+            elif player_choice == '3':
+                if self.attempt_escape():
+                    display_battle_log(f"{self.character['name']} successfully escaped!")
+                    self.combat_active = False
+                    return None
+                else:
+                    display_battle_log(f"{self.character['name']} failed to escape!")
+            elif player_choice is not None:
+                display_battle_log("Invalid choice. Skipping turn...")
+                
+        except AbilityOnCooldownError as e:
+            display_battle_log(f"Action failed: {e}")
+            return None # Player loses a turn
+        
+        # --- 2. Check End Condition after Player Turn ---
+        winner = self.check_battle_end()
+        if winner:
+            self.combat_active = False
+            return self._handle_victory(winner)
+
+        # --- 3. Enemy Turn ---
+        self.enemy_turn()
+        if not self.combat_active:
+            return None # The enemy fled
+        
+        # --- 4. Check End Condition after Enemy Turn ---
+        winner = self.check_battle_end()
+        if winner:
+            self.combat_active = False
+            return self._handle_victory(winner)
+        return None
+
+    def apply_status(self, target, effect_id, duration=None, amount=None):
+        """
+        Start a status effect (see status_effects.STATUS_EFFECTS) on the
+        character or the enemy
 
-            # --- 3. Enemy Turn ---
-            self.enemy_turn()
-            
-            # --- 4. Check End Condition after Enemy Turn ---
-            winner = self.check_battle_end()
-            if winner:
-                self.combat_active = False
-                return self._handle_victory(winner)
+        It is active for the next duration turns. Effects are logged, so
+        rerun_battle starts them again at the same point.
 
-        return {'winner': 'none', 'xp_gained': 0, 'gold_gained': 0}
+        Returns: The effect dictionary
+        Raises: InvalidTargetError if target is not in this battle,
+                ValueError for an unknown effect
+        """
+        if target is not self.character and target is not self.enemy:
+            raise InvalidTargetError(f"{target.get('name', 'Target')} is not in this battle.")
+        if self.status is None:
+            self.status = status_effects.StatusEngine()
+        effect = self.status.apply(target, effect_id, duration, amount)
+        if self.log is None:
+            self.unlogged_status.append(effect)
+        else:
+            self._log_status(effect)
+        display_battle_log(f"{target['name']} is affected by {effect_id.replace('_', ' ')}!")
+        return effect
+
+    def _is_stunned(self, combatant):
+        """Return True if a status effect stuns combatant this turn"""
+        return self.status is not None and self.status.is_stunned(combatant)
+
+    def _log_status(self, effect):
+        """Record the start of a status effect"""
+        actor = self._actor(effect['target'])
+        self._record(battle_log.STATUS, actor, actor, status_effects.STATUS_NUMBERS[effect['id']],
+                     effect['duration'], battle_log.signed(effect['amount']))
+
+    def _tick_status(self):
+        """Expire finished status effects and apply damage and healing over time"""
+        for combatant, change in self.status.advance():
+            actor = self._actor(combatant)
+            if change < 0:
+                self._record(battle_log.DAMAGE, actor, actor, -change)
+                display_battle_log(f"{combatant['name']} takes {-change} damage from status effects!")
+            else:
+                self._record(battle_log.HEAL, actor, actor, change)
+                display_battle_log(f"{combatant['name']} recovers {change} health from status effects!")
 
     def _handle_victory(self, winner):
         """Helper to process rewards and final status."""
@@ -162,6 +297,9 @@ class SimpleBattle:
 
             display_battle_log(f"{self.character['name']} defeated the {self.enemy['name']}!")
             display_battle_log(f"Gained {rewards['xp']} XP and {rewards['gold']} Gold.")
+
+            # Let quest objectives (and anything else listening) count the kill
+            event_bus.emit(event_bus.ENEMY_DEFEATED, self.enemy.get('type'), self.character)
             return {
                 'winner': 'player', 
                 'xp_gained': rewards['xp'], 
@@ -185,15 +323,16 @@ class SimpleBattle:
             raise CombatNotActiveError("Combat is not currently active.")
         
         display_battle_log("Options:")
-        print("1. Basic Attack")
-        print("2. Special Ability (if available)")
-        print("3. Try to Run")
+        renderer.line("1. Basic Attack")
+        renderer.line("2. Special Ability (if available)")
+        renderer.line("3. Try to Run")
         # Player input would be processed here...
         
     def basic_attack(self, attacker, defender):
         """Perform a standard attack."""
         damage = self.calculate_damage(attacker, defender)
         self.apply_damage(defender, damage)
+        self._record(battle_log.ATTACK, self._actor(attacker), self._actor(defender), damage)
         display_battle_log(f"{attacker['name']} attacks {defender['name']} for {damage} damage!")
 
 
@@ -201,16 +340,38 @@ class SimpleBattle:
         """
         Handle enemy's turn - simple AI
         
-        Enemy always attacks
+        Enemy always attacks, unless stunned or an enemy_policy chooses to
+        run (which clears combat_active if the enemy gets away, and uses
+        up its action either way, like the player's escape)
         """
         if not self.combat_active:
             raise CombatNotActiveError("Combat is not currently active.")
+        
+        enemy_choice = '1'
+        stunned = self._is_stunned(self.enemy)
+        if self.enemy_policy is not None and not stunned:
+            enemy_choice = self.enemy_policy.choose_action(self, 'enemy')
+            stunned = self._is_stunned(self.enemy)
+        if stunned:
+            display_battle_log(f"The {self.enemy['name']} is stunned!")
+            return
+        
+        if enemy_choice == '3':
+            escaped = self._draw_choice(1, [True, False])
+            self._record(battle_log.ESCAPE, 1, int(escaped))
+            if escaped:
+                display_battle_log(f"The {self.enemy['name']} flees!")
+                self.combat_active = False
+            else:
+                display_battle_log(f"The {self.enemy['name']} tries to flee but fails!")
+            return
             
         # Calculate damage (Enemy uses its Strength stat)
         damage = self.calculate_damage(self.enemy, self.character)
         
         # Apply to character
         self.apply_damage(self.character, damage)
+        self._record(battle_log.ATTACK, 1, 0, damage)
         
         display_battle_log(f"{self.enemy['name']} strikes {self.character['name']} for {damage} damage!")
         
@@ -219,20 +380,29 @@ class SimpleBattle:
         """
         Calculate damage from attack
         
-        Damage formula: attacker['strength'] - (defender['strength'] // 4)
+        Damage formula: attacker['strength'] - (defender['strength'] // 4 + defender['defense'])
         Minimum damage: 1
-        """
-        attacker_stat = attacker.get('strength', 0)
-        defender_stat = defender.get('strength', 0) # Assumes 'strength' doubles as defense stat in formula
-        
-        # Damage formula: attacker['strength'] - (defender['strength'] // 4)
-        damage_reduction = defender_stat // 4
         
-        raw_damage = attacker_stat - damage_reduction
+        Between the battle's two combatants the damage comes from the
+        damage table. An entry is reused while both sides still have the
+        derived stats it was computed from: equipment, stat effects and
+        level-ups replace those (see get_derived_stats), so a stale entry
+        is recomputed on the next hit.
+        """
+        if attacker is self.character and defender is self.enemy:
+            row = 0
+        elif attacker is self.enemy and defender is self.character:
+            row = 1
+        else:
+            return calculate_damage(attacker, defender)
         
-        # Minimum damage: 1
-        damage = max(1, raw_damage)
+        entry = self.damage_table[row]
+        if (entry is not None and entry[0] is attacker.get('derived_stats')
+                and entry[1] is defender.get('derived_stats')):
+            return entry[2]
         
+        damage = calculate_damage(attacker, defender)
+        self.damage_table[row] = (attacker['derived_stats'], defender['derived_stats'], damage)
         return damage
     
     def apply_damage(self, target, damage):
@@ -272,37 +442,75 @@ class SimpleBattle:
         """
         # If successful, set combat_active to False (handled in start_battle)
         # Use random number: 0 or 1, 50% chance for True
-        return random.choice([True, False])
+        escaped = self._draw_choice(0, [True, False])
+        self._record(battle_log.ESCAPE, 0, int(escaped))
+        return escaped
 
-    def use_special_ability(self):
+    def use_special_ability(self, ability_id=None):
         """
-        Uses the character's special ability.
+        Uses one of the character's special abilities (by default the
+        first one of their class)
+        
+        Each ability has its own cooldown, in turns.
         
-        Raises: AbilityOnCooldownError (simplified)
+        Raises: AbilityOnCooldownError if the ability was used too recently,
+                InvalidTargetError if ability_id is not a known ability
         """
-        # Basic Cooldown Check: only once every 3 turns
-        if self.turn_counter - self.player_last_ability_turn < 3:
-            raise AbilityOnCooldownError("Special ability is on cooldown. Wait a few turns!")
-            
-        self.player_last_ability_turn = self.turn_counter
-
-        char_class = self.character.get('class', 'Warrior').lower()
-        
-        if char_class == 'warrior':
-            warrior_power_strike(self.character, self.enemy)
-        elif char_class == 'mage':
-            mage_fireball(self.character, self.enemy)
-        elif char_class == 'rogue':
-            rogue_critical_strike(self.character, self.enemy)
-        elif char_class == 'cleric':
-            cleric_heal(self.character)
+        if ability_id is None:
+            numbers = class_abilities.get(self.character.get('class', 'Warrior').lower())
+            if not numbers:
+                display_battle_log("No known special ability for this class.")
+                return
+            number = numbers[0]
+        else:
+            number = ability_numbers.get(ability_id)
+            if number is None:
+                raise InvalidTargetError(f"Unknown ability '{ability_id}'.")
+        
+        ability = abilities[number]
+        last_turn = self.ability_last_turn
+        if number >= len(last_turn):
+            # Abilities were added after this battle started
+            last_turn.extend([0] * (number + 1 - len(last_turn)))
+        if self.turn_counter - last_turn[number] < ability['cooldown']:
+            raise AbilityOnCooldownError(f"{ability['name']} is on cooldown. Wait a few turns!")
+        last_turn[number] = self.turn_counter
+        
+        self._record(battle_log.ABILITY, 0, number)
+        roll = self._draw_random(0) if ability['needs_roll'] else None
+        damage, healing = ability['cast'](self.character, self.enemy, roll)
+        if ability['effect'] == 'heal':
+            self._record(battle_log.HEAL, 0, 0, healing)
         else:
-            display_battle_log("No known special ability for this class.")
+            self._record(battle_log.DAMAGE, 0, 1, damage)
 
 # ============================================================================
 # SPECIAL ABILITIES
 # ============================================================================
 
+# Built-in abilities, the same as data/abilities.txt (see game_data.load_abilities)
+DEFAULT_ABILITIES = {
+    'power_strike': {'ABILITY_ID': 'power_strike', 'NAME': 'Power Strike', 'CLASS': 'warrior',
+                     'EFFECT': 'damage', 'STAT': 'strength', 'MULTIPLIER': 2, 'COOLDOWN': 3,
+                     'MESSAGE': "{user} uses Power Strike for {amount} damage!"},
+    'fireball': {'ABILITY_ID': 'fireball', 'NAME': 'Fireball', 'CLASS': 'mage',
+                 'EFFECT': 'damage', 'STAT': 'magic', 'MULTIPLIER': 2, 'COOLDOWN': 3,
+                 'MESSAGE': "{user} casts Fireball for {amount} magic damage!"},
+    'critical_strike': {'ABILITY_ID': 'critical_strike', 'NAME': 'Critical Strike', 'CLASS': 'rogue',
+                        'EFFECT': 'critical', 'STAT': 'strength', 'CHANCE': 0.5, 'MULTIPLIER': 3,
+                        'FAIL_MULTIPLIER': 1, 'COOLDOWN': 3,
+                        'MESSAGE': "{user} lands a CRITICAL STRIKE for {amount} damage!",
+                        'FAIL_MESSAGE': "{user} attempts a Critical Strike, hitting for {amount} damage."},
+    'heal': {'ABILITY_ID': 'heal', 'NAME': 'Heal', 'CLASS': 'cleric', 'EFFECT': 'heal',
+             'AMOUNT': 30, 'COOLDOWN': 3, 'MESSAGE': "{user} uses Heal, restoring {amount} health."},
+}
+
+# Compiled abilities; an ability's number (used in battle logs and
+# cooldown arrays) is its position here
+abilities = []
+ability_numbers = {}
+class_abilities = {}
+
 def _apply_ability_damage(target, damage):
     """Helper for abilities to apply damage similarly to SimpleBattle.apply_damage"""
     current_health = target.get('health', 0)
@@ -310,51 +518,161 @@ def _apply_ability_damage(target, damage):
     if target['health'] < 0:
         target['health'] = 0
 
+def compile_ability(ability):
+    """
+    Turn an ability definition into a callable
+    
+    Returns: Dictionary with 'id', 'name', 'class', 'effect', 'cooldown',
+             'needs_roll' (True if cast needs a random roll), 'cast', a
+             function (user, target, roll) -> (damage dealt, health
+             restored), and 'definition' (the ability data)
+    """
+    effect = ability['EFFECT']
+    message = ability.get('MESSAGE', "{user} uses " + ability['NAME'] + " for {amount}!")
+
+    if effect == 'damage':
+        stat = ability['STAT']
+        multiplier = ability['MULTIPLIER']
+
+        def cast(user, target, roll=None):
+            damage = user.get(stat, 0) * multiplier
+            _apply_ability_damage(target, damage)
+            if renderer.enabled():
+                display_battle_log(message.format(user=user['name'], amount=damage))
+            return damage, 0
+
+    elif effect == 'critical':
+        stat = ability['STAT']
+        chance = ability['CHANCE']
+        multiplier = ability['MULTIPLIER']
+        fail_multiplier = ability.get('FAIL_MULTIPLIER', 1)
+        fail_message = ability.get('FAIL_MESSAGE', message)
+
+        def cast(user, target, roll=None):
+            if roll is None:
+                roll = random.random()
+            if roll < chance:
+                damage = user.get(stat, 0) * multiplier
+                text = message
+            else:
+                damage = user.get(stat, 0) * fail_multiplier
+                text = fail_message
+            _apply_ability_damage(target, damage)
+            if renderer.enabled():
+                display_battle_log(text.format(user=user['name'], amount=damage))
+            return damage, 0
+
+    elif effect == 'heal':
+        amount = ability['AMOUNT']
+
+        def cast(user, target, roll=None):
+            # Heals the user, not exceeding max_health
+            max_health = user.get('max_health', 1)
+            healed = max(0, min(amount, max_health - user.get('health', 0)))
+            user['health'] = min(user.get('health', 0) + amount, max_health)
+            if renderer.enabled():
+                display_battle_log(message.format(user=user['name'], amount=healed))
+            return 0, healed
+
+    else:
+        raise ValueError(f"Unknown ability effect '{effect}'")
+
+    return {
+        'id': ability['ABILITY_ID'],
+        'name': ability['NAME'],
+        'class': ability['CLASS'],
+        'effect': effect,
+        'cooldown': ability.get('COOLDOWN', 3),
+        'needs_roll': effect == 'critical',
+        'cast': cast,
+        'definition': ability,
+    }
+
+def set_abilities(ability_data_dict):
+    """
+    Replace the active abilities (e.g. with game_data.load_abilities())
+    
+    The built-in abilities are kept unless ability_data_dict redefines
+    them, so their numbers in existing battle logs stay the same.
+    """
+    global abilities, ability_numbers, class_abilities
+
+    definitions = dict(DEFAULT_ABILITIES)
+    definitions.update(ability_data_dict)
+
+    compiled = []
+    numbers = {}
+    by_class = {}
+    for ability_id in definitions:
+        numbers[ability_id] = len(compiled)
+        by_class.setdefault(definitions[ability_id]['CLASS'].lower(), []).append(len(compiled))
+        compiled.append(compile_ability(definitions[ability_id]))
+
+    abilities = compiled
+    ability_numbers = numbers
+    class_abilities = by_class
+
+def get_class_ability(char_class):
+    """
+    Return the compiled default ability of a class, or None
+    """
+    numbers = class_abilities.get(str(char_class).lower())
+    return abilities[numbers[0]] if numbers else None
+
+def cast_ability(ability_id, user, target, roll=None):
+    """
+    Use an ability outside a battle (no cooldown)
+    
+    Returns: Tuple of (damage dealt, health restored)
+    Raises: InvalidTargetError if ability_id is not a known ability
+    """
+    number = ability_numbers.get(ability_id)
+    if number is None:
+        raise InvalidTargetError(f"Unknown ability '{ability_id}'.")
+    return abilities[number]['cast'](user, target, roll)
+
 def warrior_power_strike(character, enemy):
     """Warrior special ability: 2x strength damage"""
-    base_damage = character.get('strength', 0) * 2
-    _apply_ability_damage(enemy, base_damage)
-    display_battle_log(f"{character['name']} uses Power Strike for {base_damage} damage!")
+    return cast_ability('power_strike', character, enemy)[0]
 
 def mage_fireball(character, enemy):
     """Mage special ability: 2x magic damage"""
-    base_damage = character.get('magic', 0) * 2
-    _apply_ability_damage(enemy, base_damage)
-    display_battle_log(f"{character['name']} casts Fireball for {base_damage} magic damage!")
-
-def rogue_critical_strike(character, enemy):
-    """Rogue special ability: 50% chance for triple strength damage"""
-    if random.random() < 0.5: # 50% chance
-        damage = character.get('strength', 0) * 3
-        _apply_ability_damage(enemy, damage)
-        display_battle_log(f"{character['name']} lands a CRITICAL STRIKE for {damage} damage!")
-    else:
-        # Standard attack damage if crit fails (or zero for simplicity)
-        damage = character.get('strength', 0) # Just a standard hit, or 0 ability damage
-        _apply_ability_damage(enemy, damage)
-        display_battle_log(f"{character['name']} attempts a Critical Strike, hitting for {damage} damage.")
+    return cast_ability('fireball', character, enemy)[0]
+
+def rogue_critical_strike(character, enemy, roll=None):
+    """
+    Rogue special ability: 50% chance for triple strength damage
+    
+    roll is the random draw in [0, 1) deciding the critical; drawn here if not given
+    """
+    return cast_ability('critical_strike', character, enemy, roll)[0]
 
 def cleric_heal(character):
     """Cleric special ability: Restore 30 health (not exceeding max_health)"""
-    heal_amount = 30
-    current_health = character.get('health', 0)
-    max_health = character.get('max_health', 1)
-    
-    new_health = current_health + heal_amount
-    
-    # Not exceeding max_health
-    if new_health > max_health:
-        heal_amount = max_health - current_health
-        character['health'] = max_health
-    else:
-        character['health'] = new_health
-        
-    display_battle_log(f"{character['name']} uses Heal, restoring {heal_amount} health.")
+    return cast_ability('heal', character, character)[1]
+
+set_abilities({})
 
 # ============================================================================
 # COMBAT UTILITIES
 # ============================================================================
 
+def calculate_damage(attacker, defender):
+    """
+    Calculate the damage of a basic attack (see SimpleBattle.calculate_damage)
+    
+    Returns: Damage, at least 1
+    """
+    attacker_stat = get_derived_stats(attacker)['attack_power']
+    
+    # Damage formula: attacker['strength'] - (defender['strength'] // 4 + defender['defense'])
+    damage_reduction = get_derived_stats(defender)['damage_reduction']
+    
+    raw_damage = attacker_stat - damage_reduction
+    
+    # Minimum damage: 1
+    return max(1, raw_damage)
+
 def can_character_fight(character):
     """
     Check if character is in condition to fight
@@ -382,16 +700,22 @@ def display_combat_stats(character, enemy):
     
     Shows both character and enemy health/stats
     """
-    print("\n--------------------------")
-    print(f"{character['name']} ({character['class']}): HP={character['health']}/{character['max_health']}")
-    print(f"{enemy['name']}: HP={enemy['health']}/{enemy['max_health']}")
-    print("--------------------------")
+    if not renderer.enabled():
+        return
+
+    renderer.show("combat_stats",
+                  "\n--------------------------\n"
+                  f"{character['name']} ({character['class']}): HP={character['health']}/{character['max_health']}\n"
+                  f"{enemy['name']}: HP={enemy['health']}/{enemy['max_health']}\n"
+                  "--------------------------",
+                  character=character['name'], health=character['health'], max_health=character['max_health'],
+                  enemy=enemy['name'], enemy_health=enemy['health'], enemy_max_health=enemy['max_health'])
 
 def display_battle_log(message):
     """
     Display a formatted battle message
     """
-    print(f">>> {message}")
+    renderer.show("battle_log", f">>> {message}", message=message)
 
 # ============================================================================
 # TESTING
@@ -421,12 +745,5 @@ if __name__ == "__main__":
     # try:
     #     result = battle.start_battle()
     #     print(f"Battle result: {result}")
-<<<<<<< HEAD
-=======
-    # except CharacterDeadError:
-    #     print("Character is dead!")
-    #     result = battle.start_battle()
-    #     print(f"Battle result: {result}")
->>>>>>> effbbc7ea9df0b4db805e3ed41175a57fcc9c474
     # except CharacterDeadError:
     #     print("Character is dead!")
\ No newline at end of file
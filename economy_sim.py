@@ -0,0 +1,249 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Economy Simulation Module
+
+Runs a population of synthetic players through explore -> reward -> shop
+cycles using the real reward and shop functions, so item prices can be
+tuned offline instead of in live sessions.
+
+Usage: python economy_sim.py [num_agents] [num_cycles] [--profile=MODES]
+"""
+
+import random
+import sys
+from array import array
+
+import character_manager
+import inventory_system
+import combat_system
+import game_data
+import profiling
+from custom_exceptions import InsufficientResourcesError, InventoryFullError
+
+CLASSES = ["Warrior", "Mage", "Rogue", "Cleric"]
+
+# ============================================================================
+# PRICING
+# ============================================================================
+
+def scale_prices(item_data_dict, price_multiplier):
+    """
+    Copy the catalog with every COST scaled by price_multiplier
+    """
+    priced = {}
+    for item_id in item_data_dict:
+        item = dict(item_data_dict[item_id])
+        item["COST"] = str(int(int(item["COST"]) * price_multiplier))
+        priced[item_id] = item
+    return priced
+
+# ============================================================================
+# SIMULATION
+# ============================================================================
+
+def run_economy_simulation(item_data_dict, num_agents=1000, num_cycles=50,
+                           price_multiplier=1.0, win_chance=0.8,
+                           shop_chance=0.5, use_chance=0.3, sell_chance=0.2,
+                           seed=None):
+    """
+    Simulate num_agents players for num_cycles explore/shop cycles
+
+    Each cycle every agent explores (winning with win_chance and collecting
+    combat_system.get_victory_rewards), may buy a random item with
+    inventory_system.purchase_item, may drink a consumable, and may sell
+    a piece of gear with inventory_system.sell_item.
+
+    Per-agent gold flows are kept in flat integer columns (one slot per
+    agent) and summed once per cycle, rather than in per-agent records.
+
+    Returns: Report dictionary (see summarize_economy)
+    """
+    rng = random.Random(seed)
+    catalog = scale_prices(item_data_dict, price_multiplier)
+    item_ids = list(catalog.keys())
+
+    agents = []
+    i = 0
+    while i < num_agents:
+        agents.append(character_manager.create_character(f"agent_{i}", CLASSES[i % len(CLASSES)]))
+        i += 1
+
+    # Per-agent gold columns
+    earned = array("q", [0] * num_agents)
+    spent = array("q", [0] * num_agents)
+    refunded = array("q", [0] * num_agents)
+
+    # Per-item flow counters
+    bought = dict.fromkeys(item_ids, 0)
+    sold = dict.fromkeys(item_ids, 0)
+    consumed = dict.fromkeys(item_ids, 0)
+
+    # Victory rewards only depend on the enemy picked for a level
+    rewards_by_level = {}
+
+    starting_gold = sum(agent["gold"] for agent in agents)
+    mean_gold = [starting_gold / num_agents if num_agents else 0.0]
+
+    cycle = 0
+    while cycle < num_cycles:
+        a = 0
+        while a < num_agents:
+            agent = agents[a]
+
+            # --- Explore -> Reward ---
+            if rng.random() < win_chance:
+                level = agent["level"]
+                rewards = rewards_by_level.get(level)
+                if rewards is None:
+                    enemy = combat_system.get_random_enemy_for_level(level)
+                    rewards = combat_system.get_victory_rewards(enemy)
+                    rewards_by_level[level] = rewards
+                character_manager.add_gold(agent, rewards["gold"])
+                character_manager.gain_experience(agent, rewards["xp"])
+                earned[a] += rewards["gold"]
+
+            # --- Shop: buy ---
+            if item_ids and rng.random() < shop_chance:
+                item_id = item_ids[rng.randrange(len(item_ids))]
+                item = catalog[item_id]
+                try:
+                    inventory_system.purchase_item(agent, item_id, item, character_manager.add_gold)
+                    spent[a] += int(item["COST"])
+                    bought[item_id] += 1
+                except (InsufficientResourcesError, InventoryFullError):
+                    pass
+
+            inventory = agent["inventory"]
+
+            # --- Use a consumable (gold sink: the item leaves the economy) ---
+            if inventory and rng.random() < use_chance:
+                item_id = inventory[rng.randrange(len(inventory))]
+                if catalog[item_id].get("TYPE", "").lower() == "consumable":
+                    inventory_system.remove_item_from_inventory(agent, item_id)
+                    consumed[item_id] += 1
+
+            # --- Shop: sell ---
+            inventory = agent["inventory"]
+            if inventory and rng.random() < sell_chance:
+                item_id = inventory[rng.randrange(len(inventory))]
+                refunded[a] += inventory_system.sell_item(agent, item_id, catalog[item_id], character_manager.add_gold)
+                sold[item_id] += 1
+
+            a += 1
+
+        mean_gold.append(sum(agent["gold"] for agent in agents) / num_agents if num_agents else 0.0)
+        cycle += 1
+
+    return summarize_economy(mean_gold, earned, spent, refunded, bought, sold, consumed, price_multiplier)
+
+def summarize_economy(mean_gold, earned, spent, refunded, bought, sold, consumed, price_multiplier):
+    """
+    Build the report for one simulation run
+
+    Returns: Dictionary with:
+        'mean_gold': average gold per agent after each cycle
+        'inflation_per_cycle': average growth rate of mean gold per cycle
+        'gold_earned' / 'gold_spent' / 'gold_refunded': population totals
+        'sink_rate': share of earned gold removed by purchases net of sales
+        'items_bought' / 'items_sold' / 'items_consumed': per-item counts
+        'item_sink_rate': per-item share of bought items consumed or sold back
+    """
+    cycles = len(mean_gold) - 1
+    inflation = 0.0
+    if cycles > 0 and mean_gold[0] > 0:
+        inflation = (mean_gold[-1] / mean_gold[0]) ** (1.0 / cycles) - 1.0
+
+    total_earned = sum(earned)
+    total_spent = sum(spent)
+    total_refunded = sum(refunded)
+
+    item_sink_rate = {}
+    for item_id in bought:
+        if bought[item_id]:
+            item_sink_rate[item_id] = (consumed[item_id] + sold[item_id]) / bought[item_id]
+        else:
+            item_sink_rate[item_id] = 0.0
+
+    return {
+        "price_multiplier": price_multiplier,
+        "mean_gold": mean_gold,
+        "inflation_per_cycle": inflation,
+        "gold_earned": total_earned,
+        "gold_spent": total_spent,
+        "gold_refunded": total_refunded,
+        "sink_rate": (total_spent - total_refunded) / total_earned if total_earned else 0.0,
+        "items_bought": bought,
+        "items_sold": sold,
+        "items_consumed": consumed,
+        "item_sink_rate": item_sink_rate,
+    }
+
+def price_sensitivity(item_data_dict, multipliers=(0.5, 1.0, 1.5, 2.0), **sim_options):
+    """
+    Re-run the simulation at several price levels
+
+    Returns: List of (multiplier, report) tuples in the given order
+    """
+    results = []
+    i = 0
+    while i < len(multipliers):
+        report = run_economy_simulation(item_data_dict, price_multiplier=multipliers[i], **sim_options)
+        results.append((multipliers[i], report))
+        i += 1
+    return results
+
+# ============================================================================
+# DISPLAY
+# ============================================================================
+
+def display_economy_report(report):
+    """
+    Display one simulation report
+    """
+    print(f"\n=== ECONOMY REPORT (prices x{report['price_multiplier']}) ===")
+    print(f"Mean gold: {report['mean_gold'][0]:.1f} -> {report['mean_gold'][-1]:.1f}")
+    print(f"Inflation per cycle: {report['inflation_per_cycle'] * 100:.2f}%")
+    print(f"Gold earned: {report['gold_earned']} | spent: {report['gold_spent']} | refunded: {report['gold_refunded']}")
+    print(f"Sink rate: {report['sink_rate'] * 100:.1f}%")
+
+    print("\n| {:<20} | {:<7} | {:<7} | {:<8} | {:<6} |".format("Item", "Bought", "Sold", "Consumed", "Sink"))
+    print("-" * 63)
+    for item_id in report["items_bought"]:
+        print("| {:<20} | {:<7} | {:<7} | {:<8} | {:<6.2f} |".format(
+            item_id,
+            report["items_bought"][item_id],
+            report["items_sold"][item_id],
+            report["items_consumed"][item_id],
+            report["item_sink_rate"][item_id],
+        ))
+
+def display_price_sensitivity(results):
+    """
+    Display purchases and final gold at each price level
+    """
+    print("\n=== PRICE SENSITIVITY ===")
+    print("| {:<10} | {:<10} | {:<12} | {:<10} |".format("Prices", "Purchases", "Final Gold", "Inflation"))
+    print("-" * 54)
+    i = 0
+    while i < len(results):
+        multiplier, report = results[i]
+        purchases = sum(report["items_bought"].values())
+        print("| {:<10} | {:<10} | {:<12.1f} | {:<10} |".format(
+            f"x{multiplier}", purchases, report["mean_gold"][-1],
+            f"{report['inflation_per_cycle'] * 100:.2f}%",
+        ))
+        i += 1
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    num_agents = int(args[0]) if args else 1000
+    num_cycles = int(args[1]) if len(args) > 1 else 50
+
+    items = game_data.load_items()
+    display_economy_report(profiling.run_profiled("economy_sim", run_economy_simulation,
+                                                  items, num_agents, num_cycles, seed=163))
+    display_price_sensitivity(price_sensitivity(items, num_agents=num_agents, num_cycles=num_cycles, seed=163))
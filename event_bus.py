@@ -0,0 +1,121 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Event Bus Module
+
+A small in-process publish/subscribe hub. Game systems publish events
+(an enemy was defeated, an item was bought...) and other systems, such
+as quest objectives, subscribe to the exact (event type, key) pairs they
+care about. Publishing is a single dictionary lookup, so it costs the
+same no matter how many other subscriptions exist.
+"""
+
+# ============================================================================
+# EVENT TYPES
+# ============================================================================
+
+# Combat: key is the enemy type ('goblin', 'orc', ...)
+ENEMY_DEFEATED = "enemy_defeated"
+
+# Inventory and shop: published under the item ID and under the item
+# type ('weapon', 'consumable', ...); see emit_item_event
+ITEM_USED = "item_used"
+ITEM_EQUIPPED = "item_equipped"
+ITEM_PURCHASED = "item_purchased"
+ITEM_SOLD = "item_sold"
+
+EVENT_TYPES = [ENEMY_DEFEATED, ITEM_USED, ITEM_EQUIPPED, ITEM_PURCHASED, ITEM_SOLD]
+
+# {(event_type, key): [handler, ...]}
+_subscribers = {}
+
+# ============================================================================
+# SUBSCRIPTIONS
+# ============================================================================
+
+def subscribe(event_type, key, handler):
+    """
+    Call handler(character, event_type, key, amount) whenever the event is
+    published with this key (key is a tuple when an item event matched the
+    handler under both its item ID and its type)
+
+    Raises: ValueError if event_type is not one of EVENT_TYPES
+    """
+    if event_type not in EVENT_TYPES:
+        raise ValueError(f"Unknown event type '{event_type}'")
+
+    handlers = _subscribers.setdefault((event_type, key), [])
+    if handler not in handlers:
+        handlers.append(handler)
+
+def unsubscribe(event_type, key, handler):
+    """
+    Stop calling handler for this event and key (no-op if not subscribed)
+    """
+    handlers = _subscribers.get((event_type, key))
+    if handlers and handler in handlers:
+        handlers.remove(handler)
+        if not handlers:
+            del _subscribers[(event_type, key)]
+
+def clear_subscribers():
+    """
+    Remove every subscription
+    """
+    _subscribers.clear()
+
+# ============================================================================
+# PUBLISHING
+# ============================================================================
+
+def emit(event_type, key, character, amount=1):
+    """
+    Publish an event for a character
+
+    Returns: List of the non-None values returned by the handlers
+    """
+    handlers = _subscribers.get((event_type, key))
+    if not handlers:
+        return []
+
+    results = []
+    # Copy so handlers may unsubscribe themselves while being called
+    for handler in list(handlers):
+        result = handler(character, event_type, key, amount)
+        if result is not None:
+            results.append(result)
+    return results
+
+def emit_item_event(event_type, character, item_id, item_data, amount=1):
+    """
+    Publish an item event under both the item ID and the item type
+
+    A handler subscribed under both keys is still called only once, with
+    the tuple of both keys, so one event is never counted twice.
+
+    Returns: Combined handler results, one per handler called
+    """
+    keys = [item_id]
+    item_type = item_data.get('TYPE', item_data.get('type'))
+    if item_type and str(item_type).lower() != item_id:
+        keys.append(str(item_type).lower())
+
+    # [handler, keys it is subscribed under], in subscription order
+    calls = []
+    i = 0
+    while i < len(keys):
+        for handler in _subscribers.get((event_type, keys[i]), []):
+            j = 0
+            while j < len(calls) and calls[j][0] is not handler:
+                j += 1
+            if j == len(calls):
+                calls.append([handler, []])
+            calls[j][1].append(keys[i])
+        i += 1
+
+    results = []
+    for handler, handler_keys in calls:
+        key = handler_keys[0] if len(handler_keys) == 1 else tuple(handler_keys)
+        result = handler(character, event_type, key, amount)
+        if result is not None:
+            results.append(result)
+    return results
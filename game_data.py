@@ -31,45 +31,33 @@ from custom_exceptions import (
 def load_items(item_file="data/items.txt"):
     """
     Loads item data from a text file and returns a dictionary of items.
-    Format per line:
-        ITEM_ID: Name | Type | Effect | Cost
+    
+    Expected format in items.txt (blank-line separated blocks):
+        ITEM_ID: health_potion
+        NAME: Health Potion
+        TYPE: consumable
+        EFFECT: health:20
+        COST: 25
+    
+    Returns:
+        dict[str, dict] mapping item IDs to their details (uppercase keys,
+        as used by inventory_system).
     
     Raises: MissingDataFileError, InvalidDataFormatError
     """
-    if not os.path.exists(item_file):
-        # FIX 2: Use MissingDataFileError for file not found
-        raise MissingDataFileError(f"Item file not found: {item_file}")
-
     items = {}
-    try:
-        with open(item_file, "r", encoding="utf-8") as f:
-            for line_number, line in enumerate(f, 1):
-                line = line.strip()
-                if not line:
-                    continue
-                
-                # Manual Parsing Check
-                if ": " not in line or "|" not in line:
-                    # FIX 3: Use InvalidDataFormatError for data corruption
-                    raise InvalidDataFormatError(f"Invalid item line on line {line_number}: {line}")
-
-                item_id, rest = line.split(": ", 1)
-                parts = rest.split("|")
-                if len(parts) != 4:
-                    # FIX 4: Use InvalidDataFormatError for missing fields
-                    raise InvalidDataFormatError(f"Item line missing fields on line {line_number}: {line}")
-
-                items[item_id.strip()] = {
-                    "NAME": parts[0].strip(),
-                    "TYPE": parts[1].strip(),
-                    "EFFECT": parts[2].strip(),
-                    "COST": parts[3].strip() # COST should ideally be converted to int here
-                }
-    except InvalidDataFormatError:
-        raise
-    except Exception as e:
-         # FIX 5: Catch other IO errors as data format errors
-        raise InvalidDataFormatError(f"Error reading item data file: {e}")
+    blocks = read_data_blocks(item_file)
+
+    i = 0
+    while i < len(blocks):
+        block = blocks[i]
+        if "ITEM_ID" not in block:
+            raise InvalidDataFormatError(f"Item #{i + 1} in {item_file} has no ITEM_ID")
+        for field in ("NAME", "TYPE", "EFFECT", "COST"):
+            if field not in block:
+                raise InvalidDataFormatError(f"Item '{block['ITEM_ID']}' is missing {field}")
+        items[block["ITEM_ID"]] = block
+        i += 1
         
     return items
 
@@ -78,56 +66,307 @@ def load_quests(quest_file="data/quests.txt"):
     """
     Loads quest data from a text file and returns a dictionary of quests.
     
-    Expected format in quests.txt:
-        QUEST_ID: Title | Description | Reward
+    Expected format in quests.txt (blank-line separated blocks):
+        QUEST_ID: first_steps
+        TITLE: First Steps
+        DESCRIPTION: ...
+        REWARD_XP: 50
+        REWARD_GOLD: 25
+        REQUIRED_LEVEL: 1
+        PREREQUISITE: NONE
+        OBJECTIVE: enemy_defeated:goblin:1   (optional)
     
     Returns:
-        dict[str, dict] where each quest ID maps to its details.
+        dict[str, dict] where each quest ID maps to its details (lowercase
+        keys, with rewards and required_level as integers).
     
     Raises:
         MissingDataFileError if the file is missing.
         InvalidDataFormatError if the data is improperly formatted.
     """
-    if not os.path.exists(quest_file):
-        # FIX 6: Use MissingDataFileError for file not found
-        raise MissingDataFileError(f"Quest file not found: {quest_file}")
-
     quests = {}
+    blocks = read_data_blocks(quest_file)
+
+    i = 0
+    while i < len(blocks):
+        quest = {}
+        for key in blocks[i]:
+            quest[key.lower()] = blocks[i][key]
+
+        errors = quest_data_errors(quest)
+        if errors:
+            raise InvalidDataFormatError(f"Quest #{i + 1} in {quest_file} is invalid: {'; '.join(errors)}")
+
+        for field in ("reward_xp", "reward_gold", "required_level"):
+            quest[field] = int(quest[field])
+        quest.setdefault("prerequisite", "NONE")
+        quests[quest["quest_id"]] = quest
+        i += 1
+
+    return quests
+
+def read_data_blocks(data_file):
+    """
+    Reads a data file made of blank-line separated "KEY: VALUE" blocks.
+    
+    Returns:
+        list[dict] with one dictionary (uppercase keys) per block.
+    
+    Raises:
+        MissingDataFileError if the file is missing.
+        InvalidDataFormatError if a line is not in "KEY: VALUE" form.
+    """
+    if not os.path.exists(data_file):
+        raise MissingDataFileError(f"Data file not found: {data_file}")
+
+    blocks = []
+    current = {}
     try:
-        with open(quest_file, "r", encoding="utf-8") as f:
+        with open(data_file, "r", encoding="utf-8") as f:
             for line_number, line in enumerate(f, 1):
                 line = line.strip()
                 if not line:
+                    # A blank line ends the current block
+                    if current:
+                        blocks.append(current)
+                        current = {}
                     continue
 
-                # Each line should have QUEST_ID: Title | Description | Reward
-                if ": " not in line or "|" not in line:
-                    # FIX 7: Use InvalidDataFormatError for data corruption
-                    raise InvalidDataFormatError(f"Invalid quest line on line {line_number}: {line}")
-
-                quest_id, rest = line.split(": ", 1)
-                parts = rest.split("|")
-                if len(parts) != 3:
-                    # FIX 8: Use InvalidDataFormatError for missing fields
-                    raise InvalidDataFormatError(f"Quest line missing fields on line {line_number}: {line}")
+                if ": " not in line:
+                    raise InvalidDataFormatError(f"Invalid line {line_number} in {data_file}: {line}")
 
-                title = parts[0].strip()
-                description = parts[1].strip()
-                reward = parts[2].strip()
+                key, value = line.split(": ", 1)
+                current[key.strip().upper()] = value.strip()
 
-                quests[quest_id.strip()] = {
-                    "title": title,
-                    "description": description,
-                    "reward": reward
-                }
+        if current:
+            blocks.append(current)
 
     except InvalidDataFormatError:
         raise
     except Exception as e:
-        # FIX 9: Catch other IO errors as data format errors
-        raise InvalidDataFormatError(f"Error loading quests: {e}")
+        raise InvalidDataFormatError(f"Error reading data file {data_file}: {e}")
+
+    return blocks
+
+
+def load_equipment_slots(slot_file="data/equipment_slots.txt"):
+    """
+    Loads the equipment slot layout.
+    
+    Expected format in equipment_slots.txt (one block per slot):
+        SLOT_ID: ring_1
+        NAME: Ring
+        ITEM_TYPE: ring
+    
+    Returns:
+        dict[str, dict] mapping slot IDs to their details, in file order.
+    
+    Raises:
+        MissingDataFileError if the file is missing.
+        InvalidDataFormatError if a slot is missing SLOT_ID or ITEM_TYPE.
+    """
+    slots = {}
+    blocks = read_data_blocks(slot_file)
+
+    i = 0
+    while i < len(blocks):
+        block = blocks[i]
+        if "SLOT_ID" not in block or "ITEM_TYPE" not in block:
+            raise InvalidDataFormatError(f"Equipment slot #{i + 1} needs SLOT_ID and ITEM_TYPE")
+
+        slot_id = block["SLOT_ID"]
+        slots[slot_id] = {
+            "SLOT_ID": slot_id,
+            "NAME": block.get("NAME", slot_id),
+            "ITEM_TYPE": block["ITEM_TYPE"].lower(),
+        }
+        i += 1
+
+    return slots
+
+# Ability effects and the fields each needs besides ABILITY_ID, CLASS and EFFECT
+ABILITY_EFFECT_FIELDS = {
+    "damage": ["STAT", "MULTIPLIER"],
+    "critical": ["STAT", "MULTIPLIER", "CHANCE"],
+    "heal": ["AMOUNT"],
+}
+
+def load_abilities(ability_file="data/abilities.txt"):
+    """
+    Loads the special ability definitions.
+    
+    Expected format in abilities.txt (one block per ability):
+        ABILITY_ID: critical_strike
+        NAME: Critical Strike
+        CLASS: rogue
+        EFFECT: critical
+        STAT: strength
+        CHANCE: 0.5
+        MULTIPLIER: 3
+        FAIL_MULTIPLIER: 1
+        COOLDOWN: 3
+        MESSAGE: {user} lands a CRITICAL STRIKE for {amount} damage!
+        FAIL_MESSAGE: {user} attempts a Critical Strike, hitting for {amount} damage.
+    
+    EFFECT is one of ABILITY_EFFECT_FIELDS. Numbers are converted;
+    COOLDOWN defaults to 3 and FAIL_MULTIPLIER to 1.
+    
+    Returns:
+        dict[str, dict] mapping ability IDs to their details, in file order.
+    
+    Raises:
+        MissingDataFileError if the file is missing.
+        InvalidDataFormatError if an ability is incomplete or has a bad value.
+    """
+    abilities = {}
+    blocks = read_data_blocks(ability_file)
+
+    i = 0
+    while i < len(blocks):
+        block = blocks[i]
+        for field in ("ABILITY_ID", "CLASS", "EFFECT"):
+            if field not in block:
+                raise InvalidDataFormatError(f"Ability #{i + 1} needs {field}")
+
+        ability_id = block["ABILITY_ID"]
+        effect = block["EFFECT"].lower()
+        if effect not in ABILITY_EFFECT_FIELDS:
+            raise InvalidDataFormatError(f"Ability '{ability_id}' has unknown EFFECT '{effect}'")
+        for field in ABILITY_EFFECT_FIELDS[effect]:
+            if field not in block:
+                raise InvalidDataFormatError(f"Ability '{ability_id}' ({effect}) needs {field}")
+
+        ability = dict(block)
+        ability["CLASS"] = block["CLASS"].lower()
+        ability["EFFECT"] = effect
+        ability.setdefault("NAME", ability_id)
+        ability.setdefault("MESSAGE", "{user} uses " + ability["NAME"] + " for {amount}!")
+        ability.setdefault("FAIL_MESSAGE", ability["MESSAGE"])
+        try:
+            ability["COOLDOWN"] = int(block.get("COOLDOWN", 3))
+            for field in ("MULTIPLIER", "FAIL_MULTIPLIER", "AMOUNT"):
+                ability[field] = int(block.get(field, 1))
+            ability["CHANCE"] = float(block.get("CHANCE", 1.0))
+        except ValueError as e:
+            raise InvalidDataFormatError(f"Ability '{ability_id}' has a bad number: {e}")
+        if ability["COOLDOWN"] < 0 or not 0.0 <= ability["CHANCE"] <= 1.0:
+            raise InvalidDataFormatError(f"Ability '{ability_id}' needs COOLDOWN >= 0 and CHANCE between 0 and 1")
+
+        abilities[ability_id] = ability
+        i += 1
+
+    return abilities
+
+def get_record_field(record, field):
+    """
+    Looks a field up under its lowercase or uppercase key.
+    """
+    value = record.get(field)
+    if value is None:
+        value = record.get(field.upper())
+    return value
+
+def _check_int_field(errors, field, value, minimum):
+    """Append an error unless value is an integer >= minimum"""
+    if value is None or value == "":
+        errors.append(f"missing {field}")
+        return
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        errors.append(f"{field} must be an integer, got {value!r}")
+        return
+    if number < minimum:
+        errors.append(f"{field} must be at least {minimum}, got {number}")
+
+def quest_data_errors(quest):
+    """
+    Lists every problem with a single quest record.
+    
+    Accepts lowercase or uppercase field names.
+    
+    Returns:
+        list[str] of error messages (empty if the quest is valid).
+    """
+    errors = []
+    quest_id = get_record_field(quest, "quest_id")
+    if not quest_id:
+        errors.append("missing quest_id")
+    if not get_record_field(quest, "title"):
+        errors.append("missing title")
+
+    _check_int_field(errors, "reward_xp", get_record_field(quest, "reward_xp"), 0)
+    _check_int_field(errors, "reward_gold", get_record_field(quest, "reward_gold"), 0)
+    _check_int_field(errors, "required_level", get_record_field(quest, "required_level"), 1)
+
+    if quest_id and get_record_field(quest, "prerequisite") == quest_id:
+        errors.append("quest lists itself as its prerequisite")
+
+    return errors
+
+def item_data_errors(item):
+    """
+    Lists every problem with a single item record.
+    
+    Accepts lowercase or uppercase field names. ITEM_ID is optional
+    (the line-based item file keeps it as the dictionary key).
+    
+    Returns:
+        list[str] of error messages (empty if the item is valid).
+    """
+    errors = []
+    if not get_record_field(item, "name"):
+        errors.append("missing name")
+    if not get_record_field(item, "type"):
+        errors.append("missing type")
+
+    _check_int_field(errors, "cost", get_record_field(item, "cost"), 0)
+
+    effect = get_record_field(item, "effect")
+    if not effect:
+        errors.append("missing effect")
+    else:
+        parts = str(effect).split(":", 1)
+        if len(parts) != 2 or not parts[0].strip():
+            errors.append(f"effect must be 'stat:value', got {effect!r}")
+        else:
+            try:
+                int(parts[1])
+            except ValueError:
+                errors.append(f"effect value must be an integer, got {parts[1].strip()!r}")
+
+    return errors
+
+def validate_quest_data(quest):
+    """
+    Validates a single quest record.
+    
+    Returns:
+        True if the quest is valid.
+    
+    Raises:
+        InvalidDataFormatError listing every problem found.
+    """
+    errors = quest_data_errors(quest)
+    if errors:
+        raise InvalidDataFormatError(f"Invalid quest {get_record_field(quest, 'quest_id')!r}: {'; '.join(errors)}")
+    return True
+
+def validate_item_data(item):
+    """
+    Validates a single item record.
+    
+    Returns:
+        True if the item is valid.
+    
+    Raises:
+        InvalidDataFormatError listing every problem found.
+    """
+    errors = item_data_errors(item)
+    if errors:
+        raise InvalidDataFormatError(f"Invalid item {get_record_field(item, 'item_id')!r}: {'; '.join(errors)}")
+    return True
 
-    return quests
 
 # Base stats for the four required classes (Stored as a global constant dictionary)
 BASE_STATS_MAP = {
@@ -0,0 +1,205 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Scripted Game Driver Module
+
+Replays scripted player input through main.main without a console, so
+whole sessions can be timed, checked for regressions, and run in large
+batches. A script is any sequence of input lines: a list, a generator,
+or a command file (one input per line, '#' lines are comments).
+
+Usage: python game_driver.py <script_file> [sessions] [--show-output] [--render=MODE] [--profile=MODES]
+"""
+
+import io
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import main
+import profiling
+import renderer
+
+# ============================================================================
+# SCRIPTS
+# ============================================================================
+
+class ScriptExhausted(BaseException):
+    """
+    Raised when a session asks for more input than its script has
+
+    Derived from BaseException (like KeyboardInterrupt) so the game's own
+    "except Exception" handlers can't swallow it and keep looping.
+    """
+    pass
+
+def load_script(script_file):
+    """
+    Read a command file into a list of input lines
+
+    Blank lines are kept (they are valid input, e.g. "press enter");
+    lines starting with '#' are skipped.
+    """
+    commands = []
+    with open(script_file, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if line.lstrip().startswith("#"):
+                continue
+            commands.append(line)
+    return commands
+
+def make_script_input(commands):
+    """
+    Turn a sequence of commands into a session input function
+
+    Returns: Tuple of (input function, counter dict with 'inputs')
+    """
+    iterator = iter(commands)
+    counter = {'inputs': 0}
+
+    def read_input():
+        try:
+            line = next(iterator)
+        except StopIteration:
+            raise ScriptExhausted(f"Script ran out after {counter['inputs']} inputs")
+        counter['inputs'] += 1
+        return line
+
+    return (read_input, counter)
+
+# ============================================================================
+# SESSIONS
+# ============================================================================
+
+def run_session(commands, output_stream=None, save_directory=None, seed=None, render_mode="text"):
+    """
+    Play one scripted session through main.main
+
+    output_stream receives the game output (discarded if None);
+    save_directory keeps the session's saves away from the real ones;
+    seed makes combat and other random events repeatable; render_mode
+    is one of renderer.MODES.
+
+    Returns: Dictionary with:
+        'inputs': number of script lines consumed
+        'seconds': wall-clock time of the session
+        'actions_per_second': inputs / seconds
+        'finished': True if the player exited normally, False if the
+                    script ran out first
+    """
+    read_input, counter = make_script_input(commands)
+    if output_stream is None:
+        output_stream = io.StringIO()
+    if save_directory is None:
+        save_directory = "data/save_games"
+    if seed is not None:
+        random.seed(seed)
+
+    # Every session starts from a fresh game state
+    session = main.new_session(read_input, output_stream, save_directory)
+    renderer.set_renderer(renderer.new_renderer(render_mode), this_thread=True)
+
+    finished = True
+    start = time.perf_counter()
+    try:
+        main.main(session)
+    except ScriptExhausted:
+        finished = False
+    finally:
+        seconds = time.perf_counter() - start
+        renderer.set_renderer(None, this_thread=True)
+
+    return {
+        'inputs': counter['inputs'],
+        'seconds': seconds,
+        'actions_per_second': counter['inputs'] / seconds if seconds > 0 else 0.0,
+        'finished': finished,
+    }
+
+def run_batch(commands, sessions=100, seed=None, save_directory=None, render_mode="silent"):
+    """
+    Run the same script many times and total the results
+
+    Each session gets its own seed (seed + session number) and, unless
+    save_directory is given, all sessions share a temporary save directory
+    that is removed afterwards. Output is dropped unless render_mode says
+    otherwise.
+
+    Returns: Dictionary with 'sessions', 'finished', 'inputs', 'seconds',
+             'actions_per_second' and 'sessions_per_second'
+    """
+    commands = list(commands)
+    temp_directory = None
+    if save_directory is None:
+        temp_directory = tempfile.mkdtemp(prefix="quest_saves_")
+        save_directory = temp_directory
+
+    totals = {'sessions': sessions, 'finished': 0, 'inputs': 0, 'seconds': 0.0}
+    try:
+        i = 0
+        while i < sessions:
+            session_seed = seed + i if seed is not None else None
+            result = run_session(commands, save_directory=save_directory, seed=session_seed,
+                                 render_mode=render_mode)
+            totals['inputs'] += result['inputs']
+            totals['seconds'] += result['seconds']
+            if result['finished']:
+                totals['finished'] += 1
+            i += 1
+    finally:
+        if temp_directory is not None:
+            shutil.rmtree(temp_directory, ignore_errors=True)
+
+    seconds = totals['seconds']
+    totals['actions_per_second'] = totals['inputs'] / seconds if seconds > 0 else 0.0
+    totals['sessions_per_second'] = sessions / seconds if seconds > 0 else 0.0
+    return totals
+
+# ============================================================================
+# DISPLAY
+# ============================================================================
+
+def display_batch_report(totals):
+    """
+    Display the totals from run_batch
+    """
+    print("\n=== SCRIPTED SESSIONS ===")
+    print(f"Sessions: {totals['sessions']} ({totals['finished']} finished normally)")
+    print(f"Inputs replayed: {totals['inputs']}")
+    print(f"Time: {totals['seconds']:.3f}s")
+    print(f"Actions/second: {totals['actions_per_second']:.1f}")
+    print(f"Sessions/second: {totals['sessions_per_second']:.1f}")
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    import metrics
+    metrics.enable_from_env()
+
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if not args:
+        print("Usage: python game_driver.py <script_file> [sessions] [--show-output] [--render=MODE] [--profile=MODES]")
+        sys.exit(2)
+
+    script = load_script(args[0])
+    sessions = int(args[1]) if len(args) > 1 else 1
+    render_mode = None
+    for arg in sys.argv[1:]:
+        if arg.startswith("--render="):
+            render_mode = arg[len("--render="):]
+
+    if "--show-output" in sys.argv:
+        save_directory = tempfile.mkdtemp(prefix="quest_saves_")
+        try:
+            result = run_session(script, output_stream=sys.stdout, save_directory=save_directory, seed=163,
+                                 render_mode=render_mode or "text")
+        finally:
+            shutil.rmtree(save_directory, ignore_errors=True)
+        print(f"\n[{result['inputs']} inputs in {result['seconds']:.3f}s, finished={result['finished']}]")
+    else:
+        display_batch_report(profiling.run_profiled("game_driver", run_batch, script, sessions, seed=163,
+                                                    render_mode=render_mode or "silent"))
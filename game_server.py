@@ -0,0 +1,258 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Game Server Module
+
+Serves many players at once over local TCP or a Unix socket. Every
+connection gets its own session (see main.new_session); the quest and
+item catalogs are loaded once and shared read-only by all of them.
+
+The asyncio event loop only accepts connections and moves bytes. The
+menus in main.py read input synchronously at any depth, so each
+session's menus run in a worker thread that waits on the loop for its
+next line; game logic and save file I/O never block the loop.
+
+Usage: python game_server.py [--port PORT | --unix PATH] [--max-sessions N]
+"""
+
+import asyncio
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import main
+import renderer
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 16300
+DEFAULT_MAX_SESSIONS = 200
+
+# Output stream of the session running on the current worker thread
+_thread_output = threading.local()
+
+class ConnectionClosed(BaseException):
+    """
+    Raised inside a session when its player disconnects
+
+    Derived from BaseException so the game's own "except Exception"
+    handlers can't swallow it and keep prompting a closed connection.
+    """
+    pass
+
+# ============================================================================
+# SESSION OUTPUT
+# ============================================================================
+
+class SessionStdout:
+    """
+    Stand-in for sys.stdout that sends each worker thread's prints to its
+    own session; other threads still print to the real stdout
+    """
+
+    def __init__(self, fallback):
+        self.fallback = fallback
+
+    def _stream(self):
+        return getattr(_thread_output, 'stream', None) or self.fallback
+
+    def write(self, text):
+        return self._stream().write(text)
+
+    def flush(self):
+        self._stream().flush()
+
+class ConnectionOutput:
+    """
+    File-like object that hands game output from a worker thread to the
+    event loop, which writes it to the player's connection
+    """
+
+    def __init__(self, writer, loop):
+        self.writer = writer
+        self.loop = loop
+
+    def write(self, text):
+        self.loop.call_soon_threadsafe(_send_text, self.writer, text)
+        return len(text)
+
+    def flush(self):
+        pass
+
+def _send_text(writer, text):
+    """Write text to a connection unless it is already closing (runs on the loop)"""
+    if not writer.is_closing():
+        writer.write(text.replace("\n", "\r\n").encode("utf-8"))
+
+def make_connection_input(reader, loop):
+    """
+    Create a session input function that waits, from a worker thread,
+    for the next line from the player's connection
+
+    Raises (from the input function): ConnectionClosed at end of input
+    """
+    def read_input():
+        try:
+            data = asyncio.run_coroutine_threadsafe(reader.readline(), loop).result()
+        except (ConnectionError, RuntimeError):
+            data = b""
+        if not data:
+            raise ConnectionClosed()
+        return data.decode("utf-8", errors="replace").rstrip("\r\n")
+
+    return read_input
+
+# ============================================================================
+# SESSIONS
+# ============================================================================
+
+def run_player_session(session):
+    """
+    Play one connection's game on the current worker thread
+
+    Output is buffered and sent once per prompt. If the player
+    disconnects mid-game, their character is saved first.
+    """
+    _thread_output.stream = session['output']
+    renderer.set_renderer(renderer.new_renderer("buffered"), this_thread=True)
+    try:
+        main.display_welcome()
+        main.run_main_menu(session)
+    except ConnectionClosed:
+        if session['running'] and session['character']:
+            main.save_game(session)
+    finally:
+        renderer.set_renderer(None, this_thread=True)
+        _thread_output.stream = None
+
+async def handle_connection(reader, writer, server_state):
+    """
+    Serve one player from connect to disconnect
+    """
+    loop = asyncio.get_running_loop()
+    if server_state['active'] >= server_state['max_sessions']:
+        _send_text(writer, "Server is full. Please try again later.\n")
+        writer.close()
+        return
+
+    server_state['active'] += 1
+    server_state['served'] += 1
+    server_state['writers'].add(writer)
+
+    session = main.new_session(make_connection_input(reader, loop),
+                               ConnectionOutput(writer, loop),
+                               server_state['save_directory'],
+                               echo=False)
+    try:
+        await loop.run_in_executor(server_state['executor'], run_player_session, session)
+    finally:
+        server_state['active'] -= 1
+        server_state['writers'].discard(writer)
+        writer.close()
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+def load_shared_catalogs():
+    """
+    Load the quest and item catalogs every session will share
+
+    Returns: True if the catalogs loaded and validated
+    """
+    return main.ensure_game_data()
+
+async def start_server(host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None,
+                       save_directory="data/save_games", max_sessions=DEFAULT_MAX_SESSIONS):
+    """
+    Load the catalogs and start accepting players
+
+    Listens on a Unix socket if unix_path is given, otherwise on TCP
+    host:port (port 0 picks a free port).
+
+    Returns: Tuple of (asyncio server, server state dictionary with
+             'active', 'served', 'max_sessions', 'save_directory',
+             'executor', 'writers' and 'stdout')
+    Raises: RuntimeError if the game data can't be loaded
+    """
+    if not load_shared_catalogs():
+        raise RuntimeError("Game data failed to load; server not started.")
+
+    server_state = {
+        'active': 0,
+        'served': 0,
+        'max_sessions': max_sessions,
+        'save_directory': save_directory,
+        'executor': ThreadPoolExecutor(max_workers=max_sessions, thread_name_prefix="session"),
+        'writers': set(),
+        'stdout': sys.stdout,
+    }
+    sys.stdout = SessionStdout(sys.stdout)
+
+    def on_connect(reader, writer):
+        return handle_connection(reader, writer, server_state)
+
+    if unix_path is not None:
+        server = await asyncio.start_unix_server(on_connect, path=unix_path)
+    else:
+        server = await asyncio.start_server(on_connect, host, port)
+    return (server, server_state)
+
+async def stop_server(server, server_state):
+    """
+    Stop accepting players, disconnect everyone (saving their games) and
+    wait for their sessions to finish
+    """
+    server.close()
+    for writer in list(server_state['writers']):
+        writer.close()
+    await server.wait_closed()
+
+    while server_state['active'] > 0:
+        await asyncio.sleep(0.01)
+
+    server_state['executor'].shutdown(wait=True)
+    sys.stdout = server_state['stdout']
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None,
+                save_directory="data/save_games", max_sessions=DEFAULT_MAX_SESSIONS):
+    """
+    Run the server until interrupted
+    """
+    server, server_state = await start_server(host, port, unix_path, save_directory, max_sessions)
+    where = unix_path if unix_path is not None else f"{host}:{server.sockets[0].getsockname()[1]}"
+    print(f"Quest Chronicles server listening on {where} (up to {max_sessions} players)")
+    try:
+        await server.serve_forever()
+    finally:
+        await stop_server(server, server_state)
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    import metrics
+    metrics.enable_from_env()
+
+    args = sys.argv[1:]
+    options = {'port': DEFAULT_PORT, 'unix_path': None, 'max_sessions': DEFAULT_MAX_SESSIONS}
+    i = 0
+    while i < len(args):
+        if args[i] == "--port" and i + 1 < len(args):
+            options['port'] = int(args[i + 1])
+        elif args[i] == "--unix" and i + 1 < len(args):
+            options['unix_path'] = args[i + 1]
+        elif args[i] == "--max-sessions" and i + 1 < len(args):
+            options['max_sessions'] = int(args[i + 1])
+        else:
+            print("Usage: python game_server.py [--port PORT | --unix PATH] [--max-sessions N]")
+            sys.exit(2)
+        i += 2
+
+    try:
+        asyncio.run(serve(port=options['port'], unix_path=options['unix_path'],
+                          max_sessions=options['max_sessions']))
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+    except RuntimeError as e:
+        print(e)
+        sys.exit(1)
@@ -12,6 +12,8 @@ AI Usage: I defined the module structure, all required function signatures,
           while adhering to all constraints and exception requirements.
 """
 
+import event_bus
+
 from custom_exceptions import (
     InventoryFullError,
     ItemNotFoundError,
@@ -73,6 +75,35 @@ def remove_item_from_inventory(character, item_id):
     character['inventory'] = new_inventory
     return True
 
+def remove_items_from_inventory(character, item_id, quantity):
+    """
+    Remove several copies of an item in a single pass over the inventory
+    
+    Raises: InsufficientResourcesError if fewer than quantity copies are held
+    """
+    inventory_list = character.get('inventory', [])
+    
+    if quantity <= 0:
+        return True
+    
+    # Keep everything except the first `quantity` matches
+    new_inventory = []
+    removed = 0
+    i = 0
+    while i < len(inventory_list):
+        current_item = inventory_list[i]
+        if current_item == item_id and removed < quantity:
+            removed += 1
+        else:
+            new_inventory.append(current_item)
+        i += 1
+
+    if removed < quantity:
+        raise InsufficientResourcesError(f"Need {quantity} of '{item_id}', but only have {removed}.")
+
+    character['inventory'] = new_inventory
+    return True
+
 def has_item(character, item_id):
     """
     Check if character has a specific item
@@ -140,11 +171,11 @@ def parse_item_effect(effect_string):
     
     Returns: Tuple of (stat_name, value)
     """
-    if ': ' not in effect_string:
+    if ':' not in effect_string:
         raise InvalidItemTypeError(f"Effect string format is invalid: {effect_string}")
         
-    # Split on ":"
-    parts = effect_string.split(': ', 1)
+    # Split on ":" (data files use "stat:value", older items "stat: value")
+    parts = effect_string.split(':', 1)
     stat_name = parts[0].strip().lower()
     value_str = parts[1].strip()
     
@@ -179,7 +210,96 @@ def apply_stat_effect(character, stat_name, value):
         # Ensure max_health doesn't go below 1
         if stat_name == 'max_health' and character['max_health'] < 1:
             character['max_health'] = 1
-            
+
+        # Permanent stat changes make cached derived stats stale
+        if stat_name in EQUIPMENT_STATS:
+            character['derived_stats'] = None
+
+# ============================================================================
+# EQUIPMENT MODIFIERS
+# ============================================================================
+
+# Stats that equipped gear is allowed to modify
+EQUIPMENT_STATS = ['max_health', 'strength', 'magic', 'defense', 'attack']
+
+# Parsed equipment effects, keyed by the raw EFFECT string
+_effect_modifier_cache = {}
+
+def get_item_modifiers(item_data):
+    """
+    Get the stat bonuses an item grants while equipped
+
+    The EFFECT string is parsed once and cached, so equipping the same
+    item again does not re-parse it.
+
+    Returns: Dictionary of {stat_name: value} (do not modify it)
+    """
+    effect_string = item_data.get('EFFECT', '')
+
+    if effect_string in _effect_modifier_cache:
+        return _effect_modifier_cache[effect_string]
+
+    modifiers = {}
+    if effect_string:
+        try:
+            stat_name, value = parse_item_effect(effect_string)
+            if stat_name in EQUIPMENT_STATS:
+                modifiers[stat_name] = value
+        except InvalidItemTypeError:
+            # Malformed effects grant no bonus
+            pass
+
+    _effect_modifier_cache[effect_string] = modifiers
+    return modifiers
+
+def _shift_equipment_modifiers(character, modifiers, sign):
+    """Add (sign=1) or retract (sign=-1) modifiers from stats and the running totals"""
+    bonuses = character.setdefault('equipment_bonuses', {})
+
+    for stat_name in modifiers:
+        delta = modifiers[stat_name] * sign
+        character[stat_name] = character.get(stat_name, 0) + delta
+        bonuses[stat_name] = bonuses.get(stat_name, 0) + delta
+
+def set_slot_modifiers(character, slot, modifiers):
+    """
+    Replace the bonuses granted by one equipment slot
+
+    Retracts whatever the slot granted before and applies the new
+    modifiers, touching only the stats involved. Health keeps the same
+    percentage of max_health, matching a full stat recalculation.
+
+    Args:
+        slot: Slot name (e.g. 'weapon', 'armor')
+        modifiers: Dictionary of {stat_name: value}, or None to clear the slot
+    """
+    slot_modifiers = character.setdefault('slot_modifiers', {})
+
+    # Store current health percentage before changing max_health
+    old_max_h = character.get('max_health', 1)
+    current_health_ratio = character.get('health', 0) / old_max_h if old_max_h > 0 else 1.0
+
+    old_modifiers = slot_modifiers.pop(slot, None)
+    if old_modifiers:
+        _shift_equipment_modifiers(character, old_modifiers, -1)
+
+    if modifiers:
+        slot_modifiers[slot] = dict(modifiers)
+        _shift_equipment_modifiers(character, modifiers, 1)
+
+    # Cached derived stats (attack power, mitigation...) are now stale
+    character['derived_stats'] = None
+
+    # Only a max_health change can move health
+    new_max_h = character.get('max_health', 1)
+    if new_max_h != old_max_h:
+        restored_health = int(new_max_h * current_health_ratio)
+        if restored_health > new_max_h:
+            restored_health = new_max_h
+        if restored_health < 0:
+            restored_health = 0
+        character['health'] = restored_health
+
 # ============================================================================
 # ITEM USAGE
 # ============================================================================
@@ -215,6 +335,7 @@ def use_item(character, item_id, item_data):
         
         # 5. Remove item from inventory
         remove_item_from_inventory(character, item_id)
+        event_bus.emit_item_event(event_bus.ITEM_USED, character, item_id, item_data)
         
         item_name = item_data.get('NAME', item_id)
         return f"Used {item_name}. {stat_name.capitalize()} modified by {value}."
@@ -227,141 +348,299 @@ def use_item(character, item_id, item_data):
         raise Exception(f"Failed to apply effect of item '{item_id}': {e}")
 
 
-def equip_weapon(character, item_id, item_data, recalculate_stats_func):
+def use_items(character, item_id, qty, item_data):
     """
-    Equip a weapon
+    Use up to qty copies of a consumable in one call
     
-    Note: Requires the recalculate_stats function (from character_manager) 
-    to be passed in to update stats.
+    The effect is parsed once and applied as one cumulative change. For
+    health items only as many copies as are needed to reach max_health
+    are consumed; the rest stay in the inventory.
     
-    Raises:
+    Returns: Result message (includes how many were used)
+    
+    Raises: 
         ItemNotFoundError if item not in inventory
-        InvalidItemTypeError if item type is not 'weapon'
+        InvalidItemTypeError if item type is not 'consumable'
+        InsufficientResourcesError if fewer than qty copies are held
+        ValueError if qty is less than 1
     """
+    qty = int(qty)
+    if qty < 1:
+        raise ValueError(f"Quantity must be at least 1, got {qty}.")
     
-    # 1. Check item exists and is type 'weapon'
     if item_id not in character.get('inventory', []):
-        raise ItemNotFoundError(f"Cannot equip item '{item_id}': not found in inventory.")
+        raise ItemNotFoundError(f"Cannot use item '{item_id}': not found in inventory.")
         
     item_type = item_data.get('TYPE', '').lower()
     
-    if item_type != 'weapon':
-        raise InvalidItemTypeError(f"Cannot equip item '{item_id}': type is '{item_type}', must be 'weapon'.")
-        
-    old_weapon_id = character.get('equipped_weapon')
+    if item_type != 'consumable':
+        raise InvalidItemTypeError(f"Cannot use item '{item_id}': type is '{item_type}', must be 'consumable'.")
+
+    owned = count_item(character, item_id)
+    if owned < qty:
+        raise InsufficientResourcesError(f"Need {qty} of '{item_id}', but only have {owned}.")
+
+    stat_name, value = parse_item_effect(item_data.get('EFFECT', ''))
+    item_name = item_data.get('NAME', item_id)
+    
+    used = qty
+    total = value * qty
+    
+    # Healing stops being useful once health reaches max_health
+    if stat_name == 'health' and value > 0:
+        missing = character.get('max_health', 1) - character.get('health', 0)
+        if missing <= 0:
+            return f"{item_name} would have no effect. Health is already full."
+        needed = (missing + value - 1) // value  # Round up
+        if needed < used:
+            used = needed
+        total = value * used
+        if total > missing:
+            total = missing
+
+    apply_stat_effect(character, stat_name, total)
+    remove_items_from_inventory(character, item_id, used)
+    event_bus.emit_item_event(event_bus.ITEM_USED, character, item_id, item_data, used)
     
-    # 2. Handle unequipping current weapon if exists
-    if old_weapon_id and old_weapon_id != "NONE":
-        # Add old weapon back to inventory
-        add_item_to_inventory(character, old_weapon_id)
+    return f"Used {used}x {item_name}. {stat_name.capitalize()} modified by {total}."
+
+
+# ============================================================================
+# EQUIPMENT SLOTS
+# ============================================================================
+
+# Slot layout used until data/equipment_slots.txt is loaded
+DEFAULT_EQUIPMENT_SLOTS = {
+    'weapon': {'SLOT_ID': 'weapon', 'NAME': 'Weapon', 'ITEM_TYPE': 'weapon'},
+    'armor': {'SLOT_ID': 'armor', 'NAME': 'Chest', 'ITEM_TYPE': 'armor'},
+}
+
+# Slots stored under their original character keys (older saves and callers use these)
+LEGACY_SLOT_KEYS = {
+    'weapon': 'equipped_weapon',
+    'armor': 'equipped_armor',
+}
+
+# Active slot layout and an item type -> slot IDs lookup built from it
+equipment_slots = dict(DEFAULT_EQUIPMENT_SLOTS)
+slots_by_item_type = {'weapon': ['weapon'], 'armor': ['armor']}
+
+def set_equipment_slots(slot_data_dict):
+    """
+    Replace the active slot layout (e.g. with game_data.load_equipment_slots())
+
+    The weapon and armor slots are always kept so existing characters
+    and callers keep working.
+    """
+    global equipment_slots, slots_by_item_type
+
+    new_slots = dict(DEFAULT_EQUIPMENT_SLOTS)
+    new_slots.update(slot_data_dict)
+
+    by_type = {}
+    for slot_id in new_slots:
+        item_type = new_slots[slot_id].get('ITEM_TYPE', '').lower()
+        by_type.setdefault(item_type, []).append(slot_id)
+
+    equipment_slots = new_slots
+    slots_by_item_type = by_type
+
+def is_equippable(item_data):
+    """
+    Check if an item's type fits any equipment slot
+    """
+    return item_data.get('TYPE', '').lower() in slots_by_item_type
+
+def get_equipped_item(character, slot):
+    """
+    Get the item ID equipped in a slot
+
+    Returns: Item ID string, or None if the slot is empty
+    """
+    if slot in LEGACY_SLOT_KEYS:
+        item_id = character.get(LEGACY_SLOT_KEYS[slot])
+    else:
+        item_id = character.get('equipment', {}).get(slot)
+
+    if not item_id or item_id == "NONE":
+        return None
+    return item_id
+
+def _set_equipped_item(character, slot, item_id):
+    """Store (or clear, with None) the item ID held by a slot"""
+    if slot in LEGACY_SLOT_KEYS:
+        character[LEGACY_SLOT_KEYS[slot]] = item_id or "NONE"
+        return
+
+    equipment = character.setdefault('equipment', {})
+    if item_id:
+        equipment[slot] = item_id
+    else:
+        equipment.pop(slot, None)
+
+def get_equipment(character):
+    """
+    Get every occupied slot
+
+    Returns: Dictionary of {slot_id: item_id}
+    """
+    equipment = {}
+    for slot in LEGACY_SLOT_KEYS:
+        item_id = get_equipped_item(character, slot)
+        if item_id:
+            equipment[slot] = item_id
+
+    extra = character.get('equipment', {})
+    for slot in extra:
+        if extra[slot]:
+            equipment[slot] = extra[slot]
+    return equipment
+
+def _equip_into_slot(character, item_id, item_data, slot):
+    """Move an item from inventory into a slot, swapping out the old item"""
+    old_item_id = get_equipped_item(character, slot)
+    
+    # Handle unequipping current item if exists
+    if old_item_id:
+        # Add old item back to inventory
+        add_item_to_inventory(character, old_item_id)
         
-    # 3. Store equipped_weapon and remove item from inventory
-    character['equipped_weapon'] = item_id
+    # Store the slot's item and remove it from inventory
+    _set_equipped_item(character, slot, item_id)
     remove_item_from_inventory(character, item_id)
     
-    # 4. Recalculate stats to apply new bonus and remove old bonus
-    recalculate_stats_func(character, item_data) 
+    # Swap the old bonus for the new one
+    set_slot_modifiers(character, slot, get_item_modifiers(item_data))
+    event_bus.emit_item_event(event_bus.ITEM_EQUIPPED, character, item_id, item_data)
     
     item_name = item_data.get('NAME', item_id)
     result = f"Equipped {item_name}."
-    if old_weapon_id and old_weapon_id != "NONE":
-        result += f" Unequipped {old_weapon_id} and placed in inventory."
+    if old_item_id:
+        result += f" Unequipped {old_item_id} and placed in inventory."
         
     return result
 
+def equip_item(character, item_id, item_data, slot=None):
+    """
+    Equip any equippable item into a matching slot
+
+    If slot is not given, the first empty slot accepting the item's type
+    is used (or the first matching slot, swapping out its item).
 
-def equip_armor(character, item_id, item_data, recalculate_stats_func):
+    Raises:
+        ItemNotFoundError if item not in inventory
+        InvalidItemTypeError if no slot accepts the item's type
     """
-    Equip armor
+    if item_id not in character.get('inventory', []):
+        raise ItemNotFoundError(f"Cannot equip item '{item_id}': not found in inventory.")
+
+    item_type = item_data.get('TYPE', '').lower()
+    matching_slots = slots_by_item_type.get(item_type, [])
+
+    if slot is None:
+        if not matching_slots:
+            raise InvalidItemTypeError(f"Cannot equip item '{item_id}': no slot accepts type '{item_type}'.")
+        slot = matching_slots[0]
+        i = 0
+        while i < len(matching_slots):
+            if not get_equipped_item(character, matching_slots[i]):
+                slot = matching_slots[i]
+                break
+            i += 1
+    elif slot not in matching_slots:
+        raise InvalidItemTypeError(f"Cannot equip item '{item_id}' in slot '{slot}'.")
+
+    return _equip_into_slot(character, item_id, item_data, slot)
+
+def unequip_item(character, slot):
+    """
+    Remove the item in a slot and return it to inventory
+
+    Returns: The unequipped item ID, or None if the slot was empty
+    Raises: InventoryFullError if inventory is full
+    """
+    old_item_id = get_equipped_item(character, slot)
+
+    if not old_item_id:
+        return None
+
+    # Check for space before unequip
+    if get_inventory_space_remaining(character) <= 0:
+        raise InventoryFullError(f"Inventory is full. Cannot unequip {slot}.")
+
+    add_item_to_inventory(character, old_item_id)
+    _set_equipped_item(character, slot, None)
+
+    # Remove stat bonuses granted by the item
+    set_slot_modifiers(character, slot, None)
+
+    return old_item_id
+
+
+def equip_weapon(character, item_id, item_data, recalculate_stats_func=None):
+    """
+    Equip a weapon
     
-    Note: Requires the recalculate_stats function (from character_manager) 
-    to be passed in to update stats.
+    Note: Stats are updated incrementally from the item's modifiers, so
+    recalculate_stats_func is no longer needed (kept for old callers).
     
     Raises:
         ItemNotFoundError if item not in inventory
-        InvalidItemTypeError if item type is not 'armor'
+        InvalidItemTypeError if item type is not 'weapon'
     """
     
-    # 1. Check item exists and is type 'armor'
+    # Check item exists and is type 'weapon'
     if item_id not in character.get('inventory', []):
         raise ItemNotFoundError(f"Cannot equip item '{item_id}': not found in inventory.")
         
     item_type = item_data.get('TYPE', '').lower()
     
-    if item_type != 'armor':
-        raise InvalidItemTypeError(f"Cannot equip item '{item_id}': type is '{item_type}', must be 'armor'.")
+    if item_type != 'weapon':
+        raise InvalidItemTypeError(f"Cannot equip item '{item_id}': type is '{item_type}', must be 'weapon'.")
         
-    old_armor_id = character.get('equipped_armor')
+    return _equip_into_slot(character, item_id, item_data, 'weapon')
+
+
+def equip_armor(character, item_id, item_data, recalculate_stats_func=None):
+    """
+    Equip armor
     
-    # 2. Handle unequipping current armor if exists
-    if old_armor_id and old_armor_id != "NONE":
-        # Add old armor back to inventory
-        add_item_to_inventory(character, old_armor_id)
-        
-    # 3. Store equipped_armor and remove item from inventory
-    character['equipped_armor'] = item_id
-    remove_item_from_inventory(character, item_id)
+    Note: Stats are updated incrementally from the item's modifiers, so
+    recalculate_stats_func is no longer needed (kept for old callers).
     
-    # 4. Recalculate stats to apply new bonus and remove old bonus
-    recalculate_stats_func(character, item_data) 
+    Raises:
+        ItemNotFoundError if item not in inventory
+        InvalidItemTypeError if item type is not 'armor'
+    """
     
-    item_name = item_data.get('NAME', item_id)
-    result = f"Equipped {item_name}."
-    if old_armor_id and old_armor_id != "NONE":
-        result += f" Unequipped {old_armor_id} and placed in inventory."
+    # Check item exists and is type 'armor'
+    if item_id not in character.get('inventory', []):
+        raise ItemNotFoundError(f"Cannot equip item '{item_id}': not found in inventory.")
         
-    return result
+    item_type = item_data.get('TYPE', '').lower()
+    
+    if item_type != 'armor':
+        raise InvalidItemTypeError(f"Cannot equip item '{item_id}': type is '{item_type}', must be 'armor'.")
+        
+    return _equip_into_slot(character, item_id, item_data, 'armor')
 
 
-def unequip_weapon(character, recalculate_stats_func):
+def unequip_weapon(character, recalculate_stats_func=None):
     """
     Remove equipped weapon and return it to inventory
     
     Raises: InventoryFullError if inventory is full
     """
-    old_weapon_id = character.get('equipped_weapon')
-
-    # Check if weapon is equipped
-    if not old_weapon_id or old_weapon_id == "NONE":
-        return None
-
-    # Check for space before unequip
-    if get_inventory_space_remaining(character) <= 0:
-        raise InventoryFullError("Inventory is full. Cannot unequip weapon.")
-
-    # Add weapon back to inventory
-    add_item_to_inventory(character, old_weapon_id)
-    
-    # Clear equipped_weapon from character
-    character['equipped_weapon'] = "NONE"
-
-    # Remove stat bonuses (by calling recalculate_stats)
-    recalculate_stats_func(character, {}) 
-    
-    return old_weapon_id
+    return unequip_item(character, 'weapon')
 
 
-def unequip_armor(character, recalculate_stats_func):
+def unequip_armor(character, recalculate_stats_func=None):
     """
     Remove equipped armor and return it to inventory
     
     Raises: InventoryFullError if inventory is full
     """
-    old_armor_id = character.get('equipped_armor')
-
-    if not old_armor_id or old_armor_id == "NONE":
-        return None
-
-    if get_inventory_space_remaining(character) <= 0:
-        raise InventoryFullError("Inventory is full. Cannot unequip armor.")
-
-    add_item_to_inventory(character, old_armor_id)
-    
-    character['equipped_armor'] = "NONE"
-
-    recalculate_stats_func(character, {}) 
-    
-    return old_armor_id
+    return unequip_item(character, 'armor')
 
 # ============================================================================
 # SHOP SYSTEM
@@ -397,6 +676,7 @@ def purchase_item(character, item_id, item_data, add_gold_func):
     
     # 4. Add item to inventory
     add_item_to_inventory(character, item_id)
+    event_bus.emit_item_event(event_bus.ITEM_PURCHASED, character, item_id, item_data)
     
     return True
 
@@ -428,6 +708,7 @@ def sell_item(character, item_id, item_data, add_gold_func):
     
     # 4. Add gold to character
     add_gold_func(character, sell_price)
+    event_bus.emit_item_event(event_bus.ITEM_SOLD, character, item_id, item_data)
     
     return sell_price
 
@@ -510,8 +791,4 @@ if __name__ == "__main__":
     #     result = use_item(test_char, "health_potion", test_item)
     #     print(result)
     # except ItemNotFoundError:
-<<<<<<< HEAD
-    #     print("Item not found")
-=======
     #     print("Item not found")
->>>>>>> effbbc7ea9df0b4db805e3ed41175a57fcc9c474
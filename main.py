@@ -12,123 +12,247 @@ AI Usage: I defined the module structure and integration points. The AI
           handling for file operations and game mechanics exceptions.
 """
 
-# Import all our custom modules
-import character_manager
-import inventory_system
-import quest_handler
-import combat_system
-import game_data
-from custom_exceptions import *
+# Only what the first menu needs is imported up front; the game
+# subsystems are imported on first use (see LazyModule)
+import time
+
+# Seconds since main.py started loading, for the startup report
+_started_at = time.perf_counter()
+
 import os # For file operations in game loading
 import sys # For graceful exit
 
+import profiling
+import renderer
+from custom_exceptions import (
+    CharacterDeadError, CharacterNotFoundError, InsufficientLevelError,
+    InsufficientResourcesError, InvalidCharacterClassError, InvalidDataFormatError,
+    InvalidItemTypeError, InvalidTargetError, InventoryFullError, ItemNotFoundError,
+    MissingDataFileError, QuestAlreadyCompletedError, QuestNotActiveError,
+    QuestNotFoundError, QuestRequirementsNotMetError, SaveFileCorruptedError
+)
+
+# ============================================================================
+# LAZY SUBSYSTEMS
+# ============================================================================
+
+# One entry per subsystem import or catalog load, in the order they
+# happened: {'name', 'seconds', 'also_loaded'}
+startup_times = []
+
+class LazyModule:
+    """
+    Stand-in for a game module that is imported the first time one of
+    its attributes is used
+
+    Loading replaces the stand-in in this module's globals with the real
+    module, so later uses cost nothing extra.
+    """
+
+    def __init__(self, module_name):
+        self._module_name = module_name
+
+    def __getattr__(self, attr):
+        return getattr(load_module(self._module_name), attr)
+
+def load_module(module_name):
+    """
+    Import a game module now and record how long it took
+
+    Returns: The module
+    """
+    before = set(sys.modules)
+    start = time.perf_counter()
+    __import__(module_name)
+    module = sys.modules[module_name]
+    seconds = time.perf_counter() - start
+
+    if module_name not in before:
+        also_loaded = sorted(name for name in sys.modules if name not in before and name != module_name)
+        startup_times.append({'name': f"import {module_name}", 'seconds': seconds, 'also_loaded': also_loaded})
+    globals()[module_name] = module
+    return module
+
+def record_startup_step(name, start):
+    """
+    Record a catalog load step that began at time.perf_counter() == start
+    """
+    startup_times.append({'name': name, 'seconds': time.perf_counter() - start, 'also_loaded': []})
+
+character_manager = LazyModule("character_manager")
+inventory_system = LazyModule("inventory_system")
+quest_handler = LazyModule("quest_handler")
+catalog_validator = LazyModule("catalog_validator")
+quest_planner = LazyModule("quest_planner")
+combat_system = LazyModule("combat_system")
+battle_log = LazyModule("battle_log")
+game_data = LazyModule("game_data")
+
+# Loaded in the order a player typically reaches them
+SUBSYSTEMS = ["character_manager", "inventory_system", "quest_handler", "game_data",
+              "catalog_validator", "combat_system", "battle_log", "quest_planner"]
+
 # ============================================================================
 # GAME STATE
 # ============================================================================
 
-# Global variables for game data
-current_character = None
+# Quest and item catalogs, loaded when the first game starts (see
+# ensure_game_data) and shared read-only by every session
 all_quests = {}
 all_items = {}
-game_running = False
+game_data_state = {'loaded': False}
+
+def new_session(input_func=None, output_stream=None, save_directory="data/save_games", echo=True):
+    """
+    Create the state for one player's game
+    
+    input_func() returns the player's next line of input and
+    output_stream is any file-like object game output is written to;
+    None means the console. echo repeats injected input after its prompt
+    so transcripts read like a console session.
+    
+    Returns: Dictionary with 'character', 'running', 'input', 'output',
+             'save_directory' and 'echo'
+    """
+    return {
+        'character': None,
+        'running': False,
+        'input': input_func,
+        'output': output_stream,
+        'save_directory': save_directory,
+        'echo': echo,
+    }
+
+# The console player's session (used by main() when none is given)
+console_session = new_session()
+
+# ============================================================================
+# INPUT / OUTPUT
+# ============================================================================
+
+def set_io(input_func=None, output_stream=None):
+    """
+    Route the console session's input and output away from the console
+    
+    Passing None restores the console for that side.
+    """
+    console_session['input'] = input_func
+    console_session['output'] = output_stream
+
+def prompt(session, message=""):
+    """
+    Show a prompt and read one line of the session's player input
+    """
+    read_input = session['input']
+    if read_input is None:
+        renderer.flush()
+        return input(message)
+
+    if not session['echo']:
+        renderer.line(message, end="")
+        renderer.flush()
+        return read_input()
+
+    line = read_input()
+    renderer.line(f"{message}{line}")
+    return line
 
 # ============================================================================
 # MAIN MENU
 # ============================================================================
 
-def main_menu():
+def main_menu(session):
     """
     Display main menu and get player choice
     
     Returns: Integer choice (1-3)
     """
     while True:
-        print("\n--- Main Menu ---")
-        print("1. New Game")
-        print("2. Load Game")
-        print("3. Exit")
+        profiling.checkpoint("main_menu")
+        renderer.line("\n--- Main Menu ---")
+        renderer.line("1. New Game")
+        renderer.line("2. Load Game")
+        renderer.line("3. Exit")
         
         try:
-            choice = input("Enter your choice (1-3): ").strip()
+            choice = prompt(session, "Enter your choice (1-3): ").strip()
             choice_int = int(choice)
             if 1 <= choice_int <= 3:
                 return choice_int
             else:
-                print("Invalid choice. Please enter 1, 2, or 3.")
+                renderer.line("Invalid choice. Please enter 1, 2, or 3.")
         except ValueError:
-            print("Invalid input. Please enter a number.")
+            renderer.line("Invalid input. Please enter a number.")
 
-def new_game():
+def new_game(session):
     """
     Start a new game
     """
-    global current_character
     
-    print("\n--- New Game ---")
+    renderer.line("\n--- New Game ---")
     
     # Get character name from user
-    name = input("Enter your character's name: ").strip()
+    name = prompt(session, "Enter your character's name: ").strip()
     if not name:
-        print("Character creation cancelled.")
+        renderer.line("Character creation cancelled.")
         return
         
     # Get character class from user
-    print("\nAvailable Classes:")
-    print("1. Warrior (Strength focus)")
-    print("2. Mage (Magic focus)")
-    print("3. Rogue (High damage chance)")
-    print("4. Cleric (Healing focus)")
+    renderer.line("\nAvailable Classes:")
+    renderer.line("1. Warrior (Strength focus)")
+    renderer.line("2. Mage (Magic focus)")
+    renderer.line("3. Rogue (High damage chance)")
+    renderer.line("4. Cleric (Healing focus)")
     
     class_map = {'1': 'Warrior', '2': 'Mage', '3': 'Rogue', '4': 'Cleric'}
     
     while True:
-        class_choice = input("Select your class (1-4): ").strip()
+        class_choice = prompt(session, "Select your class (1-4): ").strip()
         selected_class = class_map.get(class_choice)
         
         if selected_class:
             break
         else:
-            print("Invalid class choice. Please select 1, 2, 3, or 4.")
+            renderer.line("Invalid class choice. Please select 1, 2, 3, or 4.")
             
     try:
         # Create character
-        current_character = character_manager.create_character(name, selected_class)
-        print(f"\nWelcome, {current_character['name']} the {current_character['class']}!")
+        session['character'] = character_manager.create_character(name, selected_class)
+        renderer.line(f"\nWelcome, {session['character']['name']} the {session['character']['class']}!")
         
         # Start game loop
-        game_loop()
+        game_loop(session)
         
     except InvalidCharacterClassError as e:
-        print(f"Error creating character: {e}")
+        renderer.line(f"Error creating character: {e}")
     except Exception as e:
-        print(f"An unexpected error occurred during character creation: {e}")
+        renderer.line(f"An unexpected error occurred during character creation: {e}")
 
-def load_game():
+def load_game(session):
     """
     Load an existing saved game
     """
-    global current_character
     
-    print("\n--- Load Game ---")
+    renderer.line("\n--- Load Game ---")
     
     # Get list of saved characters
     try:
-        saved_chars = character_manager.get_saved_characters()
+        saved_chars = character_manager.list_saved_characters(session['save_directory'])
     except Exception:
-        print("Error accessing save directory.")
+        renderer.line("Error accessing save directory.")
         saved_chars = []
 
     if not saved_chars:
-        print("No saved characters found.")
+        renderer.line("No saved characters found.")
         return
 
-    print("Saved Characters:")
+    renderer.line("Saved Characters:")
     for i, name in enumerate(saved_chars):
-        print(f"{i + 1}. {name}")
+        renderer.line(f"{i + 1}. {name}")
     
     while True:
         try:
-            choice = input("Select character number to load, or 'c' to cancel: ").strip().lower()
+            choice = prompt(session, "Select character number to load, or 'c' to cancel: ").strip().lower()
             if choice == 'c':
                 return
             
@@ -137,321 +261,345 @@ def load_game():
                 selected_name = saved_chars[choice_index]
                 break
             else:
-                print("Invalid selection.")
+                renderer.line("Invalid selection.")
         except ValueError:
-            print("Invalid input. Please enter a number or 'c'.")
+            renderer.line("Invalid input. Please enter a number or 'c'.")
             
     try:
         # Try to load character
-        current_character = character_manager.load_character(selected_name)
-        print(f"\nSuccessfully loaded {current_character['name']}.")
+        session['character'] = character_manager.load_character(selected_name, session['save_directory'], quest_data_dict=all_quests)
+        
+        # Rebuild equipment bonuses against the current item catalog
+        character_manager.recalculate_stats(session['character'], all_items)
+        renderer.line(f"\nSuccessfully loaded {session['character']['name']}.")
         
         # Start game loop
-        game_loop()
+        game_loop(session)
         
     except CharacterNotFoundError:
-        print(f"Error: Save file for '{selected_name}' not found.")
+        renderer.line(f"Error: Save file for '{selected_name}' not found.")
     except SaveFileCorruptedError as e:
-        print(f"Error: Save file for '{selected_name}' is corrupted: {e}")
+        renderer.line(f"Error: Save file for '{selected_name}' is corrupted: {e}")
     except Exception as e:
-        print(f"An unexpected error occurred during loading: {e}")
+        renderer.line(f"An unexpected error occurred during loading: {e}")
 
 # ============================================================================
 # GAME LOOP
 # ============================================================================
 
-def game_loop():
+def game_loop(session):
     """
     Main game loop - shows game menu and processes actions
     """
-    global game_running, current_character
     
-    game_running = True
+    session['running'] = True
     
-    while game_running:
+    while session['running']:
         try:
             # Check for death after any action
-            if current_character['health'] <= 0:
-                handle_character_death()
-                if not game_running:
+            if session['character']['health'] <= 0:
+                handle_character_death(session)
+                if not session['running']:
                     break
             
             # Display game menu
-            choice = game_menu()
+            choice = game_menu(session)
             
             # Execute chosen action
             if choice == 1:
-                view_character_stats()
+                view_character_stats(session)
             elif choice == 2:
-                view_inventory()
+                view_inventory(session)
             elif choice == 3:
-                quest_menu()
+                quest_menu(session)
             elif choice == 4:
-                explore()
+                explore(session)
             elif choice == 5:
-                shop()
+                shop(session)
             elif choice == 6:
-                save_game()
-                game_running = False
+                save_game(session)
+                session['running'] = False
             else:
-                print("Invalid choice. Please select 1-6.")
+                renderer.line("Invalid choice. Please select 1-6.")
             
             # Save game after each action (except for Save and Quit, which handles it)
-            if game_running and choice != 6:
-                save_game()
+            if session['running'] and choice != 6:
+                save_game(session)
                 
         except Exception as e:
             # Catch general unhandled exceptions during gameplay
-            print(f"\n[SYSTEM ERROR] An unexpected error occurred: {e}")
-            print("Saving game state before returning to main menu.")
-            save_game()
-            game_running = False
+            renderer.line(f"\n[SYSTEM ERROR] An unexpected error occurred: {e}")
+            renderer.line("Saving game state before returning to main menu.")
+            save_game(session)
+            session['running'] = False
 
 
-def game_menu():
+def game_menu(session):
     """
     Display game menu and get player choice
     
     Returns: Integer choice (1-6)
     """
     while True:
-        print("\n--- Game Menu ---")
-        print("1. View Character Stats")
-        print("2. View Inventory")
-        print("3. Quest Menu")
-        print("4. Explore (Find Battles)")
-        print("5. Shop")
-        print("6. Save and Quit")
+        profiling.checkpoint("game_menu")
+        renderer.line("\n--- Game Menu ---")
+        renderer.line("1. View Character Stats")
+        renderer.line("2. View Inventory")
+        renderer.line("3. Quest Menu")
+        renderer.line("4. Explore (Find Battles)")
+        renderer.line("5. Shop")
+        renderer.line("6. Save and Quit")
         
         try:
-            choice = input("Enter your choice (1-6): ").strip()
+            choice = prompt(session, "Enter your choice (1-6): ").strip()
             choice_int = int(choice)
             if 1 <= choice_int <= 6:
                 return choice_int
             else:
-                print("Invalid choice. Please select 1-6.")
+                renderer.line("Invalid choice. Please select 1-6.")
         except ValueError:
-            print("Invalid input. Please enter a number.")
+            renderer.line("Invalid input. Please enter a number.")
 
 # ============================================================================
 # GAME ACTIONS
 # ============================================================================
 
-def view_character_stats():
+def view_character_stats(session):
     """Display character information"""
-    global current_character
     
-    character_manager.display_character_stats(current_character)
-    quest_handler.display_character_quest_progress(current_character, all_quests)
+    character_manager.display_character_stats(session['character'])
+    quest_handler.display_character_quest_progress(session['character'], all_quests)
 
 
-def view_inventory():
+def view_inventory(session):
     """Display and manage inventory"""
-    global current_character, all_items
     
     while True:
-        print(inventory_system.display_inventory(current_character, all_items))
+        renderer.show("inventory", inventory_system.display_inventory(session['character'], all_items))
         
-        if not current_character.get('inventory'):
+        if not session['character'].get('inventory'):
             return # Exit if inventory is empty
             
-        print("Inventory Options:")
-        print("1. Use Consumable")
-        print("2. Equip Weapon/Armor")
-        print("3. Back")
+        renderer.line("Inventory Options:")
+        renderer.line("1. Use Consumable")
+        renderer.line("2. Equip Item")
+        renderer.line("3. Back")
         
-        choice = input("Enter choice (1-3): ").strip()
+        choice = prompt(session, "Enter choice (1-3): ").strip()
 
         if choice == '3':
             return
         elif choice in ('1', '2'):
-            item_id = input("Enter item ID (e.g., 'health_potion'): ").strip()
+            item_id = prompt(session, "Enter item ID (e.g., 'health_potion'): ").strip()
             item_data = all_items.get(item_id)
             
             if not item_data:
-                print(f"Error: Item ID '{item_id}' not found in item data.")
+                renderer.line(f"Error: Item ID '{item_id}' not found in item data.")
                 continue
 
             try:
                 if choice == '1':
-                    print(inventory_system.use_item(current_character, item_id, item_data))
+                    qty = read_quantity(session)
+                    renderer.line(inventory_system.use_items(session['character'], item_id, qty, item_data))
                 elif choice == '2':
-                    item_type = item_data.get('TYPE', '').lower()
-                    
-                    # NOTE: Assuming character_manager has a recalculate_stats function
-                    recalc_func = character_manager.recalculate_stats 
-
-                    if item_type == 'weapon':
-                        print(inventory_system.equip_weapon(current_character, item_id, item_data, recalc_func))
-                    elif item_type == 'armor':
-                        print(inventory_system.equip_armor(current_character, item_id, item_data, recalc_func))
+                    if inventory_system.is_equippable(item_data):
+                        renderer.line(inventory_system.equip_item(session['character'], item_id, item_data))
                     else:
-                        raise InvalidItemTypeError(f"Item '{item_id}' is not a weapon or armor.")
+                        raise InvalidItemTypeError(f"Item '{item_id}' cannot be equipped.")
                         
-            except (ItemNotFoundError, InvalidItemTypeError, InventoryFullError) as e:
-                print(f"[INVENTORY ERROR] {e}")
+            except (ItemNotFoundError, InvalidItemTypeError, InventoryFullError, InsufficientResourcesError) as e:
+                renderer.line(f"[INVENTORY ERROR] {e}")
             except Exception as e:
-                print(f"[SYSTEM ERROR] Could not perform action: {e}")
+                renderer.line(f"[SYSTEM ERROR] Could not perform action: {e}")
         else:
-            print("Invalid inventory option.")
+            renderer.line("Invalid inventory option.")
 
-def quest_menu():
+def read_quantity(session):
+    """
+    Prompt until the player enters a whole number of at least 1 (blank means 1)
+    """
+    while True:
+        qty_str = prompt(session, "How many? (default 1): ").strip()
+        if not qty_str:
+            return 1
+        try:
+            qty = int(qty_str)
+        except ValueError:
+            renderer.line("Invalid quantity. Please enter a whole number.")
+            continue
+        if qty < 1:
+            renderer.line("Invalid quantity. Please enter 1 or more.")
+            continue
+        return qty
+
+def quest_menu(session):
     """Quest management menu"""
-    global current_character, all_quests
     
     while True:
-        print("\n--- Quest Menu ---")
-        print("1. View Active Quests")
-        print("2. View Available Quests")
-        print("3. Accept Quest")
-        print("4. Abandon Quest")
-        print("5. Complete Quest (DEBUG)")
-        print("6. Back")
+        renderer.line("\n--- Quest Menu ---")
+        renderer.line("1. View Active Quests")
+        renderer.line("2. View Available Quests")
+        renderer.line("3. Accept Quest")
+        renderer.line("4. Abandon Quest")
+        renderer.line("5. Complete Quest (DEBUG)")
+        renderer.line("6. Plan Route to Quest")
+        renderer.line("7. Back")
         
-        choice = input("Enter choice (1-6): ").strip()
+        choice = prompt(session, "Enter choice (1-7): ").strip()
         
-        if choice == '6':
+        if choice == '7':
             return
         elif choice == '1':
-            quest_handler.display_quest_list(quest_handler.get_active_quests(current_character, all_quests))
+            quest_handler.display_quest_list(quest_handler.get_active_quests(session['character'], all_quests))
+            quest_handler.display_objective_progress(session['character'], all_quests)
         elif choice == '2':
-            quest_handler.display_quest_list(quest_handler.get_available_quests(current_character, all_quests))
+            quest_handler.display_quest_list(quest_handler.get_available_quests(session['character'], all_quests))
         elif choice == '3':
-            quest_id = input("Enter Quest ID to accept: ").strip()
+            quest_id = prompt(session, "Enter Quest ID to accept: ").strip()
             try:
-                if quest_handler.accept_quest(current_character, quest_id, all_quests):
-                    print(f"Quest '{quest_id}' accepted!")
+                if quest_handler.accept_quest(session['character'], quest_id, all_quests):
+                    renderer.line(f"Quest '{quest_id}' accepted!")
             except (QuestNotFoundError, InsufficientLevelError, QuestRequirementsNotMetError, QuestAlreadyCompletedError) as e:
-                print(f"[QUEST ERROR] Could not accept quest: {e}")
+                renderer.line(f"[QUEST ERROR] Could not accept quest: {e}")
         elif choice == '4':
-            quest_id = input("Enter Quest ID to abandon: ").strip()
+            quest_id = prompt(session, "Enter Quest ID to abandon: ").strip()
             try:
-                if quest_handler.abandon_quest(current_character, quest_id):
-                    print(f"Quest '{quest_id}' abandoned.")
+                if quest_handler.abandon_quest(session['character'], quest_id):
+                    renderer.line(f"Quest '{quest_id}' abandoned.")
             except QuestNotActiveError as e:
-                print(f"[QUEST ERROR] Could not abandon quest: {e}")
+                renderer.line(f"[QUEST ERROR] Could not abandon quest: {e}")
         elif choice == '5':
             # DEBUG OPTION: Completes an active quest
-            quest_id = input("Enter Quest ID to COMPLETE: ").strip()
+            quest_id = prompt(session, "Enter Quest ID to COMPLETE: ").strip()
             try:
-                rewards = quest_handler.complete_quest(current_character, quest_id, all_quests)
-                print(f"Quest '{quest_id}' completed! Rewards: {rewards['reward_xp']} XP, {rewards['reward_gold']} Gold.")
+                rewards = quest_handler.complete_quest(session['character'], quest_id, all_quests)
+                renderer.line(f"Quest '{quest_id}' completed! Rewards: {rewards['reward_xp']} XP, {rewards['reward_gold']} Gold.")
             except (QuestNotFoundError, QuestNotActiveError) as e:
-                print(f"[QUEST ERROR] Could not complete quest: {e}")
+                renderer.line(f"[QUEST ERROR] Could not complete quest: {e}")
+        elif choice == '6':
+            quest_id = prompt(session, "Enter target Quest ID: ").strip()
+            try:
+                quest_planner.display_quest_route(quest_planner.plan_quest_route(session['character'], quest_id, all_quests))
+            except (QuestNotFoundError, QuestRequirementsNotMetError) as e:
+                renderer.line(f"[QUEST ERROR] Could not plan route: {e}")
         else:
-            print("Invalid quest menu option.")
+            renderer.line("Invalid quest menu option.")
 
-def explore():
+def explore(session):
     """Find and fight random enemies"""
-    global current_character
     
-    print("\n--- Exploring the Wilds ---")
+    renderer.line("\n--- Exploring the Wilds ---")
     
-    if not character_manager.can_character_fight(current_character):
-        print("You are too wounded to explore right now.")
+    if not combat_system.can_character_fight(session['character']):
+        renderer.line("You are too wounded to explore right now.")
         return
         
     try:
         # Generate random enemy based on character level
-        enemy = combat_system.get_random_enemy_for_level(current_character.get('level', 1))
+        enemy = combat_system.get_random_enemy_for_level(session['character'].get('level', 1))
         
         # Start combat
-        battle = combat_system.SimpleBattle(current_character, enemy)
+        battle = combat_system.SimpleBattle(session['character'], enemy)
         
-        print(f"You encounter a dangerous {enemy['name']}!")
+        renderer.line(f"You encounter a dangerous {enemy['name']}!")
         
         # Start battle and handle results
         results = battle.start_battle()
         
+        # Keep the battle for balance audits when a log file is set
+        log_file = os.environ.get("QUEST_BATTLE_LOG")
+        if log_file:
+            battle_log.append_log(log_file, battle.log)
+        
         if results['winner'] == 'player':
             # Grant rewards using character manager functions
-            character_manager.gain_experience(current_character, results['xp_gained'])
-            character_manager.add_gold(current_character, results['gold_gained'])
-            character_manager.check_for_level_up(current_character)
+            leveled = character_manager.gain_experience(session['character'], results['xp_gained'])
+            character_manager.add_gold(session['character'], results['gold_gained'])
+            if leveled:
+                renderer.line(f"\nLEVEL UP! {session['character']['name']} is now level {session['character']['level']}.")
+                quest_handler.display_level_up_preview(session['character'], all_quests)
             
         elif results['winner'] == 'enemy':
             # Character died, let the main loop handle death
             pass 
         
     except InvalidTargetError as e:
-        print(f"[EXPLORE ERROR] Could not create enemy: {e}")
+        renderer.line(f"[EXPLORE ERROR] Could not create enemy: {e}")
     except CharacterDeadError as e:
-        print(f"[COMBAT ERROR] Cannot start combat: {e}")
+        renderer.line(f"[COMBAT ERROR] Cannot start combat: {e}")
     except Exception as e:
-        print(f"[SYSTEM ERROR] An error occurred during exploration: {e}")
+        renderer.line(f"[SYSTEM ERROR] An error occurred during exploration: {e}")
 
 
-def shop():
+def shop(session):
     """Shop menu for buying/selling items"""
-    global current_character, all_items
     
     # NOTE: In a real game, this would filter for only 'shop' items.
     shop_items = [v for k, v in all_items.items() if v.get('COST') is not None] 
     
     while True:
-        print("\n--- The General Store ---")
-        print(f"Current Gold: {current_character.get('gold', 0)}")
-        print("Options: 1. Buy | 2. Sell | 3. Back")
+        renderer.line("\n--- The General Store ---")
+        renderer.line(f"Current Gold: {session['character'].get('gold', 0)}")
+        renderer.line("Options: 1. Buy | 2. Sell | 3. Back")
         
-        choice = input("Enter choice (1-3): ").strip()
+        choice = prompt(session, "Enter choice (1-3): ").strip()
         
         if choice == '3':
             return
         
         elif choice == '1': # Buy Item
-            print("\nItems for Sale:")
+            renderer.line("\nItems for Sale:")
             # Display items in a simple format
             for item in shop_items:
-                print(f"- {item['NAME']} ({item['ITEM_ID']}): {item['COST']} Gold")
+                renderer.line(f"- {item['NAME']} ({item['ITEM_ID']}): {item['COST']} Gold")
 
-            buy_id = input("Enter Item ID to buy: ").strip()
+            buy_id = prompt(session, "Enter Item ID to buy: ").strip()
             item_data = all_items.get(buy_id)
             if not item_data:
-                print("Item not found.")
+                renderer.line("Item not found.")
                 continue
 
             try:
                 # NOTE: Assuming character_manager has add_gold function
                 add_gold_func = character_manager.add_gold 
-                if inventory_system.purchase_item(current_character, buy_id, item_data, add_gold_func):
-                    print(f"Purchased {item_data['NAME']} for {item_data['COST']} gold.")
+                if inventory_system.purchase_item(session['character'], buy_id, item_data, add_gold_func):
+                    renderer.line(f"Purchased {item_data['NAME']} for {item_data['COST']} gold.")
             except (InsufficientResourcesError, InventoryFullError, InvalidItemTypeError) as e:
-                print(f"[SHOP ERROR] Purchase failed: {e}")
+                renderer.line(f"[SHOP ERROR] Purchase failed: {e}")
 
         elif choice == '2': # Sell Item
-            print(inventory_system.display_inventory(current_character, all_items))
-            sell_id = input("Enter Item ID to sell: ").strip()
+            renderer.show("inventory", inventory_system.display_inventory(session['character'], all_items))
+            sell_id = prompt(session, "Enter Item ID to sell: ").strip()
             item_data = all_items.get(sell_id)
             if not item_data:
-                print("Item not found.")
+                renderer.line("Item not found.")
                 continue
             
             try:
                 # NOTE: Assuming character_manager has add_gold function
                 add_gold_func = character_manager.add_gold 
-                sell_price = inventory_system.sell_item(current_character, sell_id, item_data, add_gold_func)
-                print(f"Sold {item_data['NAME']} for {sell_price} gold.")
+                sell_price = inventory_system.sell_item(session['character'], sell_id, item_data, add_gold_func)
+                renderer.line(f"Sold {item_data['NAME']} for {sell_price} gold.")
             except (ItemNotFoundError, InvalidItemTypeError) as e:
-                print(f"[SHOP ERROR] Sale failed: {e}")
+                renderer.line(f"[SHOP ERROR] Sale failed: {e}")
 
         else:
-            print("Invalid shop option.")
+            renderer.line("Invalid shop option.")
 
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def save_game():
+def save_game(session):
     """Save current game state"""
-    global current_character
     
-    if current_character:
+    if session['character']:
         try:
-            character_manager.save_character(current_character)
-            print(f"\nGame saved for {current_character['name']}.")
+            character_manager.save_character(session['character'], session['save_directory'])
+            renderer.line(f"\nGame saved for {session['character']['name']}.")
         except Exception as e:
-            print(f"[SAVE ERROR] Failed to save game: {e}")
+            renderer.line(f"[SAVE ERROR] Failed to save game: {e}")
 
 
 def load_game_data():
@@ -459,114 +607,237 @@ def load_game_data():
     global all_quests, all_items
     
     # Try to load quests
+    start = time.perf_counter()
     all_quests = game_data.load_quests()
     
+    # Build the prerequisite graph once for this catalog and start
+    # tracking quest objectives
+    quest_handler.get_quest_graph(all_quests)
+    quest_handler.register_quest_objectives(all_quests)
+    record_startup_step(f"load {len(all_quests)} quests", start)
+    
     # Try to load items
+    start = time.perf_counter()
     all_items = game_data.load_items()
+    
+    # Equipment slots and abilities are optional; keep the built-in ones without the files
+    try:
+        inventory_system.set_equipment_slots(game_data.load_equipment_slots())
+    except MissingDataFileError:
+        pass
+    try:
+        combat_system.set_abilities(game_data.load_abilities())
+    except MissingDataFileError:
+        pass
+    record_startup_step(f"load {len(all_items)} items", start)
 
 
-def handle_character_death():
+def validate_game_data():
+    """
+    Validate the loaded quest and item catalogs
+    
+    Returns: True if the game can start (warnings are shown but allowed)
+    """
+    start = time.perf_counter()
+    report = catalog_validator.validate_catalogs(all_quests, all_items)
+    record_startup_step("validate catalogs", start)
+    if report['errors'] or report['warnings']:
+        catalog_validator.display_validation_report(report)
+    if not report['ok']:
+        renderer.line("FATAL ERROR: Data validation failed. Please fix the errors above.")
+        return False
+    return True
+
+
+def handle_character_death(session):
     """Handle character death"""
-    global current_character, game_running
     
-    print("\n" + "=" * 50)
-    print(f"              {current_character['name']} HAS FALLEN!")
-    print("=" * 50)
+    renderer.line("\n" + "=" * 50)
+    renderer.line(f"              {session['character']['name']} HAS FALLEN!")
+    renderer.line("=" * 50)
     
-    revive_cost = 50 * current_character.get('level', 1)
-    current_gold = current_character.get('gold', 0)
+    revive_cost = 50 * session['character'].get('level', 1)
+    current_gold = session['character'].get('gold', 0)
     
     while True:
-        print(f"Current Gold: {current_gold}")
-        print(f"1. Revive at town (Cost: {revive_cost} Gold)")
-        print("2. Quit Game (Character remains dead)")
+        renderer.line(f"Current Gold: {current_gold}")
+        renderer.line(f"1. Revive at town (Cost: {revive_cost} Gold)")
+        renderer.line("2. Quit Game (Character remains dead)")
         
-        choice = input("Enter choice (1-2): ").strip()
+        choice = prompt(session, "Enter choice (1-2): ").strip()
         
         if choice == '1':
             if current_gold >= revive_cost:
                 try:
-                    character_manager.revive_character(current_character, revive_cost)
-                    print(f"\n{current_character['name']} is revived! Lost {revive_cost} gold.")
+                    character_manager.revive_character(session['character'], revive_cost)
+                    renderer.line(f"\n{session['character']['name']} is revived! Lost {revive_cost} gold.")
                     return # Exit death loop
                 except InsufficientResourcesError as e:
                     # Should be caught by the gold check, but as a safeguard
-                    print(f"[REVIVE ERROR] {e}")
+                    renderer.line(f"[REVIVE ERROR] {e}")
             else:
-                print(f"You do not have enough gold to revive. Need {revive_cost}.")
+                renderer.line(f"You do not have enough gold to revive. Need {revive_cost}.")
         elif choice == '2':
-            print("\nGame Over. Farewell, hero.")
-            game_running = False
+            renderer.line("\nGame Over. Farewell, hero.")
+            session['running'] = False
             return # Exit death loop
         else:
-            print("Invalid choice.")
+            renderer.line("Invalid choice.")
 
 
 def display_welcome():
     """Display welcome message"""
-    print("=" * 50)
-    print("     QUEST CHRONICLES - A MODULAR RPG ADVENTURE")
-    print("=" * 50)
-    print("\nWelcome to Quest Chronicles!")
-    print("Build your character, complete quests, and become a legend!")
-    print()
+    renderer.line("=" * 50)
+    renderer.line("     QUEST CHRONICLES - A MODULAR RPG ADVENTURE")
+    renderer.line("=" * 50)
+    renderer.line("\nWelcome to Quest Chronicles!")
+    renderer.line("Build your character, complete quests, and become a legend!")
+    renderer.line()
 
 # ============================================================================
 # MAIN EXECUTION
 # ============================================================================
 
-def main():
+def main(session=None):
     """Main game execution function"""
+    if session is None:
+        session = console_session
+
+    output_stream = session['output']
+    if output_stream is None:
+        output_stream = sys.stdout
+
+    # Send everything printed by any module to the session's stream
+    old_stdout = sys.stdout
+    sys.stdout = output_stream
+    try:
+        run_game(session)
+    finally:
+        renderer.flush()
+        sys.stdout = old_stdout
+
+def run_game(session):
+    """Show the main menu until the player exits; game data loads when a game starts"""
     
     # Display welcome message
     display_welcome()
     
+    run_main_menu(session)
+
+def ensure_game_data():
+    """
+    Load and validate the catalogs the first time a game needs them
+    
+    Returns: True if the catalogs are ready, False after a fatal data error
+    """
+    if game_data_state['loaded']:
+        return True
+    
     # Load game data
     try:
         load_game_data()
         
-        # Post-load validation (e.g., check quest prerequisites)
-        quest_handler.validate_quest_prerequisites(all_quests) 
+        # Post-load validation: report every catalog problem at once
+        if not validate_game_data():
+            return False
         
-        print("Game data loaded successfully!")
+        renderer.line("Game data loaded successfully!")
     except MissingDataFileError:
-        print("Creating default game data...")
+        renderer.line("Creating default game data...")
         game_data.create_default_data_files()
         
         # Attempt to load again after creating files
         try:
             load_game_data()
-            quest_handler.validate_quest_prerequisites(all_quests)
-            print("Default game data created and loaded successfully!")
+            if not validate_game_data():
+                return False
+            renderer.line("Default game data created and loaded successfully!")
         except Exception as e:
-            print(f"FATAL ERROR: Failed to load default data: {e}")
-            return
+            renderer.line(f"FATAL ERROR: Failed to load default data: {e}")
+            return False
             
     except InvalidDataFormatError as e:
-        print(f"FATAL ERROR: Error loading game data: {e}")
-        print("Please check data files for errors.")
-        return
+        renderer.line(f"FATAL ERROR: Error loading game data: {e}")
+        # Loading stops at the first bad record; list every problem at once
+        try:
+            catalog_validator.display_validation_report(catalog_validator.validate_files())
+        except (MissingDataFileError, InvalidDataFormatError):
+            pass # The files can't even be read as records; the error above says why
+        renderer.line("Please check data files for errors.")
+        return False
     except QuestNotFoundError as e:
-        print(f"FATAL ERROR: Data validation failed: {e}")
-        return
+        renderer.line(f"FATAL ERROR: Data validation failed: {e}")
+        return False
     
-    # Main menu loop
+    game_data_state['loaded'] = True
+    return True
+
+def run_main_menu(session):
+    """Run the main menu for a session until the player exits"""
     while True:
-        choice = main_menu()
+        choice = main_menu(session)
+        
+        if choice in (1, 2) and not ensure_game_data():
+            break
         
         if choice == 1:
-            new_game()
+            new_game(session)
         elif choice == 2:
-            load_game()
+            load_game(session)
         elif choice == 3:
-            print("\nThanks for playing Quest Chronicles!")
+            renderer.line("\nThanks for playing Quest Chronicles!")
             break
         else:
-            print("Invalid choice. Please select 1-3.")
+            renderer.line("Invalid choice. Please select 1-3.")
+
+# ============================================================================
+# STARTUP REPORT
+# ============================================================================
+
+def startup_report():
+    """
+    Load every subsystem and the catalogs now, timing each step
+    
+    Returns: Dictionary with 'first_menu' (seconds from main.py starting
+             to load until the first menu could be shown), 'steps' (see
+             startup_times) and 'total' (seconds for all steps)
+    """
+    first_menu = time.perf_counter() - _started_at
+    
+    i = 0
+    while i < len(SUBSYSTEMS):
+        if isinstance(globals()[SUBSYSTEMS[i]], LazyModule):
+            load_module(SUBSYSTEMS[i])
+        i += 1
+    ensure_game_data()
+    
+    total = 0.0
+    for step in startup_times:
+        total += step['seconds']
+    return {'first_menu': first_menu, 'steps': list(startup_times), 'total': total}
+
+def display_startup_report(report):
+    """
+    Display the timings from startup_report
+    """
+    lines = [
+        "\n=== STARTUP REPORT ===",
+        f"Time to first menu: {report['first_menu'] * 1000:.1f} ms",
+        "| {:<28} | {:>9} |".format("Step", "ms"),
+        "-" * 44,
+    ]
+    for step in report['steps']:
+        lines.append("| {:<28} | {:>9.2f} |".format(step['name'], step['seconds'] * 1000))
+        if step['also_loaded']:
+            lines.append(f"|   also loaded: {', '.join(step['also_loaded'])}")
+    lines.append(f"Loaded on first use: {report['total'] * 1000:.1f} ms")
+    renderer.show("startup_report", "\n".join(lines), **report)
 
 if __name__ == "__main__":
-<<<<<<< HEAD
-    main()
-=======
-    main()
->>>>>>> effbbc7ea9df0b4db805e3ed41175a57fcc9c474
+    import metrics
+    metrics.enable_from_env()
+
+    if "--startup-report" in sys.argv[1:]:
+        display_startup_report(startup_report())
+    else:
+        profiling.run_profiled("main", main)
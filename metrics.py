@@ -0,0 +1,253 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Metrics Module
+
+Counters, histograms and timers for finding where time goes in real
+sessions. Metrics are off by default and cost nothing then: the hot
+functions listed in HOT_PATHS are only wrapped with timers while metrics
+are enabled, and the originals are put back by disable().
+
+Set QUEST_METRICS to a file path to record a whole run of main.py,
+game_server.py or game_driver.py; the snapshot is written at exit as
+Prometheus text if the path ends in .prom, otherwise as JSON.
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Histogram bucket upper bounds for timings, in seconds
+DEFAULT_BUCKETS = [0.00001, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0]
+
+# Every metric name starts with this
+PREFIX = "quest_"
+
+# Functions timed while metrics are enabled: (module, attribute, metric name).
+# The attribute may name a method as "Class.method"
+HOT_PATHS = [
+    ("game_data", "load_items", "load_items"),
+    ("game_data", "load_quests", "load_quests"),
+    ("character_manager", "save_character", "save_character"),
+    ("character_manager", "load_character", "load_character"),
+    ("character_manager", "recalculate_stats", "recalculate_stats"),
+    ("combat_system", "SimpleBattle._play_turn", "battle_turn"),
+    ("inventory_system", "purchase_item", "purchase_item"),
+    ("quest_handler", "complete_quest", "complete_quest"),
+]
+
+_state = {'enabled': False, 'patched': []}
+_counters = {}
+_histograms = {}
+_lock = threading.Lock()
+
+# ============================================================================
+# RECORDING
+# ============================================================================
+
+def increment(name, amount=1):
+    """
+    Add amount to a counter (no-op while metrics are disabled)
+    """
+    if not _state['enabled']:
+        return
+    name = PREFIX + name
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+def observe(name, value, buckets=None):
+    """
+    Record one value in a histogram (no-op while metrics are disabled)
+
+    buckets are the upper bounds, fixed by the first observation.
+    """
+    if not _state['enabled']:
+        return
+    name = PREFIX + name
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            bounds = list(buckets or DEFAULT_BUCKETS)
+            histogram = {'bounds': bounds, 'counts': [0] * len(bounds), 'count': 0, 'sum': 0.0}
+            _histograms[name] = histogram
+
+        bounds = histogram['bounds']
+        i = 0
+        while i < len(bounds) and value > bounds[i]:
+            i += 1
+        if i < len(bounds):
+            histogram['counts'][i] += 1
+        histogram['count'] += 1
+        histogram['sum'] += value
+
+class Timer:
+    """
+    Time a block of code into the histogram '<name>_seconds'
+
+        with metrics.Timer("explore"):
+            ...
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(f"{self.name}_seconds", time.perf_counter() - self.start)
+        if exc_type is not None:
+            increment(f"{self.name}_errors_total")
+        return False
+
+def timed(func, name):
+    """
+    Wrap func so each call is timed into '<name>_seconds' and failures
+    counted in '<name>_errors_total'
+
+    Returns: The wrapper
+    """
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except BaseException:
+            increment(f"{name}_errors_total")
+            raise
+        finally:
+            observe(f"{name}_seconds", time.perf_counter() - start)
+
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    wrapper.__wrapped__ = func
+    return wrapper
+
+# ============================================================================
+# ENABLING
+# ============================================================================
+
+def enable():
+    """
+    Start recording and wrap the HOT_PATHS functions with timers
+    """
+    if _state['enabled']:
+        return
+    _state['enabled'] = True
+
+    for module_name, attribute, name in HOT_PATHS:
+        __import__(module_name)
+        owner = sys.modules[module_name]
+        parts = attribute.split(".")
+        for part in parts[:-1]:
+            owner = getattr(owner, part)
+        original = getattr(owner, parts[-1])
+        setattr(owner, parts[-1], timed(original, name))
+        _state['patched'].append((owner, parts[-1], original))
+
+def disable():
+    """
+    Stop recording and put the original HOT_PATHS functions back
+    """
+    _state['enabled'] = False
+    while _state['patched']:
+        owner, attribute, original = _state['patched'].pop()
+        setattr(owner, attribute, original)
+
+def is_enabled():
+    """
+    Return True while metrics are being recorded
+    """
+    return _state['enabled']
+
+def reset():
+    """
+    Clear every recorded value
+    """
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+def enable_from_env(variable="QUEST_METRICS"):
+    """
+    Enable metrics if the environment variable names an output file, and
+    write the snapshot there when the program exits
+
+    Returns: The output path, or None if metrics stay disabled
+    """
+    path = os.environ.get(variable)
+    if not path:
+        return None
+
+    import atexit
+    enable()
+    atexit.register(write_snapshot, path)
+    return path
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+
+def snapshot():
+    """
+    Copy the current values
+
+    Returns: Dictionary with 'counters' {name: value} and 'histograms'
+             {name: {'count', 'sum', 'buckets': [(upper bound, cumulative count), ...]}}
+    """
+    with _lock:
+        histograms = {}
+        for name in _histograms:
+            histogram = _histograms[name]
+            cumulative = []
+            total = 0
+            i = 0
+            while i < len(histogram['bounds']):
+                total += histogram['counts'][i]
+                cumulative.append((histogram['bounds'][i], total))
+                i += 1
+            histograms[name] = {'count': histogram['count'], 'sum': histogram['sum'], 'buckets': cumulative}
+        return {'counters': dict(_counters), 'histograms': histograms}
+
+def to_json(data):
+    """
+    Format a snapshot as JSON text
+    """
+    import json
+
+    return json.dumps(data, indent=2)
+
+def to_prometheus(data):
+    """
+    Format a snapshot in the Prometheus text exposition format
+    """
+    lines = []
+    for name in sorted(data['counters']):
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name} {data['counters'][name]}")
+
+    for name in sorted(data['histograms']):
+        histogram = data['histograms'][name]
+        lines.append(f"# TYPE {name} histogram")
+        for bound, count in histogram['buckets']:
+            lines.append(f'{name}_bucket{{le="{bound}"}} {count}')
+        lines.append(f'{name}_bucket{{le="+Inf"}} {histogram["count"]}')
+        lines.append(f"{name}_sum {histogram['sum']}")
+        lines.append(f"{name}_count {histogram['count']}")
+    return "\n".join(lines) + "\n"
+
+def write_snapshot(path, export_format=None):
+    """
+    Write the current snapshot to a file
+
+    export_format is "json" or "prometheus"; by default it is chosen
+    from the file extension (.prom means Prometheus).
+    """
+    if export_format is None:
+        export_format = "prometheus" if path.endswith(".prom") else "json"
+
+    data = snapshot()
+    text = to_prometheus(data) if export_format == "prometheus" else to_json(data)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
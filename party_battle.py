@@ -0,0 +1,276 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Party Battle Module
+
+Battles between a party of characters and a group of enemies, any size
+on either side. Turn order comes from initiative: each combatant acts
+every ACTION_TIME // speed ticks, so a speed 12 goblin acts twice for
+every turn of a speed 6 dragon. The schedule is a heap of
+(next action time, sequence, slot); each turn pops the next actor and
+pushes it back, O(log n) no matter how many combatants there are.
+
+Combatants can join (reinforcements) or leave (flee) mid-fight. A
+combatant that leaves or dies keeps its heap entry until it comes up
+and is skipped then, so removal is O(1). Each side keeps a list of its
+live slot numbers for picking targets.
+
+Usage: python party_battle.py [party_size] [enemy_count] [enemy_type]
+"""
+
+import heapq
+import random
+import sys
+
+import character_manager
+import combat_system
+import event_bus
+import renderer
+from custom_exceptions import CharacterDeadError, CombatNotActiveError, InvalidTargetError
+
+# Ticks between actions at speed 1
+ACTION_TIME = 1000
+
+DEFAULT_SPEED = 10
+
+# Speed of characters without a 'speed' stat, by class
+CLASS_SPEED = {'rogue': 14, 'warrior': 10, 'mage': 9, 'cleric': 8}
+
+SIDES = ['player', 'enemy']
+
+def get_speed(combatant):
+    """
+    Return a combatant's initiative speed (at least 1)
+    """
+    speed = combatant.get('speed')
+    if speed is None:
+        speed = CLASS_SPEED.get(str(combatant.get('class', '')).lower(), DEFAULT_SPEED)
+    return max(1, int(speed))
+
+# ============================================================================
+# PARTY BATTLE
+# ============================================================================
+
+class PartyBattle:
+    """
+    Initiative-ordered battle between a party and a group of enemies
+
+    Every combatant has a slot number (its position in self.slots).
+    """
+
+    def __init__(self, party, enemies, rng=None):
+        """
+        Initialize the battle; party and enemies are lists of character
+        and enemy dictionaries
+
+        rng supplies random() for target picks; the random module by default
+        Raises: CharacterDeadError if a combatant has no health left
+        """
+        self.rng = rng if rng is not None else random
+        self.slots = []
+        self.live = {'player': [], 'enemy': []}
+        self.queue = []
+        self.now = 0
+        self.sequence = 0
+        self.turn_counter = 0
+        self.combat_active = False
+        self.defeated = []
+
+        for character in party:
+            self.add_combatant(character, 'player')
+        for enemy in enemies:
+            self.add_combatant(enemy, 'enemy')
+
+    # ------------------------------------------------------------------
+    # Combatants
+    # ------------------------------------------------------------------
+
+    def add_combatant(self, unit, side):
+        """
+        Add a combatant, who first acts one action's time from now
+
+        Returns: The new slot number
+        Raises: ValueError for an unknown side,
+                CharacterDeadError if unit has no health left
+        """
+        if side not in self.live:
+            raise ValueError(f"Unknown side '{side}'")
+        if unit.get('health', 0) <= 0:
+            raise CharacterDeadError(f"{unit.get('name', 'Combatant')} is already defeated.")
+
+        slot = len(self.slots)
+        live = self.live[side]
+        self.slots.append({'unit': unit, 'side': side, 'speed': get_speed(unit),
+                           'alive': True, 'live_index': len(live)})
+        live.append(slot)
+        self._schedule(slot)
+        return slot
+
+    def remove_combatant(self, slot):
+        """
+        Take a combatant out of the fight (fled, dismissed or defeated)
+
+        Raises: InvalidTargetError if there is no such slot
+        """
+        if slot < 0 or slot >= len(self.slots):
+            raise InvalidTargetError(f"No combatant in slot {slot}.")
+        entry = self.slots[slot]
+        if not entry['alive']:
+            return
+        entry['alive'] = False
+
+        # Swap-remove from the side's live list
+        live = self.live[entry['side']]
+        last = live.pop()
+        if last != slot:
+            live[entry['live_index']] = last
+            self.slots[last]['live_index'] = entry['live_index']
+
+    def live_combatants(self, side):
+        """
+        Return the combatants of one side still fighting
+        """
+        return [self.slots[slot]['unit'] for slot in self.live[side]]
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def _schedule(self, slot):
+        """Queue a combatant's next action"""
+        self.sequence += 1
+        heapq.heappush(self.queue, (self.now + ACTION_TIME // self.slots[slot]['speed'], self.sequence, slot))
+
+    def next_actor(self):
+        """
+        Advance to the next live combatant's action
+
+        Returns: Its slot number, or None if nobody is left to act
+        """
+        queue = self.queue
+        while queue:
+            action_time, sequence, slot = heapq.heappop(queue)
+            if self.slots[slot]['alive']:
+                self.now = action_time
+                return slot
+        return None
+
+    def choose_target(self, slot):
+        """
+        Pick a random live opponent for a combatant
+
+        Returns: The target's slot number, or None if no opponents are left
+        """
+        opponents = self.live['enemy' if self.slots[slot]['side'] == 'player' else 'player']
+        if not opponents:
+            return None
+        return opponents[int(self.rng.random() * len(opponents))]
+
+    # ------------------------------------------------------------------
+    # Combat
+    # ------------------------------------------------------------------
+
+    def start_battle(self):
+        """
+        Fight until one side has nobody left
+
+        Returns: Dictionary with 'winner' ('player' or 'enemy'),
+                 'xp_gained', 'gold_gained' (for every enemy defeated,
+                 if the party won), 'turns' and 'survivors' (the winning
+                 side's combatants)
+        """
+        self.combat_active = True
+        winner = self.check_battle_end()
+        while winner is None:
+            winner = self.play_turn()
+        self.combat_active = False
+
+        xp = 0
+        gold = 0
+        if winner == 'player':
+            for enemy in self.defeated:
+                rewards = combat_system.get_victory_rewards(enemy)
+                xp += rewards['xp']
+                gold += rewards['gold']
+            if renderer.enabled():
+                combat_system.display_battle_log(f"The party wins after {self.turn_counter} turns!")
+        elif renderer.enabled():
+            combat_system.display_battle_log(f"The party falls after {self.turn_counter} turns.")
+
+        return {'winner': winner, 'xp_gained': xp, 'gold_gained': gold,
+                'turns': self.turn_counter, 'survivors': self.live_combatants(winner)}
+
+    def play_turn(self):
+        """
+        Let the next combatant in initiative order attack
+
+        Returns: The winning side if the battle ended, otherwise None
+        Raises: CombatNotActiveError if the battle hasn't started
+        """
+        if not self.combat_active:
+            raise CombatNotActiveError("Combat is not currently active.")
+
+        slot = self.next_actor()
+        if slot is None:
+            return self.check_battle_end()
+        target_slot = self.choose_target(slot)
+        if target_slot is None:
+            return self.check_battle_end()
+        self.turn_counter += 1
+
+        attacker = self.slots[slot]['unit']
+        target = self.slots[target_slot]['unit']
+        damage = combat_system.calculate_damage(attacker, target)
+        target['health'] = max(0, target['health'] - damage)
+        if renderer.enabled():
+            combat_system.display_battle_log(f"{attacker['name']} attacks {target['name']} for {damage} damage!")
+
+        if target['health'] <= 0:
+            self.remove_combatant(target_slot)
+            if self.slots[target_slot]['side'] == 'enemy':
+                self.defeated.append(target)
+                # Quest objectives count the kill for whoever landed it
+                event_bus.emit(event_bus.ENEMY_DEFEATED, target.get('type'), attacker)
+            if renderer.enabled():
+                combat_system.display_battle_log(f"{target['name']} is defeated!")
+
+        self._schedule(slot)
+        return self.check_battle_end()
+
+    def check_battle_end(self):
+        """
+        Check if either side has nobody left
+
+        Returns: 'player' if every enemy is gone, 'enemy' if the whole
+                 party is, None if the battle goes on
+        """
+        if not self.live['enemy']:
+            return 'player'
+        if not self.live['player']:
+            return 'enemy'
+        return None
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    import time
+
+    party_size = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    enemy_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    enemy_type = sys.argv[3] if len(sys.argv) > 3 else "goblin"
+
+    classes = list(CLASS_SPEED)
+    party = [character_manager.create_character(f"Hero{i}", classes[i % len(classes)].title())
+             for i in range(party_size)]
+    enemies = [combat_system.create_enemy(enemy_type) for i in range(enemy_count)]
+
+    renderer.set_renderer(renderer.new_renderer("silent"))
+    start = time.perf_counter()
+    result = PartyBattle(party, enemies, rng=random.Random(163)).start_battle()
+    seconds = time.perf_counter() - start
+    renderer.set_renderer(None)
+
+    print(f"{party_size} heroes vs {enemy_count} {enemy_type}s: {result['winner']} wins "
+          f"after {result['turns']} turns, {len(result['survivors'])} survivors")
+    print(f"{seconds:.3f}s ({result['turns'] / seconds:.0f} turns/second)")
@@ -0,0 +1,281 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Profiling Module
+
+Profiles a run without editing code. Choose one or more modes with
+QUEST_PROFILE=cpu,memory,sample (or --profile=cpu,memory,sample on the
+command line of main.py, game_driver.py, economy_sim.py or benchmark.py):
+
+    cpu     cProfile of the whole run: a .prof file (for pstats/snakeviz)
+            and a top-N text summary
+    memory  tracemalloc: allocation growth between menu boundaries
+            (see checkpoint) and the biggest allocation sites at the end
+    sample  a background thread samples the running stack every few
+            milliseconds: collapsed stacks (flame graph input) and the
+            top-N functions by samples
+
+Files go to QUEST_PROFILE_DIR (default "profiles") and are named
+<run name>-<timestamp>-<pid>.<kind>; QUEST_PROFILE_TOP sets N (default 25).
+"""
+
+import os
+import sys
+import threading
+import time
+
+MODES = ["cpu", "memory", "sample"]
+
+DEFAULT_DIRECTORY = "profiles"
+DEFAULT_TOP = 25
+
+# Seconds between stack samples in sample mode
+SAMPLE_INTERVAL = 0.005
+
+# Memory checkpoints that keep a full allocation diff (each one walks
+# every live allocation); later ones only record current and peak usage
+MAX_MEMORY_DIFFS = 20
+
+# The profile running in this process, if any
+_active = {'profile': None}
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+def get_profile_modes(argv=None):
+    """
+    Read the requested modes from --profile=... in argv, else QUEST_PROFILE
+
+    Returns: List of modes (empty when profiling is off)
+    Raises: ValueError for a mode not in MODES
+    """
+    value = os.environ.get("QUEST_PROFILE", "")
+    for arg in (argv if argv is not None else sys.argv[1:]):
+        if arg.startswith("--profile="):
+            value = arg[len("--profile="):]
+
+    modes = [mode.strip() for mode in value.split(",") if mode.strip()]
+    for mode in modes:
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode '{mode}' (expected {', '.join(MODES)})")
+    return modes
+
+# ============================================================================
+# PROFILES
+# ============================================================================
+
+def start_profile(name, modes, directory=None, top=None):
+    """
+    Start profiling this process
+
+    Returns: The profile dictionary (also the active profile)
+    """
+    if directory is None:
+        directory = os.environ.get("QUEST_PROFILE_DIR", DEFAULT_DIRECTORY)
+    if top is None:
+        top = int(os.environ.get("QUEST_PROFILE_TOP", DEFAULT_TOP))
+
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    profile = {
+        'name': name,
+        'modes': list(modes),
+        'top': top,
+        'base_path': os.path.join(directory, f"{name}-{stamp}-{os.getpid()}"),
+        'started': time.perf_counter(),
+        'cpu': None,
+        'memory': None,
+        'sampler': None,
+    }
+    os.makedirs(directory, exist_ok=True)
+
+    if "memory" in modes:
+        import tracemalloc
+        tracemalloc.start(10)
+        profile['memory'] = {'checkpoints': [], 'previous': _take_snapshot()}
+
+    if "sample" in modes:
+        profile['sampler'] = _start_sampler(threading.get_ident())
+
+    if "cpu" in modes:
+        import cProfile
+        profile['cpu'] = cProfile.Profile()
+        profile['cpu'].enable()
+
+    _active['profile'] = profile
+    return profile
+
+def stop_profile(profile):
+    """
+    Stop profiling and write every output file
+
+    Returns: List of the file paths written
+    """
+    paths = []
+    if profile['cpu'] is not None:
+        profile['cpu'].disable()
+        paths.extend(_write_cpu(profile))
+    if profile['sampler'] is not None:
+        profile['sampler']['running'] = False
+        profile['sampler']['thread'].join()
+        paths.extend(_write_samples(profile))
+    if profile['memory'] is not None:
+        paths.extend(_write_memory(profile))
+
+    if _active['profile'] is profile:
+        _active['profile'] = None
+    return paths
+
+def run_profiled(name, func, *args, argv=None, **kwargs):
+    """
+    Call func(*args, **kwargs), profiled if profiling was requested
+
+    Returns: Whatever func returns
+    """
+    modes = get_profile_modes(argv)
+    if not modes:
+        return func(*args, **kwargs)
+
+    profile = start_profile(name, modes)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        paths = stop_profile(profile)
+        for path in paths:
+            print(f"[profile] wrote {path}", file=sys.stderr)
+
+def checkpoint(label):
+    """
+    Mark a menu boundary; in memory mode, records allocation growth since
+    the previous checkpoint (no-op otherwise)
+    """
+    profile = _active['profile']
+    if profile is None or profile['memory'] is None:
+        return
+
+    import tracemalloc
+    memory = profile['memory']
+    current, peak = tracemalloc.get_traced_memory()
+    entry = {'label': label, 'seconds': time.perf_counter() - profile['started'],
+             'current': current, 'peak': peak, 'growth': []}
+
+    if len(memory['checkpoints']) < MAX_MEMORY_DIFFS:
+        snapshot = _take_snapshot()
+        stats = snapshot.compare_to(memory['previous'], "lineno")
+        entry['growth'] = [str(stat) for stat in stats[:5] if stat.size_diff > 0]
+        memory['previous'] = snapshot
+    memory['checkpoints'].append(entry)
+
+def _take_snapshot():
+    """Take a tracemalloc snapshot without the profiler's own allocations"""
+    import tracemalloc
+    return tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ])
+
+# ============================================================================
+# SAMPLING
+# ============================================================================
+
+def _start_sampler(thread_id):
+    """Start a daemon thread that samples thread_id's stack"""
+    sampler = {'running': True, 'stacks': {}, 'samples': 0, 'thread': None}
+
+    def sample():
+        while sampler['running']:
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None:
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                key = ";".join(reversed(stack))
+                sampler['stacks'][key] = sampler['stacks'].get(key, 0) + 1
+                sampler['samples'] += 1
+            time.sleep(SAMPLE_INTERVAL)
+
+    sampler['thread'] = threading.Thread(target=sample, name="profile-sampler", daemon=True)
+    sampler['thread'].start()
+    return sampler
+
+# ============================================================================
+# OUTPUT FILES
+# ============================================================================
+
+def _write_cpu(profile):
+    """Write the .prof file and its top-N summary"""
+    import io
+    import pstats
+
+    prof_path = profile['base_path'] + ".prof"
+    text_path = profile['base_path'] + "-cpu.txt"
+    profile['cpu'].dump_stats(prof_path)
+
+    summary = io.StringIO()
+    stats = pstats.Stats(prof_path, stream=summary)
+    stats.sort_stats("cumulative").print_stats(profile['top'])
+    stats.sort_stats("tottime").print_stats(profile['top'])
+    with open(text_path, "w", encoding="utf-8") as f:
+        f.write(f"CPU profile of {profile['name']}\n")
+        f.write(summary.getvalue())
+    return [prof_path, text_path]
+
+def _write_samples(profile):
+    """Write collapsed stacks and the top-N functions by samples"""
+    sampler = profile['sampler']
+    stacks = sampler['stacks']
+    folded_path = profile['base_path'] + "-samples.folded"
+    text_path = profile['base_path'] + "-samples.txt"
+
+    with open(folded_path, "w", encoding="utf-8") as f:
+        for key in sorted(stacks, key=stacks.get, reverse=True):
+            f.write(f"{key} {stacks[key]}\n")
+
+    # Samples per function: where the stack was (self) and anywhere on it (total)
+    own = {}
+    total = {}
+    for key in stacks:
+        frames = key.split(";")
+        own[frames[-1]] = own.get(frames[-1], 0) + stacks[key]
+        for name in set(frames):
+            total[name] = total.get(name, 0) + stacks[key]
+
+    count = max(sampler['samples'], 1)
+    lines = [f"Sampled profile of {profile['name']}: {sampler['samples']} samples "
+             f"every {SAMPLE_INTERVAL * 1000:.0f} ms",
+             "", "{:>7} {:>7}  {}".format("self%", "total%", "function")]
+    for name in sorted(own, key=own.get, reverse=True)[:profile['top']]:
+        lines.append("{:>6.1f}% {:>6.1f}%  {}".format(100 * own[name] / count, 100 * total[name] / count, name))
+    with open(text_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return [folded_path, text_path]
+
+def _write_memory(profile):
+    """Write the final snapshot and the checkpoint summary"""
+    import tracemalloc
+
+    memory = profile['memory']
+    snapshot = _take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    snapshot_path = profile['base_path'] + ".tracemalloc"
+    text_path = profile['base_path'] + "-memory.txt"
+    snapshot.dump(snapshot_path)
+
+    lines = [f"Memory profile of {profile['name']}: {current / 1024:.1f} KiB traced at exit, "
+             f"peak {peak / 1024:.1f} KiB", "", "Checkpoints:"]
+    for entry in memory['checkpoints']:
+        lines.append(f"  {entry['seconds']:8.3f}s {entry['label']:<16} current {entry['current'] / 1024:9.1f} KiB"
+                     f"  peak {entry['peak'] / 1024:9.1f} KiB")
+        for growth in entry['growth']:
+            lines.append(f"      + {growth}")
+
+    lines.append("")
+    lines.append(f"Top {profile['top']} allocation sites at exit:")
+    for stat in snapshot.statistics("lineno")[:profile['top']]:
+        lines.append(f"  {stat}")
+    with open(text_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return [snapshot_path, text_path]
@@ -12,12 +12,20 @@ AI Usage: I defined the module structure, all required function signatures,
           exception handling throughout.
 """
 
+import base64
+import zlib
+from bisect import bisect_left, bisect_right
+
+import event_bus
+import renderer
+
 from custom_exceptions import (
     QuestNotFoundError,
     QuestRequirementsNotMetError,
     QuestAlreadyCompletedError,
     QuestNotActiveError,
-    InsufficientLevelError
+    InsufficientLevelError,
+    InvalidDataFormatError
 )
 
 # ============================================================================
@@ -57,6 +65,7 @@ def accept_quest(character, quest_id, quest_data_dict):
         raise QuestNotFoundError(f"Quest ID '{quest_id}' not found.")
         
     quest = quest_data_dict[quest_id]
+    index = get_available_index(character, quest_data_dict)
     
     # Check not already completed
     if is_quest_completed(character, quest_id):
@@ -76,11 +85,15 @@ def accept_quest(character, quest_id, quest_data_dict):
     if prereq_id and prereq_id != "NONE":
         if not is_quest_completed(character, prereq_id):
             raise QuestRequirementsNotMetError(f"Prerequisite quest '{prereq_id}' must be completed first.")
-            
+
     # Add to character['active_quests']
     if 'active_quests' not in character:
         character['active_quests'] = []
     character['active_quests'].append(quest_id)
+
+    if index is not None:
+        index['available'].discard(quest_id)
+        _mark_active(index, quest_id, True)
     
     return True
 
@@ -95,28 +108,25 @@ def complete_quest(character, quest_id, quest_data_dict):
         raise QuestNotFoundError(f"Quest ID '{quest_id}' not found.")
         
     quest = quest_data_dict[quest_id]
+    index = get_available_index(character, quest_data_dict)
     
     # Check quest is active
     if not is_quest_active(character, quest_id):
         raise QuestNotActiveError(f"Quest '{quest_id}' is not currently active.")
+
+    stats = _current_quest_stats(character)
         
-    # Remove from active_quests
-    new_active_quests = []
-    removed = False
-    i = 0
-    while i < len(character['active_quests']):
-        current_quest = character['active_quests'][i]
-        if current_quest == quest_id and not removed:
-            removed = True
-        else:
-            new_active_quests.append(current_quest)
-        i += 1
-    character['active_quests'] = new_active_quests
+    # Remove from active_quests, in place so indexes keep tracking the list
+    character['active_quests'].remove(quest_id)
+    character.get('quest_progress', {}).pop(quest_id, None)
         
     # Add to completed_quests
     if 'completed_quests' not in character:
         character['completed_quests'] = []
     character['completed_quests'].append(quest_id)
+
+    if index is not None:
+        _unlock_after_completion(index, quest_id)
     
     # Grant rewards (using the correctly named functions)
     reward_xp = int(quest.get('reward_xp', 0))
@@ -124,6 +134,11 @@ def complete_quest(character, quest_id, quest_data_dict):
     
     gain_experience(character, reward_xp)
     add_gold(character, reward_gold)
+
+    if stats is not None:
+        stats['total_xp'] += reward_xp
+        stats['total_gold'] += reward_gold
+        stats['completed'] += 1
     
     # Return reward summary
     return {
@@ -140,19 +155,18 @@ def abandon_quest(character, quest_id):
     """
     if not is_quest_active(character, quest_id):
         raise QuestNotActiveError(f"Quest '{quest_id}' is not currently active and cannot be abandoned.")
+
+    index = _current_available_index(character)
         
-    # Remove from active_quests
-    new_active_quests = []
-    removed = False
-    i = 0
-    while i < len(character['active_quests']):
-        current_quest = character['active_quests'][i]
-        if current_quest == quest_id and not removed:
-            removed = True
-        else:
-            new_active_quests.append(current_quest)
-        i += 1
-    character['active_quests'] = new_active_quests
+    # Remove from active_quests, in place so indexes keep tracking the list
+    character['active_quests'].remove(quest_id)
+    character.get('quest_progress', {}).pop(quest_id, None)
+
+    # It was accepted before, so it meets its requirements again
+    if index is not None:
+        _mark_active(index, quest_id, False)
+        if quest_id in index['graph']['position']:
+            index['available'].add(quest_id)
     
     return True
 
@@ -195,21 +209,334 @@ def get_available_quests(character, quest_data_dict):
     Get quests that character can currently accept
     
     Available = meets level req + prerequisite done + not completed + not active
+    
+    Reads the character's availability index, which is kept up to date
+    as quests are accepted, completed and abandoned and as the character
+    levels up. Quests are returned in catalog order.
     """
+    index = get_available_index(character, quest_data_dict)
+    position = index['graph']['position']
+
+    available_ids = sorted(index['available'], key=position.get)
+
     available_list = []
-    all_quest_ids = list(quest_data_dict.keys())
-    
     i = 0
-    while i < len(all_quest_ids):
-        quest_id = all_quest_ids[i]
-        
-        # Filter all quests by requirements
-        if can_accept_quest(character, quest_id, quest_data_dict):
-            available_list.append(quest_data_dict[quest_id])
+    while i < len(available_ids):
+        available_list.append(quest_data_dict[available_ids[i]])
         i += 1
         
     return available_list
 
+# ============================================================================
+# AVAILABILITY INDEX
+# ============================================================================
+
+def build_available_index(character, quest_data_dict):
+    """
+    Build the per-character index of acceptable quests from scratch
+    
+    The index holds:
+        'available': quest IDs the character can accept right now
+        'waiting': {required_level: [quest IDs]} with prerequisites done
+                   but the level still too low
+        'active_bits' / 'completed_bits': bitsets (bit = catalog position)
+                   mirroring the character's quest lists
+        'extra_active' / 'extra_completed': IDs in those lists that are
+                   not in the catalog
+        'active_list' / 'completed_list': the quest lists it was synced to
+        'active_count' / 'completed_count': their lengths when last synced
+        'watch': {(event_type, key): [active quest IDs with that objective]}
+        'level': the character level the index was last synced to
+        'graph': the quest graph it was built against
+    
+    Returns: The new index (also stored in character['quest_index'])
+    """
+    graph = get_quest_graph(quest_data_dict)
+    active_list = character.setdefault('active_quests', [])
+    completed_list = character.setdefault('completed_quests', [])
+
+    active_bits, extra_active = quest_ids_to_bits(active_list, graph)
+    completed_bits, extra_completed = quest_ids_to_bits(completed_list, graph)
+
+    index = {
+        'graph': graph,
+        'level': character.get('level', 1),
+        'active_bits': active_bits,
+        'completed_bits': completed_bits,
+        'extra_active': extra_active,
+        'extra_completed': extra_completed,
+        'active_list': active_list,
+        'completed_list': completed_list,
+        'active_count': len(active_list),
+        'completed_count': len(completed_list),
+        'available': set(),
+        'waiting': {},
+        'watch': {},
+    }
+
+    i = 0
+    while i < len(active_list):
+        _watch_objective(index, active_list[i], True)
+        i += 1
+
+    position = graph['position']
+    taken_bits = active_bits | completed_bits
+
+    for quest_id in quest_data_dict:
+        if (taken_bits >> position[quest_id]) & 1:
+            continue
+        if _prerequisite_met(index, quest_id):
+            _add_candidate(index, quest_id)
+
+    character['quest_index'] = index
+    return index
+
+def get_available_index(character, quest_data_dict):
+    """
+    Get the character's availability index, syncing it first
+    
+    A level-up only moves the quests waiting on the levels gained. The
+    index is rebuilt when the catalog changes, the level goes down, or
+    the quest lists were changed outside this module (e.g. a new save).
+    """
+    graph = get_quest_graph(quest_data_dict)
+    index = _current_available_index(character)
+    level = character.get('level', 1)
+
+    if index is None or index['graph'] is not graph or level < index['level']:
+        return build_available_index(character, quest_data_dict)
+
+    if level > index['level']:
+        _unlock_levels(index, level)
+
+    return index
+
+def _current_available_index(character):
+    """Return the character's index if it still matches their quest lists, else None"""
+    index = character.get('quest_index')
+    if index is None:
+        return None
+
+    # A list replaced by another, even of the same length, means a rebuild
+    active_list = character.get('active_quests')
+    completed_list = character.get('completed_quests')
+    if (active_list is not index['active_list'] or completed_list is not index['completed_list']
+            or index['active_count'] != len(active_list)
+            or index['completed_count'] != len(completed_list)):
+        character['quest_index'] = None
+        return None
+
+    return index
+
+def _prerequisite_met(index, quest_id):
+    """Check a quest's prerequisite against the index's completion bits"""
+    graph = index['graph']
+    prereq_id = graph['prerequisite'][quest_id]
+    if prereq_id is None:
+        # Unknown prerequisites only count if somehow already completed
+        missing_id = graph['missing'].get(quest_id)
+        return missing_id is None or missing_id in index['extra_completed']
+    return (index['completed_bits'] >> graph['position'][prereq_id]) & 1 == 1
+
+def _add_candidate(index, quest_id):
+    """File a quest whose prerequisite is done as available or waiting on level"""
+    required_level = index['graph']['required_level'][quest_id]
+    if index['level'] >= required_level:
+        index['available'].add(quest_id)
+    else:
+        index['waiting'].setdefault(required_level, []).append(quest_id)
+
+def _unlock_levels(index, new_level):
+    """Move quests waiting on levels up to new_level into the available set"""
+    waiting = index['waiting']
+    old_level = index['level']
+
+    # Visit whichever is smaller: the levels gained or the waiting buckets
+    if new_level - old_level <= len(waiting):
+        levels = range(old_level + 1, new_level + 1)
+    else:
+        levels = [lvl for lvl in waiting if old_level < lvl <= new_level]
+
+    for level in levels:
+        quest_ids = waiting.pop(level, None)
+        if quest_ids:
+            index['available'].update(quest_ids)
+
+    index['level'] = new_level
+
+def _mark_active(index, quest_id, active):
+    """Set or clear a quest's bit in the active bitset"""
+    pos = index['graph']['position'].get(quest_id)
+    if active:
+        if pos is None:
+            index['extra_active'].add(quest_id)
+        else:
+            index['active_bits'] |= 1 << pos
+        index['active_count'] += 1
+    else:
+        if pos is None:
+            index['extra_active'].discard(quest_id)
+        else:
+            index['active_bits'] &= ~(1 << pos)
+        index['active_count'] -= 1
+    _watch_objective(index, quest_id, active)
+
+def _watch_objective(index, quest_id, active):
+    """Add or remove an active quest from the objective lookup"""
+    objective = index['graph']['objectives'].get(quest_id)
+    if objective is None:
+        return
+
+    event_type, keys, count = objective
+    watch = index['watch']
+    i = 0
+    while i < len(keys):
+        watch_key = (event_type, keys[i])
+        if active:
+            watch.setdefault(watch_key, []).append(quest_id)
+        else:
+            quest_ids = watch.get(watch_key, [])
+            if quest_id in quest_ids:
+                quest_ids.remove(quest_id)
+            if not quest_ids:
+                watch.pop(watch_key, None)
+        i += 1
+
+def _unlock_after_completion(index, quest_id):
+    """Record a completion and file the quests it unlocks"""
+    graph = index['graph']
+    position = graph['position']
+
+    _mark_active(index, quest_id, False)
+    index['completed_bits'] |= 1 << position[quest_id]
+    index['completed_count'] += 1
+
+    taken_bits = index['active_bits'] | index['completed_bits']
+    unlocked = graph['unlocks'].get(quest_id, [])
+    i = 0
+    while i < len(unlocked):
+        child_id = unlocked[i]
+        if not (taken_bits >> position[child_id]) & 1:
+            _add_candidate(index, child_id)
+        i += 1
+
+# ============================================================================
+# QUEST BITSETS
+# ============================================================================
+
+def quest_ids_to_bits(quest_ids, graph):
+    """
+    Convert quest IDs to a bitset over the quest positions of a graph (or
+    of a quest bit registry, see character_manager)
+    
+    Returns: Tuple of (bitset int, set of IDs not in the catalog)
+    """
+    position = graph['position']
+    bits = 0
+    extra = set()
+    i = 0
+    while i < len(quest_ids):
+        pos = position.get(quest_ids[i])
+        if pos is None:
+            extra.add(quest_ids[i])
+        else:
+            bits |= 1 << pos
+        i += 1
+    return (bits, extra)
+
+def bits_to_quest_ids(bits, graph):
+    """
+    Convert a bitset back into quest IDs, in position order
+    """
+    ids = graph['ids']
+    quest_ids = []
+    pos = 0
+    while bits:
+        # Skip whole runs of unset low bits at once
+        low_bit = bits & -bits
+        step = low_bit.bit_length() - 1
+        pos += step
+        quest_ids.append(ids[pos])
+        bits >>= step + 1
+        pos += 1
+    return quest_ids
+
+def encode_quest_bits(bits):
+    """
+    Encode a quest bitset as a short save-file string
+    
+    Uses whichever is smaller: the raw bitset ("B:") or the gaps between
+    set bits as varints ("V:"), both base64 encoded. Sparse sets in a
+    large catalog stay small with varints; dense sets stay small as bits.
+    """
+    raw = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+
+    gaps = bytearray()
+    last = -1
+    pos = 0
+    remaining = bits
+    while remaining:
+        low_bit = remaining & -remaining
+        step = low_bit.bit_length() - 1
+        pos += step
+        gap = pos - last - 1
+        last = pos
+        # Unsigned LEB128 varint
+        while gap >= 0x80:
+            gaps.append((gap & 0x7F) | 0x80)
+            gap >>= 7
+        gaps.append(gap)
+        remaining >>= step + 1
+        pos += 1
+
+    if len(gaps) < len(raw):
+        return "V:" + base64.b64encode(bytes(gaps)).decode("ascii")
+    return "B:" + base64.b64encode(raw).decode("ascii")
+
+def decode_quest_bits(text):
+    """
+    Decode a string made by encode_quest_bits back into a bitset
+    
+    Raises: InvalidDataFormatError if the string is malformed
+    """
+    try:
+        kind, payload = text.split(":", 1)
+        data = base64.b64decode(payload.encode("ascii"), validate=True)
+    except Exception as e:
+        raise InvalidDataFormatError(f"Invalid quest bitset '{text}': {e}")
+
+    if kind == "B":
+        return int.from_bytes(data, 'little')
+
+    if kind != "V":
+        raise InvalidDataFormatError(f"Unknown quest bitset encoding '{kind}'")
+
+    bits = 0
+    pos = -1
+    gap = 0
+    shift = 0
+    i = 0
+    while i < len(data):
+        byte = data[i]
+        gap |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            pos += gap + 1
+            bits |= 1 << pos
+            gap = 0
+            shift = 0
+        i += 1
+    if shift:
+        raise InvalidDataFormatError(f"Truncated quest bitset '{text}'")
+    return bits
+
+def is_save_bitset(text):
+    """
+    Check if a saved quest field uses the bitset encoding
+    """
+    return text.startswith("B:") or text.startswith("V:")
+
 # ============================================================================
 # QUEST TRACKING
 # ============================================================================
@@ -217,13 +544,29 @@ def get_available_quests(character, quest_data_dict):
 def is_quest_completed(character, quest_id):
     """
     Check if a specific quest has been completed
+    
+    Uses the character's completion bitset when an index is in step.
     """
+    index = _current_available_index(character)
+    if index is not None:
+        pos = index['graph']['position'].get(quest_id)
+        if pos is not None:
+            return (index['completed_bits'] >> pos) & 1 == 1
+        return quest_id in index['extra_completed']
     return quest_id in character.get('completed_quests', [])
 
 def is_quest_active(character, quest_id):
     """
     Check if a specific quest is currently active
+    
+    Uses the character's active bitset when an index is in step.
     """
+    index = _current_available_index(character)
+    if index is not None:
+        pos = index['graph']['position'].get(quest_id)
+        if pos is not None:
+            return (index['active_bits'] >> pos) & 1 == 1
+        return quest_id in index['extra_active']
     return quest_id in character.get('active_quests', [])
 
 def can_accept_quest(character, quest_id, quest_data_dict):
@@ -263,34 +606,199 @@ def get_quest_prerequisite_chain(quest_id, quest_data_dict):
     """
     Get the full chain of prerequisites for a quest
     
+    Uses the catalog's prerequisite graph (see get_quest_graph), so the
+    chain is read from precomputed links and memoized per quest.
+    
+    Returns: List [earliest_prereq, ..., quest_id]. If the earliest link
+             points at a quest that doesn't exist, the list starts with
+             "INVALID_PREREQUISITE" followed by the missing ID.
+    
     Raises: QuestNotFoundError if quest doesn't exist
+            InvalidDataFormatError if the prerequisites form a cycle
     """
     if quest_id not in quest_data_dict:
         raise QuestNotFoundError(f"Quest ID '{quest_id}' not found.")
 
-    chain = []
+    graph = get_quest_graph(quest_data_dict)
+    chains = graph['chains']
+
+    if quest_id in chains:
+        return list(chains[quest_id])
+
+    # Follow prerequisite links backwards until a root or a memoized chain
+    path = []
     current_id = quest_id
-    
-    # Follow prerequisite links backwards
-    while current_id and current_id != "NONE":
-        chain.append(current_id)
-        
-        # Check if the current ID is actually in the dictionary
-        if current_id not in quest_data_dict:
+    while current_id is not None and current_id not in chains:
+        path.append(current_id)
+        current_id = graph['prerequisite'][current_id]
+
+    if current_id is not None:
+        chain = list(chains[current_id])
+    else:
+        chain = []
+        root_id = path[-1]
+        if root_id in graph['missing']:
             # Found a break in the chain (a prereq that doesn't exist)
             chain.append("INVALID_PREREQUISITE")
-            break
+            chain.append(graph['missing'][root_id])
 
-        current_id = quest_data_dict[current_id].get('prerequisite', 'NONE')
-
-    # Build list in reverse order [earliest_prereq, ..., quest_id]
-    reversed_chain = []
-    i = len(chain) - 1
+    # Build list in order [earliest_prereq, ..., quest_id]
+    i = len(path) - 1
     while i >= 0:
-        reversed_chain.append(chain[i])
+        chain.append(path[i])
         i -= 1
-        
-    return reversed_chain
+
+    chains[quest_id] = chain
+    return list(chain)
+
+# ============================================================================
+# QUEST GRAPH
+# ============================================================================
+
+# Graph for the most recently used quest catalog (catalogs are read-only after loading)
+_quest_graph_cache = {'catalog': None, 'size': 0, 'graph': None}
+
+def build_quest_graph(quest_data_dict):
+    """
+    Build the prerequisite graph for a quest catalog
+    
+    Runs in time linear in the number of quests and should be called
+    once per catalog load; get_quest_graph reuses the result.
+    
+    Returns: Dictionary with:
+        'prerequisite': {quest_id: prereq_id, or None for a root}
+        'unlocks': {quest_id: [quests that list it as prerequisite]}
+        'missing': {quest_id: prereq_id} for prerequisites not in the catalog
+        'ids': quest IDs in catalog order (position -> ID)
+        'fingerprint': short catalog identity (in saves from before the
+                       quest bit registry, see character_manager)
+        'position': {quest_id: index in catalog order}
+        'required_level': {quest_id: required level as an int}
+        'objectives': {quest_id: (event_type, keys, count)} (see parse_quest_objective)
+        'by_level': quest IDs sorted by (required_level, position)
+        'levels': required levels matching 'by_level', for bisect
+        'order': quest IDs in topological order (prerequisites first)
+        'depth': {quest_id: number of prerequisites above it}
+        'chains': memoized prerequisite chains (filled on demand)
+    
+    Raises: InvalidDataFormatError if the prerequisites form a cycle
+    """
+    prerequisite = {}
+    unlocks = {}
+    missing = {}
+    position = {}
+    required_level = {}
+    objectives = {}
+    roots = []
+
+    for quest_id in quest_data_dict:
+        unlocks[quest_id] = []
+        position[quest_id] = len(position)
+        required_level[quest_id] = int(quest_data_dict[quest_id].get('required_level', 1))
+        objective = quest_data_dict[quest_id].get('objective')
+        if objective and objective != "NONE":
+            objectives[quest_id] = parse_quest_objective(objective)
+
+    # Link each quest to its prerequisite
+    for quest_id in quest_data_dict:
+        prereq_id = quest_data_dict[quest_id].get('prerequisite', 'NONE')
+        if not prereq_id or prereq_id == "NONE":
+            prerequisite[quest_id] = None
+            roots.append(quest_id)
+        elif prereq_id not in quest_data_dict:
+            prerequisite[quest_id] = None
+            missing[quest_id] = prereq_id
+            roots.append(quest_id)
+        else:
+            prerequisite[quest_id] = prereq_id
+            unlocks[prereq_id].append(quest_id)
+
+    # Walk down from the roots; anything never reached sits on a cycle
+    order = []
+    depth = {}
+    i = 0
+    while i < len(roots):
+        depth[roots[i]] = 0
+        order.append(roots[i])
+        i += 1
+
+    i = 0
+    while i < len(order):
+        quest_id = order[i]
+        children = unlocks[quest_id]
+        j = 0
+        while j < len(children):
+            depth[children[j]] = depth[quest_id] + 1
+            order.append(children[j])
+            j += 1
+        i += 1
+
+    if len(order) < len(quest_data_dict):
+        raise InvalidDataFormatError(f"Quest prerequisites form a cycle: {' -> '.join(_find_prerequisite_cycle(prerequisite, depth))}")
+
+    # Sort by level once so level range queries can bisect; the sort is
+    # stable, so quests on the same level keep catalog order
+    by_level = sorted(quest_data_dict, key=required_level.get)
+    levels = [required_level[quest_id] for quest_id in by_level]
+
+    catalog_text = "\n".join(position)
+
+    return {
+        'prerequisite': prerequisite,
+        'unlocks': unlocks,
+        'missing': missing,
+        'ids': list(quest_data_dict),
+        'fingerprint': f"{len(position)}:{zlib.crc32(catalog_text.encode('utf-8')):08x}",
+        'position': position,
+        'required_level': required_level,
+        'objectives': objectives,
+        'by_level': by_level,
+        'levels': levels,
+        'order': order,
+        'depth': depth,
+        'chains': {},
+    }
+
+def _find_prerequisite_cycle(prerequisite, reached):
+    """Return the quest IDs of one prerequisite cycle, starting and ending on the same quest"""
+    for quest_id in prerequisite:
+        if quest_id in reached:
+            continue
+
+        # Every unreached quest leads into a cycle; walk until a quest repeats
+        seen = {}
+        current_id = quest_id
+        while current_id not in seen:
+            seen[current_id] = len(seen)
+            current_id = prerequisite[current_id]
+
+        walk = list(seen)
+        return walk[seen[current_id]:] + [current_id]
+    return []
+
+def get_quest_graph(quest_data_dict):
+    """
+    Get the prerequisite graph for a catalog, building it only when the
+    catalog differs from the last one used
+    
+    Raises: InvalidDataFormatError if the prerequisites form a cycle
+    """
+    cache = _quest_graph_cache
+    if cache['catalog'] is not quest_data_dict or cache['size'] != len(quest_data_dict):
+        cache['graph'] = build_quest_graph(quest_data_dict)
+        cache['catalog'] = quest_data_dict
+        cache['size'] = len(quest_data_dict)
+    return cache['graph']
+
+def get_quest_depth(quest_id, quest_data_dict):
+    """
+    Get how many prerequisites sit above a quest
+    
+    Raises: QuestNotFoundError if quest doesn't exist
+    """
+    if quest_id not in quest_data_dict:
+        raise QuestNotFoundError(f"Quest ID '{quest_id}' not found.")
+    return get_quest_graph(quest_data_dict)['depth'][quest_id]
 
 # ============================================================================
 # QUEST STATISTICS
@@ -305,7 +813,7 @@ def get_quest_completion_percentage(character, quest_data_dict):
     if total_quests == 0:
         return 0.0
         
-    completed_quests = len(character.get('completed_quests', []))
+    completed_quests = get_quest_stats(character, quest_data_dict)['completed']
     
     # percentage = (completed / total) * 100
     percentage = (float(completed_quests) / total_quests) * 100
@@ -315,51 +823,263 @@ def get_quest_completion_percentage(character, quest_data_dict):
 def get_total_quest_rewards_earned(character, quest_data_dict):
     """
     Calculate total XP and gold earned from completed quests
+    
+    Reads the character's running totals (see get_quest_stats).
+    """
+    stats = get_quest_stats(character, quest_data_dict)
+
+    # Returns: Dictionary with 'total_xp' and 'total_gold'
+    return {
+        'total_xp': stats['total_xp'],
+        'total_gold': stats['total_gold']
+    }
+
+def rebuild_quest_stats(character, quest_data_dict):
+    """
+    Recompute the character's quest totals from their completed quests
+    
+    Returns: The new stats (also stored in character['quest_stats']):
+        'total_xp' / 'total_gold': rewards earned from completed quests
+        'completed': number of completed quests counted
     """
     total_xp = 0
     total_gold = 0
-    completed_list = character.get('completed_quests', [])
+    completed_list = character.setdefault('completed_quests', [])
     
     # Sum up reward_xp and reward_gold for all completed quests
     i = 0
     while i < len(completed_list):
-        quest_id = completed_list[i]
-        quest = quest_data_dict.get(quest_id)
-        
+        quest = quest_data_dict.get(completed_list[i])
         if quest:
             total_xp += int(quest.get('reward_xp', 0))
             total_gold += int(quest.get('reward_gold', 0))
         i += 1
-        
-    # Returns: Dictionary with 'total_xp' and 'total_gold'
-    return {
+
+    stats = {
         'total_xp': total_xp,
-        'total_gold': total_gold
+        'total_gold': total_gold,
+        'completed': len(completed_list),
     }
+    character['quest_stats'] = stats
+    character['quest_stats_list'] = completed_list
+    return stats
 
-def get_quests_by_level(quest_data_dict, min_level, max_level):
+def get_quest_stats(character, quest_data_dict):
     """
-    Get all quests within a level range
+    Get the character's running quest totals, rebuilding them if stale
+    
+    complete_quest keeps the totals up to date, so this is O(1) unless
+    the completed list was changed some other way.
+    """
+    stats = _current_quest_stats(character)
+    if stats is None:
+        return rebuild_quest_stats(character, quest_data_dict)
+    return stats
+
+def verify_quest_stats(character, quest_data_dict):
     """
-    min_level = int(min_level)
-    max_level = int(max_level)
+    Check the running totals against a full rebuild from quest history
     
-    filtered_quests = []
-    all_quest_ids = list(quest_data_dict.keys())
+    The character is left with the rebuilt totals either way.
     
-    # Filter all quests by required_level
+    Returns: True if the stored totals matched, False otherwise
+    """
+    stored = character.get('quest_stats')
+    rebuilt = rebuild_quest_stats(character, quest_data_dict)
+    return stored == rebuilt
+
+def _current_quest_stats(character):
+    """Return the character's quest stats if they match their completed list, else None"""
+    stats = character.get('quest_stats')
+    completed_list = character.get('completed_quests')
+    # character['quest_stats_list'] is the list the totals were counted from
+    if (stats is None or character.get('quest_stats_list') is not completed_list
+            or stats['completed'] != len(completed_list or [])):
+        return None
+    return stats
+
+# ============================================================================
+# QUEST OBJECTIVES
+# ============================================================================
+
+# Handler currently subscribed to the event bus, and the keys it is on
+_objective_subscription = {'handler': None, 'keys': []}
+
+def parse_quest_objective(objective):
+    """
+    Parse an objective string: "event_type:key[|key...]:count"
+    
+    e.g. "enemy_defeated:goblin:3" or "item_purchased:weapon|armor:1"
+    
+    Returns: Tuple of (event_type, tuple of keys, count)
+    Raises: InvalidDataFormatError if the objective is malformed
+    """
+    parts = str(objective).split(":")
+    if len(parts) != 3:
+        raise InvalidDataFormatError(f"Invalid quest objective '{objective}': expected 'event:key:count'")
+
+    event_type = parts[0].strip().lower()
+    keys = tuple(key.strip().lower() for key in parts[1].split("|") if key.strip())
+    if event_type not in event_bus.EVENT_TYPES or not keys:
+        raise InvalidDataFormatError(f"Invalid quest objective '{objective}'")
+
+    try:
+        count = int(parts[2])
+    except ValueError:
+        raise InvalidDataFormatError(f"Invalid quest objective count in '{objective}'")
+    if count < 1:
+        raise InvalidDataFormatError(f"Quest objective count must be at least 1 in '{objective}'")
+
+    return (event_type, keys, count)
+
+def register_quest_objectives(quest_data_dict):
+    """
+    Subscribe quest objective tracking to the event bus
+    
+    Subscribes once per (event type, key) used by any objective in the
+    catalog, replacing any earlier registration. Call after loading quests.
+    """
+    unregister_quest_objectives()
+
+    def handler(character, event_type, key, amount):
+        return record_objective_event(character, quest_data_dict, event_type, key, amount)
+
+    objectives = get_quest_graph(quest_data_dict)['objectives']
+    keys = []
+    for quest_id in objectives:
+        event_type, objective_keys, count = objectives[quest_id]
+        i = 0
+        while i < len(objective_keys):
+            watch_key = (event_type, objective_keys[i])
+            if watch_key not in keys:
+                event_bus.subscribe(event_type, objective_keys[i], handler)
+                keys.append(watch_key)
+            i += 1
+
+    _objective_subscription['handler'] = handler
+    _objective_subscription['keys'] = keys
+
+def unregister_quest_objectives():
+    """
+    Remove the objective tracking subscriptions, if any
+    """
+    handler = _objective_subscription['handler']
+    keys = _objective_subscription['keys']
     i = 0
-    while i < len(all_quest_ids):
-        quest_id = all_quest_ids[i]
-        quest = quest_data_dict[quest_id]
-        required_level = int(quest.get('required_level', 1))
-        
-        if required_level >= min_level and required_level <= max_level:
-            filtered_quests.append(quest)
+    while i < len(keys):
+        event_bus.unsubscribe(keys[i][0], keys[i][1], handler)
+        i += 1
+    _objective_subscription['handler'] = None
+    _objective_subscription['keys'] = []
+
+def record_objective_event(character, quest_data_dict, event_type, key, amount=1):
+    """
+    Count an event toward the character's active quest objectives
+    
+    Only the active quests watching this (event type, key) are touched.
+    key may be a tuple of keys for one event, as from emit_item_event.
+    Counters live in character['quest_progress'] as {quest_id: count}.
+    
+    Returns: List of quest IDs whose objective was completed by this event
+    """
+    index = get_available_index(character, quest_data_dict)
+    if isinstance(key, tuple):
+        # One item event under several keys: count each quest once
+        quest_ids = []
+        i = 0
+        while i < len(key):
+            for quest_id in index['watch'].get((event_type, key[i]), []):
+                if quest_id not in quest_ids:
+                    quest_ids.append(quest_id)
+            i += 1
+    else:
+        quest_ids = index['watch'].get((event_type, key))
+    if not quest_ids:
+        return []
+
+    objectives = index['graph']['objectives']
+    progress = character.setdefault('quest_progress', {})
+    finished = []
+    i = 0
+    while i < len(quest_ids):
+        quest_id = quest_ids[i]
+        required = objectives[quest_id][2]
+        before = progress.get(quest_id, 0)
+        if before < required:
+            progress[quest_id] = min(required, before + amount)
+            if progress[quest_id] == required:
+                finished.append(quest_id)
+        i += 1
+
+    return finished
+
+def get_objective_progress(character, quest_id, quest_data_dict):
+    """
+    Get how far the character is through a quest's objective
+    
+    Returns: Tuple of (count, required), or None if the quest has no objective
+    """
+    objective = get_quest_graph(quest_data_dict)['objectives'].get(quest_id)
+    if objective is None:
+        return None
+    return (character.get('quest_progress', {}).get(quest_id, 0), objective[2])
+
+def is_objective_complete(character, quest_id, quest_data_dict):
+    """
+    Check if a quest's objective is done (quests without one always are)
+    """
+    progress = get_objective_progress(character, quest_id, quest_data_dict)
+    return progress is None or progress[0] >= progress[1]
+
+def get_quests_by_level(quest_data_dict, min_level, max_level):
+    """
+    Get all quests within a level range
+    
+    Uses the quest graph's level-sorted index, so only the matching
+    quests are visited. Results are ordered by required level.
+    """
+    graph = get_quest_graph(quest_data_dict)
+    by_level = graph['by_level']
+    levels = graph['levels']
+
+    start = bisect_left(levels, int(min_level))
+    end = bisect_right(levels, int(max_level))
+
+    filtered_quests = []
+    i = start
+    while i < end:
+        filtered_quests.append(quest_data_dict[by_level[i]])
         i += 1
         
     return filtered_quests
 
+def get_quests_unlocking_at_level(character, quest_data_dict, level):
+    """
+    Get the quests the character could accept once they reach a level
+    
+    Only quests requiring exactly that level, with their prerequisite
+    completed and not already active or completed, are returned.
+    """
+    index = get_available_index(character, quest_data_dict)
+    graph = index['graph']
+    position = graph['position']
+    by_level = graph['by_level']
+    levels = graph['levels']
+    taken_bits = index['active_bits'] | index['completed_bits']
+
+    level = int(level)
+    end = bisect_right(levels, level)
+
+    unlocking = []
+    i = bisect_left(levels, level)
+    while i < end:
+        quest_id = by_level[i]
+        if not (taken_bits >> position[quest_id]) & 1 and _prerequisite_met(index, quest_id):
+            unlocking.append(quest_data_dict[quest_id])
+        i += 1
+
+    return unlocking
+
 # ============================================================================
 # DISPLAY FUNCTIONS
 # ============================================================================
@@ -368,35 +1088,40 @@ def display_quest_info(quest_data):
     """
     Display formatted quest information
     """
-    print(f"\n=== {quest_data.get('title', 'N/A')} ===")
-    print(f"ID: {quest_data.get('quest_id', 'N/A')}")
-    print(f"Description: {quest_data.get('description', 'No description.')}")
-    
-    # Rewards
     xp = quest_data.get('reward_xp', 0)
     gold = quest_data.get('reward_gold', 0)
-    print(f"Rewards: {xp} XP, {gold} Gold")
-    
-    # Requirements
     req_level = quest_data.get('required_level', 1)
     prereq = quest_data.get('prerequisite', 'NONE')
-    print(f"Requirements: Level {req_level}")
-    if prereq and prereq != "NONE":
-        print(f"Prerequisite: {prereq}")
-    else:
-        print("Prerequisite: None")
+    has_prereq = prereq and prereq != "NONE"
+
+    lines = [
+        f"\n=== {quest_data.get('title', 'N/A')} ===",
+        f"ID: {quest_data.get('quest_id', 'N/A')}",
+        f"Description: {quest_data.get('description', 'No description.')}",
+        f"Rewards: {xp} XP, {gold} Gold",
+        f"Requirements: Level {req_level}",
+        f"Prerequisite: {prereq}" if has_prereq else "Prerequisite: None",
+    ]
+    renderer.show("quest_info", "\n".join(lines),
+                  quest_id=quest_data.get('quest_id'), title=quest_data.get('title'),
+                  reward_xp=xp, reward_gold=gold, required_level=req_level,
+                  prerequisite=prereq if has_prereq else None)
         
 def display_quest_list(quest_list):
     """
     Display a list of quests in summary format
     """
     if not quest_list:
-        print("No quests to display.")
+        renderer.show("quest_list", "No quests to display.", quests=[])
+        return
+    if not renderer.enabled():
         return
-        
-    print("\n| {:<20} | {:<5} | {:<5} | {:<5} |".format("Title", "Level", "XP", "Gold"))
-    print("-" * 43)
 
+    lines = [
+        "\n| {:<20} | {:<5} | {:<5} | {:<5} |".format("Title", "Level", "XP", "Gold"),
+        "-" * 43,
+    ]
+    quest_ids = []
     i = 0
     while i < len(quest_list):
         quest = quest_list[i]
@@ -405,26 +1130,61 @@ def display_quest_list(quest_list):
         reward_xp = quest.get('reward_xp', 0)
         reward_gold = quest.get('reward_gold', 0)
         
-        print("| {:<20} | {:<5} | {:<5} | {:<5} |".format(
+        lines.append("| {:<20} | {:<5} | {:<5} | {:<5} |".format(
             title, req_level, reward_xp, reward_gold
         ))
+        quest_ids.append(quest.get('quest_id'))
+        i += 1
+
+    renderer.show("quest_list", "\n".join(lines), quests=quest_ids)
+
+
+def display_objective_progress(character, quest_data_dict):
+    """
+    Display objective progress for the character's active quests
+    """
+    active_list = character.get('active_quests', [])
+    i = 0
+    while i < len(active_list):
+        progress = get_objective_progress(character, active_list[i], quest_data_dict)
+        if progress is not None:
+            status = "DONE" if progress[0] >= progress[1] else f"{progress[0]}/{progress[1]}"
+            renderer.show("objective_progress", f"  {active_list[i]}: {status}",
+                          quest_id=active_list[i], count=progress[0], required=progress[1])
         i += 1
 
+def display_level_up_preview(character, quest_data_dict):
+    """
+    Display the quests that unlock at the character's next level
+    """
+    next_level = character.get('level', 1) + 1
+    upcoming = get_quests_unlocking_at_level(character, quest_data_dict, next_level)
+    if not upcoming:
+        return
+
+    renderer.line(f"\nQuests unlocking at level {next_level}:")
+    display_quest_list(upcoming)
 
 def display_character_quest_progress(character, quest_data_dict):
     """
     Display character's quest statistics and progress
     """
+    if not renderer.enabled():
+        return
     
-    total_rewards = get_total_quest_rewards_earned(character, quest_data_dict)
+    stats = get_quest_stats(character, quest_data_dict)
     percentage = get_quest_completion_percentage(character, quest_data_dict)
+    active = len(character.get('active_quests', []))
     
-    print("\n=== QUEST PROGRESS ===")
-    print(f"Active Quests: {len(character.get('active_quests', []))}")
-    print(f"Completed Quests: {len(character.get('completed_quests', []))}")
-    print(f"Completion Percentage: {percentage:.2f}%")
-    print(f"Total XP Earned: {total_rewards['total_xp']}")
-    print(f"Total Gold Earned: {total_rewards['total_gold']}")
+    renderer.show("quest_progress",
+                  "\n=== QUEST PROGRESS ===\n"
+                  f"Active Quests: {active}\n"
+                  f"Completed Quests: {stats['completed']}\n"
+                  f"Completion Percentage: {percentage:.2f}%\n"
+                  f"Total XP Earned: {stats['total_xp']}\n"
+                  f"Total Gold Earned: {stats['total_gold']}",
+                  active=active, completed=stats['completed'], percentage=round(percentage, 2),
+                  total_xp=stats['total_xp'], total_gold=stats['total_gold'])
 
 
 # ============================================================================
@@ -488,12 +1248,5 @@ if __name__ == "__main__":
     # try:
     #     accept_quest(test_char, 'first_quest', test_quests)
     #     print("Quest accepted!")
-<<<<<<< HEAD
-=======
-    # except QuestRequirementsNotMetError as e:
-    #     print(f"Cannot accept: {e}")
-    #     accept_quest(test_char, 'first_quest', test_quests)
-    #     print("Quest accepted!")
->>>>>>> effbbc7ea9df0b4db805e3ed41175a57fcc9c474
     # except QuestRequirementsNotMetError as e:
     #     print(f"Cannot accept: {e}")
\ No newline at end of file
@@ -0,0 +1,211 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Quest Planner Module
+
+Answers "how quickly can this quest be reached?" for a character: the
+quests that still have to be done, in order, and how much extra XP (from
+combat) is needed along the way to meet each quest's level requirement.
+
+Each quest has at most one prerequisite, so the quests needed to unlock a
+target are exactly its unfinished prerequisite chain. Level maths uses
+the same curve as character_manager.gain_experience, in closed form.
+Chains, cumulative rewards and finished plans are memoized per quest
+catalog so repeated queries stay fast on large catalogs.
+
+Usage: python quest_planner.py <quest_id> [level] [experience]
+"""
+
+import sys
+
+import character_manager
+import renderer
+import quest_handler
+import game_data
+from custom_exceptions import QuestNotFoundError, QuestRequirementsNotMetError
+
+# Finished plans kept per catalog before the memo is cleared
+MAX_CACHED_PLANS = 10000
+
+# Memo for the current quest graph (see _get_planner_cache)
+_planner_cache = {'graph': None, 'reward_xp': {}, 'plans': {}}
+
+# ============================================================================
+# PLANNING
+# ============================================================================
+
+def plan_quest_route(character, target_quest_id, quest_data_dict):
+    """
+    Plan the shortest route for a character to unlock a target quest
+
+    Returns: Dictionary with:
+        'target': the target quest ID
+        'quests': quest IDs to complete first, in order (target excluded)
+        'steps': one entry per quest in 'quests' plus the target, each with
+                 'quest_id', 'required_level', 'extra_xp' (combat XP to
+                 earn before accepting it), 'level' (level when accepting)
+                 and 'reward_xp'
+        'extra_xp_needed': total combat XP needed on top of quest rewards
+        'quest_xp': XP earned from the quests in 'quests'
+        'level_needed': the target's required level
+        'unlock_level': level the character will be when unlocking it
+        'already_completed': True if the target is already completed
+
+    Raises: QuestNotFoundError if the target doesn't exist
+            QuestRequirementsNotMetError if a prerequisite is missing
+                from the catalog, so the target can never be unlocked
+    """
+    if target_quest_id not in quest_data_dict:
+        raise QuestNotFoundError(f"Quest ID '{target_quest_id}' not found.")
+
+    chain = quest_handler.get_quest_prerequisite_chain(target_quest_id, quest_data_dict)
+    if chain[0] == "INVALID_PREREQUISITE":
+        raise QuestRequirementsNotMetError(
+            f"Quest '{target_quest_id}' can never be unlocked: prerequisite '{chain[1]}' does not exist.")
+
+    # Completed quests form a prefix of the chain; skip past them
+    start = 0
+    while start < len(chain) and quest_handler.is_quest_completed(character, chain[start]):
+        start += 1
+
+    total_xp = (character_manager.get_total_xp_for_level(character.get('level', 1))
+                + character.get('experience', 0))
+
+    cache = _get_planner_cache(quest_data_dict)
+    key = (target_quest_id, start, total_xp)
+    plan = cache['plans'].get(key)
+    if plan is None:
+        plan = _build_plan(chain, start, total_xp, quest_data_dict, cache)
+        if len(cache['plans']) >= MAX_CACHED_PLANS:
+            cache['plans'].clear()
+        cache['plans'][key] = plan
+
+    return _copy_plan(plan)
+
+def get_xp_to_unlock(character, target_quest_id, quest_data_dict):
+    """
+    Get the combat XP a character needs, beyond quest rewards, to unlock
+    a quest by following its prerequisite chain
+    """
+    return plan_quest_route(character, target_quest_id, quest_data_dict)['extra_xp_needed']
+
+def _build_plan(chain, start, total_xp, quest_data_dict, cache):
+    """Walk the unfinished part of a chain, tracking XP and level"""
+    graph = quest_handler.get_quest_graph(quest_data_dict)
+    required_level = graph['required_level']
+    reward_xp = cache['reward_xp']
+    target_quest_id = chain[-1]
+
+    steps = []
+    extra_total = 0
+    i = start
+    while i < len(chain):
+        quest_id = chain[i]
+        needed_xp = character_manager.get_total_xp_for_level(required_level[quest_id])
+
+        # Grind just enough combat XP to meet the level requirement
+        extra_xp = needed_xp - total_xp if needed_xp > total_xp else 0
+        total_xp += extra_xp
+        extra_total += extra_xp
+
+        steps.append({
+            'quest_id': quest_id,
+            'required_level': required_level[quest_id],
+            'extra_xp': extra_xp,
+            'level': character_manager.get_level_for_total_xp(total_xp),
+            'reward_xp': reward_xp[quest_id],
+        })
+
+        if quest_id != target_quest_id:
+            total_xp += reward_xp[quest_id]
+        i += 1
+
+    quest_xp = 0
+    i = 0
+    while i < len(steps) - 1:
+        quest_xp += steps[i]['reward_xp']
+        i += 1
+
+    return {
+        'target': target_quest_id,
+        'quests': [step['quest_id'] for step in steps[:-1]],
+        'steps': steps,
+        'extra_xp_needed': extra_total,
+        'quest_xp': quest_xp,
+        'level_needed': required_level[target_quest_id],
+        'unlock_level': steps[-1]['level'] if steps else None,
+        'already_completed': not steps,
+    }
+
+def _copy_plan(plan):
+    """Copy a memoized plan so callers can't change the cached one"""
+    copy = dict(plan)
+    copy['quests'] = list(plan['quests'])
+    copy['steps'] = [dict(step) for step in plan['steps']]
+    return copy
+
+def _get_planner_cache(quest_data_dict):
+    """Return the memo for this catalog's graph, resetting it if the graph changed"""
+    graph = quest_handler.get_quest_graph(quest_data_dict)
+    cache = _planner_cache
+    if cache['graph'] is not graph:
+        reward_xp = {}
+        for quest_id in quest_data_dict:
+            reward_xp[quest_id] = int(quest_data_dict[quest_id].get('reward_xp', 0))
+        cache['graph'] = graph
+        cache['reward_xp'] = reward_xp
+        cache['plans'] = {}
+    return cache
+
+# ============================================================================
+# DISPLAY
+# ============================================================================
+
+def display_quest_route(plan):
+    """
+    Display a route planned by plan_quest_route
+    """
+    if plan['already_completed']:
+        renderer.show("quest_route", f"\n=== ROUTE TO {plan['target']} ===\nAlready completed.", **plan)
+        return
+
+    lines = [
+        f"\n=== ROUTE TO {plan['target']} ===",
+        "| {:<20} | {:<5} | {:<9} | {:<6} |".format("Quest", "Level", "Extra XP", "Reward"),
+        "-" * 52,
+    ]
+    i = 0
+    while i < len(plan['steps']):
+        step = plan['steps'][i]
+        lines.append("| {:<20} | {:<5} | {:<9} | {:<6} |".format(
+            step['quest_id'], step['required_level'], step['extra_xp'], step['reward_xp']
+        ))
+        i += 1
+
+    lines.append(f"Quests to complete first: {len(plan['quests'])} ({plan['quest_xp']} XP)")
+    lines.append(f"Extra combat XP needed: {plan['extra_xp_needed']}")
+    lines.append(f"Unlocks at level {plan['unlock_level']} (requires {plan['level_needed']})")
+    renderer.show("quest_route", "\n".join(lines), **plan)
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python quest_planner.py <quest_id> [level] [experience]")
+        sys.exit(2)
+
+    quests = game_data.load_quests("data/quests.txt")
+
+    character = {
+        'level': int(sys.argv[2]) if len(sys.argv) > 2 else 1,
+        'experience': int(sys.argv[3]) if len(sys.argv) > 3 else 0,
+        'active_quests': [],
+        'completed_quests': [],
+    }
+
+    try:
+        display_quest_route(plan_quest_route(character, sys.argv[1], quests))
+    except (QuestNotFoundError, QuestRequirementsNotMetError) as e:
+        print(f"Cannot plan route: {e}")
+        sys.exit(1)
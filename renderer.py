@@ -0,0 +1,154 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Renderer Module
+
+Every piece of game output goes through here instead of print(), so how
+it is shown can be chosen per run (or per server session):
+
+    text      written straight to stdout, like print() (the default)
+    buffered  the same text, collected and written in large chunks
+    silent    dropped; display functions skip formatting entirely
+    jsonl     one JSON object per line: {"event": ..., fields...}
+
+Buffered output is flushed before the game waits for input, so an
+interactive player sees exactly what the text mode shows.
+"""
+
+import sys
+import threading
+
+MODES = ["text", "buffered", "silent", "jsonl"]
+
+# Buffered characters written out in one go
+DEFAULT_FLUSH_AT = 8192
+
+# Renderer used by threads that haven't chosen their own (see set_renderer)
+_state = {'default': None}
+_thread = threading.local()
+
+# ============================================================================
+# RENDERERS
+# ============================================================================
+
+def new_renderer(mode="text", stream=None, flush_at=DEFAULT_FLUSH_AT):
+    """
+    Create a renderer
+
+    stream is any file-like object; None means whatever sys.stdout is
+    when output is written (so redirect_stdout keeps working).
+
+    Returns: Dictionary with 'mode', 'stream', 'buffered', 'buffer',
+             'size', 'flush_at' and 'events' (outputs rendered so far)
+    Raises: ValueError if mode is not one of MODES
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown render mode '{mode}'")
+
+    return {
+        'mode': mode,
+        'stream': stream,
+        'buffered': mode in ("buffered", "jsonl"),
+        'buffer': [],
+        'size': 0,
+        'flush_at': flush_at,
+        'events': 0,
+    }
+
+def set_renderer(renderer=None, this_thread=False):
+    """
+    Make renderer the active one
+
+    With this_thread, only output from the calling thread uses it (each
+    server session renders on its own thread). Passing None restores the
+    plain text renderer (or, with this_thread, the shared one).
+    Buffered output of the renderer being replaced is flushed first.
+    """
+    flush()
+    if this_thread:
+        _thread.renderer = renderer
+    else:
+        _state['default'] = renderer if renderer is not None else new_renderer()
+
+def get_renderer():
+    """
+    Return the renderer active on the calling thread
+    """
+    renderer = getattr(_thread, 'renderer', None)
+    if renderer is None:
+        renderer = _state['default']
+    return renderer
+
+def enabled():
+    """
+    Return False when output is being dropped, so callers can skip
+    building it
+    """
+    return get_renderer()['mode'] != "silent"
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+def line(text="", end="\n"):
+    """
+    Render plain text (menus, prompts, messages), like print(text, end=end)
+    """
+    renderer = get_renderer()
+    renderer['events'] += 1
+    mode = renderer['mode']
+    if mode == "silent":
+        return
+    if mode == "jsonl":
+        # Imported here so the other modes don't pay for it at startup
+        import json
+        _write(renderer, json.dumps({"event": "text", "text": text}) + "\n")
+    else:
+        _write(renderer, f"{text}{end}")
+
+def show(event, text, **fields):
+    """
+    Render the output of a display function
+
+    text is what the player sees; fields are the same facts as data for
+    the jsonl mode (text is used when there are no fields).
+    """
+    renderer = get_renderer()
+    renderer['events'] += 1
+    mode = renderer['mode']
+    if mode == "silent":
+        return
+    if mode == "jsonl":
+        import json
+        record = {"event": event}
+        if fields:
+            record.update(fields)
+        else:
+            record["text"] = text
+        _write(renderer, json.dumps(record, default=str) + "\n")
+    else:
+        _write(renderer, f"{text}\n")
+
+def flush():
+    """
+    Write out any buffered output
+    """
+    renderer = get_renderer()
+    if renderer['buffer']:
+        stream = renderer['stream'] or sys.stdout
+        stream.write("".join(renderer['buffer']))
+        renderer['buffer'].clear()
+        renderer['size'] = 0
+        stream.flush()
+
+def _write(renderer, chunk):
+    """Send a chunk to the renderer's stream, or buffer it"""
+    if not renderer['buffered']:
+        (renderer['stream'] or sys.stdout).write(chunk)
+        return
+
+    renderer['buffer'].append(chunk)
+    renderer['size'] += len(chunk)
+    if renderer['size'] >= renderer['flush_at']:
+        flush()
+
+_state['default'] = new_renderer()
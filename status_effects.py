@@ -0,0 +1,187 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Status Effects Module
+
+Timed effects on characters and enemies during a battle: damage over
+time (poison), healing over time (regen), stat changes (buffs and
+debuffs) and stuns.
+
+Nothing is scanned per effect each turn:
+
+- Damage and healing over time are summed per combatant when an effect
+  starts and taken back when it ends, so a turn applies one net health
+  change per affected combatant however many effects are stacked.
+- Expiry runs on a timer wheel: WHEEL_SIZE buckets, one per turn
+  (modulo the wheel size). An effect goes in the bucket of the turn it
+  ends, with the number of full laps to wait first, so a turn only
+  looks at the effects in its own bucket.
+
+An effect lasting n turns is active for the n turns after the one it
+was applied in: a 3-turn poison hits three times, a 1-turn stun skips
+the next action.
+"""
+
+# Buckets on the timer wheel
+WHEEL_SIZE = 64
+
+# Built-in effects: kind is 'damage', 'heal' (health per turn), 'stat'
+# (amount added to stat while active) or 'stun'
+STATUS_EFFECTS = {
+    'poison': {'kind': 'damage', 'amount': 5, 'duration': 3},
+    'regen': {'kind': 'heal', 'amount': 5, 'duration': 3},
+    'strength_up': {'kind': 'stat', 'stat': 'strength', 'amount': 5, 'duration': 3},
+    'weaken': {'kind': 'stat', 'stat': 'strength', 'amount': -4, 'duration': 3},
+    'magic_up': {'kind': 'stat', 'stat': 'magic', 'amount': 5, 'duration': 3},
+    'stun': {'kind': 'stun', 'amount': 0, 'duration': 1},
+}
+
+# Number of each effect in battle logs
+STATUS_NUMBERS = {effect_id: number for number, effect_id in enumerate(STATUS_EFFECTS)}
+
+class StatusEngine:
+    """
+    Active status effects of one battle's combatants
+
+    Combatants are character or enemy dictionaries; they are told apart
+    by identity, so two equal-looking enemies have separate effects.
+    """
+
+    def __init__(self, wheel_size=WHEEL_SIZE):
+        self.turn = 0
+        self.wheel_size = wheel_size
+        self.wheel = [[] for _ in range(wheel_size)]
+        # {id(combatant): [combatant, health change per turn, effects]}
+        self.over_time = {}
+        # {id(combatant): active stuns}
+        self.stuns = {}
+        self.active = 0
+
+    def apply(self, combatant, effect_id, duration=None, amount=None):
+        """
+        Start an effect on a combatant
+
+        duration and amount default to the STATUS_EFFECTS values.
+
+        Returns: The effect dictionary
+        Raises: ValueError for an unknown effect or a duration below 1
+        """
+        if effect_id not in STATUS_EFFECTS:
+            raise ValueError(f"Unknown status effect '{effect_id}'")
+        definition = STATUS_EFFECTS[effect_id]
+        if duration is None:
+            duration = definition['duration']
+        if amount is None:
+            amount = definition['amount']
+        if duration < 1:
+            raise ValueError("A status effect must last at least one turn")
+
+        effect = {
+            'id': effect_id,
+            'kind': definition['kind'],
+            'stat': definition.get('stat'),
+            'amount': amount,
+            'duration': duration,
+            'target': combatant,
+            'ends': self.turn + duration + 1,
+            # Laps of the wheel to wait before the end bucket counts
+            'laps': duration // self.wheel_size,
+        }
+        self._start(effect)
+        self.wheel[effect['ends'] % self.wheel_size].append(effect)
+        self.active += 1
+        return effect
+
+    def advance(self):
+        """
+        Move to the next turn: end the effects due now, then apply
+        damage and healing over time
+
+        Returns: List of (combatant, health change) actually applied
+        """
+        self.turn += 1
+        index = self.turn % self.wheel_size
+        bucket = self.wheel[index]
+        if bucket:
+            waiting = []
+            for effect in bucket:
+                if effect['laps']:
+                    effect['laps'] -= 1
+                    waiting.append(effect)
+                else:
+                    self._end(effect)
+                    self.active -= 1
+            self.wheel[index] = waiting
+
+        changes = []
+        for combatant, change, effects in self.over_time.values():
+            if change == 0:
+                continue
+            before = combatant['health']
+            health = before + change
+            if health > combatant['max_health']:
+                health = combatant['max_health']
+            if health < 0:
+                health = 0
+            combatant['health'] = health
+            if health != before:
+                changes.append((combatant, health - before))
+        return changes
+
+    def clear(self):
+        """
+        End every active effect now, undoing stat changes (for when the
+        battle is over)
+        """
+        index = 0
+        while index < self.wheel_size:
+            for effect in self.wheel[index]:
+                self._end(effect)
+            self.wheel[index] = []
+            index += 1
+        self.active = 0
+
+    def is_stunned(self, combatant):
+        """
+        Return True while a stun is active on combatant
+        """
+        return self.stuns.get(id(combatant), 0) > 0
+
+    def health_per_turn(self, combatant):
+        """
+        Return the net health change over time on combatant (negative for poison)
+        """
+        entry = self.over_time.get(id(combatant))
+        return entry[1] if entry else 0
+
+    def _start(self, effect):
+        """Put an effect's change into force"""
+        combatant = effect['target']
+        kind = effect['kind']
+        if kind == 'damage' or kind == 'heal':
+            entry = self.over_time.setdefault(id(combatant), [combatant, 0, 0])
+            entry[1] += -effect['amount'] if kind == 'damage' else effect['amount']
+            entry[2] += 1
+        elif kind == 'stat':
+            combatant[effect['stat']] = combatant.get(effect['stat'], 0) + effect['amount']
+            # Derived stats (and battle damage tables) must see the change
+            combatant['derived_stats'] = None
+        else:
+            self.stuns[id(combatant)] = self.stuns.get(id(combatant), 0) + 1
+
+    def _end(self, effect):
+        """Take an effect's change back out"""
+        combatant = effect['target']
+        kind = effect['kind']
+        if kind == 'damage' or kind == 'heal':
+            entry = self.over_time[id(combatant)]
+            entry[1] -= -effect['amount'] if kind == 'damage' else effect['amount']
+            entry[2] -= 1
+            if entry[2] == 0:
+                del self.over_time[id(combatant)]
+        elif kind == 'stat':
+            combatant[effect['stat']] = combatant.get(effect['stat'], 0) - effect['amount']
+            combatant['derived_stats'] = None
+        else:
+            self.stuns[id(combatant)] -= 1
+            if self.stuns[id(combatant)] == 0:
+                del self.stuns[id(combatant)]
@@ -0,0 +1,215 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Synthetic Data Module
+
+Seeded generators for large quest catalogs, item catalogs and populations
+of characters, in the same shapes the loaders produce, plus writers for
+the block-format data files. The same seed always gives the same data,
+so benchmark runs are comparable.
+
+Quests come in prerequisite chains: quest q<chain>_<n> requires an
+earlier quest of the same chain (usually the one right before it), and
+required levels never go down along a chain.
+
+Usage: python synthetic_data.py <output_directory> [quests] [items] [seed]
+"""
+
+import os
+import random
+import sys
+
+import character_manager
+import inventory_system
+
+CLASSES = ["Warrior", "Mage", "Rogue", "Cleric"]
+
+# Enemy types used in generated quest objectives
+ENEMY_TYPES = ["goblin", "orc", "dragon"]
+
+# Item types and the stat their effect changes
+ITEM_EFFECTS = {
+    'consumable': ['health'],
+    'weapon': ['strength', 'magic', 'attack'],
+    'armor': ['defense', 'max_health'],
+}
+
+# ============================================================================
+# CATALOGS
+# ============================================================================
+
+def quest_id_for(chain, position):
+    """
+    Return the ID of the quest at a position in a generated chain
+    """
+    return f"q{chain}_{position}"
+
+def generate_quest_catalog(count, seed=0, chain_depth=50, max_level=50, branch_chance=0.2):
+    """
+    Generate a quest catalog in the shape load_quests returns
+
+    Quests are split into chains of chain_depth; each quest requires the
+    one before it, or with branch_chance a random earlier quest of its
+    chain. Every fifth quest has an objective.
+
+    Returns: Dictionary of {quest_id: quest_data} (lowercase keys)
+    """
+    rng = random.Random(seed)
+    quests = {}
+    i = 0
+    while i < count:
+        chain = i // chain_depth
+        position = i % chain_depth
+        quest_id = quest_id_for(chain, position)
+
+        if position == 0:
+            prerequisite = "NONE"
+        elif position > 1 and rng.random() < branch_chance:
+            prerequisite = quest_id_for(chain, rng.randrange(position - 1))
+        else:
+            prerequisite = quest_id_for(chain, position - 1)
+
+        quest = {
+            'quest_id': quest_id,
+            'title': f"Quest {chain}-{position}",
+            'description': f"Generated quest {position} of chain {chain}",
+            'reward_xp': rng.randint(10, 500),
+            'reward_gold': rng.randint(5, 250),
+            'required_level': 1 + position * max_level // chain_depth,
+            'prerequisite': prerequisite,
+        }
+        if i % 5 == 0:
+            quest['objective'] = f"enemy_defeated:{rng.choice(ENEMY_TYPES)}:{rng.randint(1, 5)}"
+        quests[quest_id] = quest
+        i += 1
+    return quests
+
+def generate_item_catalog(count, seed=0):
+    """
+    Generate an item catalog in the shape load_items returns
+
+    Returns: Dictionary of {item_id: item_data} (uppercase keys, string values)
+    """
+    rng = random.Random(seed)
+    item_types = list(ITEM_EFFECTS)
+    items = {}
+    i = 0
+    while i < count:
+        item_type = item_types[i % len(item_types)]
+        item_id = f"{item_type}_{i}"
+        stat = rng.choice(ITEM_EFFECTS[item_type])
+        items[item_id] = {
+            'ITEM_ID': item_id,
+            'NAME': f"{item_type.title()} {i}",
+            'TYPE': item_type,
+            'EFFECT': f"{stat}:{rng.randint(1, 50)}",
+            'COST': str(rng.randint(1, 500)),
+            'DESCRIPTION': f"Generated {item_type}",
+        }
+        i += 1
+    return items
+
+# ============================================================================
+# CHARACTERS
+# ============================================================================
+
+def generate_characters(count, quest_data_dict, item_data_dict, seed=0, chain_depth=50):
+    """
+    Generate characters part-way through the game
+
+    Each character has a random class, level, gold and a full-ish
+    inventory, has completed the start of a few quest chains and has the
+    next quest of each of those chains active. chain_depth must match the
+    quest catalog.
+
+    Returns: List of character dictionaries
+    """
+    rng = random.Random(seed)
+    item_ids = list(item_data_dict)
+    chains = (len(quest_data_dict) + chain_depth - 1) // chain_depth
+
+    characters = []
+    i = 0
+    while i < count:
+        character = character_manager.create_character(f"Hero{i}", rng.choice(CLASSES))
+        character['level'] = rng.randint(1, 50)
+        character['gold'] = rng.randint(0, 10000)
+
+        if item_ids:
+            inventory = character['inventory']
+            while len(inventory) < inventory_system.MAX_INVENTORY_SIZE - 2:
+                inventory.append(rng.choice(item_ids))
+
+        if chains:
+            for chain in rng.sample(range(chains), min(3, chains)):
+                done = rng.randrange(chain_depth)
+                position = 0
+                while position < done and quest_id_for(chain, position) in quest_data_dict:
+                    character['completed_quests'].append(quest_id_for(chain, position))
+                    position += 1
+                if quest_id_for(chain, position) in quest_data_dict:
+                    character['active_quests'].append(quest_id_for(chain, position))
+
+        characters.append(character)
+        i += 1
+    return characters
+
+# ============================================================================
+# FILES
+# ============================================================================
+
+def write_data_file(records, data_file, id_field):
+    """
+    Write records in the blank-line separated "KEY: VALUE" block format
+
+    The ID field comes first; keys are written in uppercase.
+    """
+    with open(data_file, "w", encoding="utf-8") as f:
+        for record_id in records:
+            record = records[record_id]
+            lines = [f"{id_field}: {record_id}"]
+            for key in record:
+                if key.upper() != id_field:
+                    lines.append(f"{key.upper()}: {record[key]}")
+            f.write("\n".join(lines))
+            f.write("\n\n")
+
+def write_catalog_files(directory, quest_count, item_count, seed=0):
+    """
+    Generate and write quests.txt and items.txt into directory
+
+    Returns: Tuple of (quest file path, item file path)
+    """
+    os.makedirs(directory, exist_ok=True)
+    quest_file = os.path.join(directory, "quests.txt")
+    item_file = os.path.join(directory, "items.txt")
+    write_data_file(generate_quest_catalog(quest_count, seed), quest_file, "QUEST_ID")
+    write_data_file(generate_item_catalog(item_count, seed), item_file, "ITEM_ID")
+    return (quest_file, item_file)
+
+def write_save_files(characters, save_directory):
+    """
+    Save every character into save_directory
+
+    Returns: Number of save files written
+    """
+    i = 0
+    while i < len(characters):
+        character_manager.save_character(characters[i], save_directory)
+        i += 1
+    return i
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python synthetic_data.py <output_directory> [quests] [items] [seed]")
+        sys.exit(2)
+
+    quest_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    item_count = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+    seed = int(sys.argv[4]) if len(sys.argv) > 4 else 0
+
+    paths = write_catalog_files(sys.argv[1], quest_count, item_count, seed)
+    print(f"Wrote {quest_count} quests to {paths[0]} and {item_count} items to {paths[1]}")
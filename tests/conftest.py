@@ -0,0 +1,19 @@
+"""
+Shared Test Fixtures
+Fixtures used by several test modules
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import renderer
+
+@pytest.fixture
+def silent_output():
+    """Drop all game output on this thread for the test"""
+    renderer.set_renderer(renderer.new_renderer("silent"), this_thread=True)
+    yield
+    renderer.set_renderer(None, this_thread=True)
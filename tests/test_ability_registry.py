@@ -0,0 +1,118 @@
+"""
+Test Ability Registry
+Tests data-driven abilities, table dispatch and per-ability cooldowns
+"""
+
+import random
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import combat_system
+import game_data
+from custom_exceptions import AbilityOnCooldownError, InvalidDataFormatError, InvalidTargetError
+
+pytestmark = pytest.mark.usefixtures("silent_output")
+
+@pytest.fixture(autouse=True)
+def default_abilities():
+    yield
+    combat_system.set_abilities({})
+
+def extra_abilities(count):
+    abilities = {}
+    i = 0
+    while i < count:
+        ability_id = f"drill_{i}"
+        abilities[ability_id] = {'ABILITY_ID': ability_id, 'NAME': f"Drill {i}", 'CLASS': 'warrior',
+                                 'EFFECT': 'damage', 'STAT': 'strength', 'MULTIPLIER': 1, 'COOLDOWN': 2}
+        i += 1
+    return abilities
+
+def test_shipped_file_matches_builtins():
+    """Test that data/abilities.txt defines the built-in abilities"""
+    loaded = game_data.load_abilities("data/abilities.txt")
+    assert list(loaded) == list(combat_system.DEFAULT_ABILITIES)
+    for ability_id in loaded:
+        builtin = combat_system.DEFAULT_ABILITIES[ability_id]
+        for field in builtin:
+            assert loaded[ability_id][field] == builtin[field]
+
+def test_bad_ability_files(tmp_path):
+    """Test that incomplete or invalid abilities are rejected"""
+    bad_effect = tmp_path / "effect.txt"
+    bad_effect.write_text("ABILITY_ID: x\nCLASS: mage\nEFFECT: teleport\n")
+    missing_stat = tmp_path / "stat.txt"
+    missing_stat.write_text("ABILITY_ID: x\nCLASS: mage\nEFFECT: damage\nMULTIPLIER: 2\n")
+    bad_number = tmp_path / "number.txt"
+    bad_number.write_text("ABILITY_ID: x\nCLASS: cleric\nEFFECT: heal\nAMOUNT: lots\n")
+
+    for path in (bad_effect, missing_stat, bad_number):
+        with pytest.raises(InvalidDataFormatError):
+            game_data.load_abilities(str(path))
+
+def test_builtin_abilities_keep_their_effects():
+    """Test the four class abilities through the legacy functions"""
+    warrior = character_manager.create_character("W", "Warrior")
+    cleric = character_manager.create_character("C", "Cleric")
+    rogue = character_manager.create_character("R", "Rogue")
+    dragon = combat_system.create_enemy("dragon")
+
+    assert combat_system.warrior_power_strike(warrior, dragon) == warrior['strength'] * 2
+    assert combat_system.rogue_critical_strike(rogue, dragon, 0.1) == rogue['strength'] * 3
+    assert combat_system.rogue_critical_strike(rogue, dragon, 0.9) == rogue['strength']
+    cleric['health'] = cleric['max_health'] - 10
+    assert combat_system.cleric_heal(cleric) == 10
+    assert cleric['health'] == cleric['max_health']
+
+def test_cooldowns_are_per_ability():
+    """Test that using one ability doesn't block another"""
+    combat_system.set_abilities(extra_abilities(300))
+    assert len(combat_system.abilities) == 304
+    assert combat_system.get_class_ability("Warrior")['id'] == 'power_strike'
+
+    battle = combat_system.SimpleBattle(character_manager.create_character("W", "Warrior"),
+                                        combat_system.create_enemy("dragon"))
+    battle.turn_counter = 3
+    battle.use_special_ability()
+    battle.use_special_ability("drill_250")
+    with pytest.raises(AbilityOnCooldownError):
+        battle.use_special_ability("power_strike")
+    with pytest.raises(AbilityOnCooldownError):
+        battle.use_special_ability("drill_250")
+
+    battle.turn_counter = 5
+    battle.use_special_ability("drill_250")
+    with pytest.raises(AbilityOnCooldownError):
+        battle.use_special_ability()
+    battle.turn_counter = 6
+    battle.use_special_ability()
+
+    assert battle.ability_last_turn.typecode == 'l'
+    assert battle.ability_last_turn[combat_system.ability_numbers['drill_250']] == 5
+    with pytest.raises(InvalidTargetError):
+        battle.use_special_ability("unknown")
+
+def test_file_abilities_override_builtins(tmp_path):
+    """Test that a data file can retune a built-in ability"""
+    ability_file = tmp_path / "abilities.txt"
+    ability_file.write_text("ABILITY_ID: power_strike\nNAME: Power Strike\nCLASS: warrior\n"
+                            "EFFECT: damage\nSTAT: strength\nMULTIPLIER: 5\nCOOLDOWN: 1\n")
+    combat_system.set_abilities(game_data.load_abilities(str(ability_file)))
+
+    random.seed(1)
+    warrior = character_manager.create_character("W", "Warrior")
+    dragon = combat_system.create_enemy("dragon")
+    battle = combat_system.SimpleBattle(warrior, dragon)
+    battle.turn_counter = 1
+    battle.use_special_ability()
+    battle.turn_counter = 2
+    battle.use_special_ability()
+    assert dragon['health'] == dragon['max_health'] - 2 * 5 * warrior['strength']
+    assert combat_system.ability_numbers['power_strike'] == 0
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
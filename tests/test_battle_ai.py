@@ -0,0 +1,136 @@
+"""
+Test Battle AI
+Tests the expectimax battle policy, its transposition table and budgets
+"""
+
+import copy
+import random
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import battle_ai
+import battle_log
+import character_manager
+import combat_system
+
+pytestmark = pytest.mark.usefixtures("silent_output")
+
+def new_battle(char_class, enemy_type, **policies):
+    character = character_manager.create_character("Bot", char_class)
+    return combat_system.SimpleBattle(character, combat_system.create_enemy(enemy_type), **policies)
+
+def play(char_class, enemy_type, battles, **policies):
+    random.seed(163)
+    outcomes = {'player': 0, 'enemy': 0, 'none': 0}
+    i = 0
+    while i < battles:
+        outcomes[new_battle(char_class, enemy_type, **policies).start_battle()['winner']] += 1
+        i += 1
+    return outcomes
+
+def test_bot_wins_with_abilities():
+    """Test that the bot turns a lost matchup into a won one"""
+    assert play("Cleric", "orc", 10)['enemy'] == 10
+    assert play("Cleric", "orc", 10, player_policy=battle_ai.ExpectimaxPolicy())['player'] == 10
+
+def test_bot_runs_from_hopeless_fights():
+    """Test that running scores best against an enemy the player can't beat"""
+    policy = battle_ai.ExpectimaxPolicy(time_budget=None)
+    battle = new_battle("Rogue", "dragon")
+    battle.turn_counter = 1
+    scores = policy.score_actions(battle, 'player')
+
+    assert set(scores) == {battle_ai.ATTACK, battle_ai.RUN}
+    assert policy.choose_action(battle, 'player') == battle_ai.RUN
+    assert play("Rogue", "dragon", 20, player_policy=policy)['enemy'] < 20
+
+def test_ability_follows_cooldown():
+    """Test that the ability is only offered when it is off cooldown"""
+    policy = battle_ai.ExpectimaxPolicy(max_depth=4, time_budget=None)
+    battle = new_battle("Warrior", "goblin")
+    battle.turn_counter = 3
+    assert battle_ai.ABILITY in policy.score_actions(battle, 'player')
+
+    battle.ability_last_turn[combat_system.ability_numbers['power_strike']] = 3
+    battle.turn_counter = 4
+    assert battle_ai.ABILITY not in policy.score_actions(battle, 'player')
+
+def test_table_is_reused_until_stats_change():
+    """Test that repeated decisions hit the table and stat changes clear it"""
+    policy = battle_ai.ExpectimaxPolicy(max_depth=8, time_budget=None)
+    battle = new_battle("Mage", "orc")
+    battle.turn_counter = 1
+
+    policy.choose_action(battle, 'player')
+    nodes = policy.stats['nodes']
+    policy.choose_action(battle, 'player')
+    assert policy.stats['nodes'] == nodes
+    assert policy.stats['table_hits'] > 0
+
+    battle.character['magic'] += 10
+    policy.choose_action(battle, 'player')
+    assert policy.stats['nodes'] > nodes
+
+def test_time_budget_still_answers():
+    """Test that a spent budget still gives an action, from a shallower search"""
+    policy = battle_ai.ExpectimaxPolicy(max_depth=200, time_budget=0.0)
+    battle = new_battle("Rogue", "dragon")
+    battle.turn_counter = 1
+    assert policy.choose_action(battle, 'player') in (battle_ai.ATTACK, battle_ai.RUN)
+    assert policy.stats['depth_reached'] < 200
+
+def test_smart_enemy_flees_and_replays():
+    """Test that a losing enemy runs, and the logged battle replays exactly"""
+    outcomes = play("Warrior", "goblin", 20, enemy_policy=battle_ai.ExpectimaxPolicy())
+    assert outcomes['none'] > 0 and outcomes['enemy'] == 0
+
+    random.seed(5)
+    battle = new_battle("Rogue", "orc", player_policy=battle_ai.ExpectimaxPolicy(time_budget=None),
+                        enemy_policy=battle_ai.ExpectimaxPolicy(time_budget=None))
+    start = (copy.deepcopy(battle.character), copy.deepcopy(battle.enemy))
+    result = battle.start_battle()
+    rerun_result, rerun_log = battle_log.rerun_battle(
+        battle.log, *start, player_policy=battle_ai.ExpectimaxPolicy(time_budget=None),
+        enemy_policy=battle_ai.ExpectimaxPolicy(time_budget=None))
+    assert rerun_result == result
+    assert rerun_log == battle.log
+
+class AlwaysRun:
+    """Policy that always picks Run"""
+    def choose_action(self, battle, side):
+        return battle_ai.RUN
+
+class FailedEscapes:
+    """Random source under which every escape attempt fails"""
+    def random(self):
+        return 0.5
+
+    def choice(self, seq):
+        return seq[seq.index(False)] if False in seq else seq[0]
+
+def test_model_matches_a_real_turn():
+    """Test that the model's moves leave health where a real SimpleBattle turn does"""
+    for enemy_policy in (None, AlwaysRun()):
+        battle = new_battle("Warrior", "orc", rng=FailedEscapes(), enemy_policy=enemy_policy)
+        battle.combat_active = True
+        policy = battle_ai.ExpectimaxPolicy(time_budget=None)
+        policy._use_model(battle)
+        state = policy._state(battle)
+
+        # Follow the model through the player's attack and the enemy's move,
+        # taking the failed branch of a run
+        reached = []
+        policy._value = lambda *args: reached.append(args) or 0.0
+        policy._action_value(state, 'player', battle_ai.ATTACK, 2)
+        after_player = reached[-1]
+        enemy_action = battle_ai.RUN if enemy_policy else battle_ai.ATTACK
+        policy._action_value(after_player[:3], 'enemy', enemy_action, 2)
+
+        battle._play_turn()
+        assert reached[-1][:2] == (battle.character['health'], battle.enemy['health'])
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,158 @@
+"""
+Test Battle Log
+Tests the compact battle event encoding, replay and log files
+"""
+
+import copy
+import random
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import battle_log
+import character_manager
+import combat_system
+
+pytestmark = pytest.mark.usefixtures("silent_output")
+
+def fight(char_class="Warrior", enemy_type="orc", seed=7):
+    random.seed(seed)
+    character = character_manager.create_character("Logger", char_class)
+    enemy = combat_system.create_enemy(enemy_type)
+    start = (copy.deepcopy(character), copy.deepcopy(enemy))
+    battle = combat_system.SimpleBattle(character, enemy)
+    result = battle.start_battle()
+    return battle, result, start
+
+def test_events_round_trip():
+    """Test that events and big actor numbers and values decode as written"""
+    data = battle_log.start_log([{'name': "Ann", 'class': "Mage", 'health': 5, 'max_health': 9,
+                                  'strength': 1, 'magic': 300}])
+    battle_log.record(data, battle_log.TURN, 0)
+    battle_log.record(data, battle_log.ATTACK, 3, 0, 70000)
+    battle_log.record(data, battle_log.HEAL, 200, 0, 12)
+
+    combatants, offset = battle_log.read_header(data)
+    assert combatants[0]['name'] == "Ann" and combatants[0]['magic'] == 300
+    assert list(battle_log.iter_events(data)) == [
+        (battle_log.TURN, 0, ()),
+        (battle_log.ATTACK, 3, (0, 70000)),
+        (battle_log.HEAL, 200, (0, 12)),
+    ]
+    # Turn: 1 byte; attack: event byte, target, 3-byte damage;
+    # heal: event byte, 2-byte actor, target, amount
+    assert len(data) - offset == 1 + 5 + 5
+
+    with pytest.raises(ValueError):
+        battle_log.record(data, battle_log.DAMAGE, 0, 0, -1)
+    with pytest.raises(ValueError):
+        battle_log.read_header(b"not a log")
+
+def test_replay_rebuilds_the_battle():
+    """Test that replaying a log gives the battle's real outcome"""
+    battle, result, start = fight()
+    summary = battle_log.replay(battle.log)
+
+    assert summary['winner'] == result['winner']
+    assert summary['turns'] == battle.turn_counter
+    assert summary['combatants'][0]['health'] == battle.character['health']
+    assert summary['combatants'][1]['health'] == battle.enemy['health']
+    assert len(summary['history']) == battle.turn_counter
+
+    # Stopping early gives the state before that turn
+    middle = battle_log.replay(battle.log, until_turn=2)
+    assert middle['turns'] == 1
+    assert [middle['combatants'][0]['health'], middle['combatants'][1]['health']] == summary['history'][0]
+
+    # A few bytes per turn, besides the header
+    header = battle_log.read_header(battle.log)[1]
+    assert (len(battle.log) - header) / battle.turn_counter < 10
+
+def test_rerun_gives_identical_log():
+    """Test that a battle fought again from its log is the same battle"""
+    battle, result, start = fight("Warrior", "dragon")
+    rerun_result, rerun_log = battle_log.rerun_battle(battle.log, *start)
+
+    assert rerun_result == result
+    assert rerun_log == battle.log
+
+class StatusCaster:
+    """Player policy that attacks, starting status effects on set turns"""
+    def choose_action(self, battle, side):
+        if battle.turn_counter == 2:
+            battle.apply_status(battle.enemy, 'poison', duration=4, amount=6)
+            battle.apply_status(battle.character, 'stun')
+        elif battle.turn_counter == 4:
+            battle.apply_status(battle.character, 'strength_up', duration=30)
+        return '1'
+
+def test_rerun_restarts_status_effects():
+    """Test that a battle with status effects, before and during it, reruns identically"""
+    random.seed(11)
+    character = character_manager.create_character("Logger", "Mage")
+    enemy = combat_system.create_enemy("orc")
+    start = (copy.deepcopy(character), copy.deepcopy(enemy))
+    battle = combat_system.SimpleBattle(character, enemy, player_policy=StatusCaster())
+    battle.apply_status(enemy, 'weaken', duration=6)
+    battle.apply_status(character, 'regen', duration=8, amount=3)
+    result = battle.start_battle()
+
+    statuses = [fields for kind, actor, fields in battle_log.iter_events(battle.log) if kind == battle_log.STATUS]
+    assert len(statuses) == 5
+    assert battle_log.unsigned_to_signed(statuses[0][3]) == -4
+
+    rerun_result, rerun_log = battle_log.rerun_battle(battle.log, *start)
+    assert rerun_result == result
+    assert rerun_log == battle.log
+    assert [value for value in range(-5, 6)] == [
+        battle_log.unsigned_to_signed(battle_log.signed(value)) for value in range(-5, 6)]
+
+def test_random_draws_are_replayed():
+    """Test that escape and critical rolls come back from the log"""
+    random.seed(3)
+    character = character_manager.create_character("Sly", "Rogue")
+    start = copy.deepcopy(character)
+    battle = combat_system.SimpleBattle(character, combat_system.create_enemy("orc"))
+    battle.log = battle_log.start_log([battle.character, battle.enemy])
+    escapes = []
+    turn = 3
+    while turn < 30:
+        battle.turn_counter = turn
+        battle.use_special_ability()
+        escapes.append(battle.attempt_escape())
+        turn += 3
+
+    again = combat_system.SimpleBattle(start, combat_system.create_enemy("orc"),
+                                       rng=battle_log.ReplayRandom(battle.log))
+    again.log = battle_log.start_log([again.character, again.enemy])
+    replayed = []
+    turn = 3
+    while turn < 30:
+        again.turn_counter = turn
+        again.use_special_ability()
+        replayed.append(again.attempt_escape())
+        turn += 3
+
+    assert replayed == escapes
+    assert again.enemy['health'] == battle.enemy['health']
+    assert again.log == battle.log
+    assert battle_log.replay(battle.log)['combatants'][1]['health'] == battle.enemy['health']
+
+def test_log_file(tmp_path):
+    """Test that many logs share a file and come back in order"""
+    log_file = str(tmp_path / "battles.bin")
+    logs = []
+    seed = 0
+    while seed < 20:
+        battle = fight(seed=seed)[0]
+        battle_log.append_log(log_file, battle.log)
+        logs.append(bytes(battle.log))
+        seed += 1
+
+    assert [bytes(data) for data in battle_log.read_logs(log_file)] == logs
+    assert battle_log.format_log(logs[0])[-1] == "end: player"
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,68 @@
+"""
+Test Benchmark
+Tests the synthetic data generator and the benchmark runner at toy scale
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import benchmark
+import catalog_validator
+import game_data
+import synthetic_data
+
+def test_generator_is_seeded():
+    """Test that the same seed gives the same data and another seed doesn't"""
+    assert synthetic_data.generate_quest_catalog(500, seed=1) == synthetic_data.generate_quest_catalog(500, seed=1)
+    assert synthetic_data.generate_item_catalog(500, seed=1) != synthetic_data.generate_item_catalog(500, seed=2)
+
+def test_generated_catalogs_are_valid(tmp_path):
+    """Test that written catalogs load back and pass validation"""
+    quest_file, item_file = synthetic_data.write_catalog_files(str(tmp_path), 300, 120, seed=5)
+    quests = game_data.load_quests(quest_file)
+    items = game_data.load_items(item_file)
+
+    assert len(quests) == 300 and len(items) == 120
+    assert quests == synthetic_data.generate_quest_catalog(300, seed=5)
+    assert catalog_validator.validate_catalogs(quests, items)['ok']
+
+def test_generated_characters_follow_chains():
+    """Test that every active quest's prerequisite is completed"""
+    quests = synthetic_data.generate_quest_catalog(400, seed=3)
+    items = synthetic_data.generate_item_catalog(50, seed=3)
+    characters = synthetic_data.generate_characters(30, quests, items, seed=3)
+
+    for character in characters:
+        for quest_id in character['active_quests']:
+            prerequisite = quests[quest_id]['prerequisite']
+            assert prerequisite == "NONE" or prerequisite in character['completed_quests']
+
+def test_run_and_compare(tmp_path):
+    """Test a tiny run, its baseline file and regression detection"""
+    results = benchmark.run_benchmarks(scale=200, repeat=1)
+
+    assert [name for name, function, unit in benchmark.BENCHMARKS] == list(results)
+    for name in results:
+        assert results[name]['ops'] > 0 and results[name]['ops_per_second'] > 0
+
+    results_file = str(tmp_path / "results.json")
+    benchmark.save_baseline(results, 200, results_file)
+    baseline = benchmark.load_baselines(results_file)['200']
+
+    slower = {name: dict(results[name]) for name in results}
+    slower['battles']['ops_per_second'] = results['battles']['ops_per_second'] / 2
+    changes = benchmark.compare_to_baseline(slower, baseline)
+
+    assert changes['regressions'] == ['battles']
+    assert changes['load_quests'] == pytest.approx(0.0)
+
+    benchmark.save_baseline({'battles': slower['battles']}, 200, results_file)
+    baseline = benchmark.load_baselines(results_file)['200']
+    assert list(baseline) == sorted(results)
+    assert baseline['battles'] == slower['battles']
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,132 @@
+"""
+Test Catalog Validator
+Tests that every catalog problem is collected into one report
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import catalog_validator
+import game_data
+from custom_exceptions import InvalidDataFormatError
+
+def quest(quest_id, prerequisite='NONE', level=1, **extra):
+    record = {'quest_id': quest_id, 'title': quest_id.title(), 'reward_xp': 10,
+              'reward_gold': 5, 'required_level': level, 'prerequisite': prerequisite}
+    record.update(extra)
+    return record
+
+def catalog(*quests):
+    return {q['quest_id']: q for q in quests}
+
+def kinds(report):
+    return sorted((p['kind'], p['id']) for p in report['errors'] + report['warnings'])
+
+def test_clean_catalog_passes():
+    """Test that the shipped data files validate cleanly"""
+    report = catalog_validator.validate_files()
+
+    assert report['ok']
+    assert report['quests_checked'] > 0 and report['items_checked'] > 0
+
+def test_all_problems_reported_in_one_pass():
+    """Test that missing prerequisites, cycles and unreachable quests are all listed"""
+    quests = catalog(
+        quest('root'),
+        quest('orphan', 'ghost'),
+        quest('after_orphan', 'orphan'),
+        quest('x', 'z'), quest('y', 'x'), quest('z', 'y'),
+        quest('after_cycle', 'x'),
+        quest('hard', level=5),
+        quest('easy', 'hard', level=2),
+        quest('bad_reward', reward_xp='lots'),
+    )
+    report = catalog_validator.validate_catalogs(quests)
+
+    assert not report['ok']
+    assert kinds(report) == [
+        ('cycle', 'x'),
+        ('invalid_record', 'bad_reward'),
+        ('level_inconsistency', 'easy'),
+        ('missing_prerequisite', 'orphan'),
+        ('unreachable', 'after_cycle'),
+        ('unreachable', 'after_orphan'),
+    ]
+    assert report['counts']['unreachable'] == 2
+    assert [w['kind'] for w in report['warnings']] == ['level_inconsistency']
+
+def test_item_problems():
+    """Test item record and type checks"""
+    items = {
+        'potion': {'NAME': 'Potion', 'TYPE': 'consumable', 'EFFECT': 'health:20', 'COST': '25'},
+        'mystery': {'NAME': 'Mystery', 'TYPE': 'gizmo', 'EFFECT': 'health', 'COST': '-1'},
+    }
+    report = catalog_validator.validate_catalogs({}, items)
+
+    assert report['counts'] == {'invalid_record': 2, 'unknown_item_type': 1}
+    assert {p['id'] for p in report['errors']} == {'mystery'}
+
+def test_duplicate_ids_in_files(tmp_path):
+    """Test that duplicate quest IDs in a data file are reported"""
+    quest_file = tmp_path / "quests.txt"
+    quest_file.write_text(
+        "QUEST_ID: a\nTITLE: A\nREWARD_XP: 1\nREWARD_GOLD: 1\nREQUIRED_LEVEL: 1\nPREREQUISITE: NONE\n\n"
+        "QUEST_ID: a\nTITLE: Again\nREWARD_XP: 1\nREWARD_GOLD: 1\nREQUIRED_LEVEL: 1\nPREREQUISITE: NONE\n"
+    )
+    report = catalog_validator.validate_files(str(quest_file), "data/items.txt")
+
+    assert report['counts'] == {'duplicate_id': 1}
+
+def test_game_start_lists_every_problem(tmp_path, monkeypatch):
+    """Test that a broken data file shows the whole report, not just the first error"""
+    import io
+    import shutil
+    import main
+    import renderer
+
+    (tmp_path / "data").mkdir()
+    shutil.copy("data/items.txt", tmp_path / "data" / "items.txt")
+    (tmp_path / "data" / "quests.txt").write_text(
+        "QUEST_ID: a\nTITLE: A\nREWARD_XP: lots\nREWARD_GOLD: 1\nREQUIRED_LEVEL: 1\nPREREQUISITE: NONE\n\n"
+        "QUEST_ID: b\nTITLE: B\nREWARD_XP: 1\nREWARD_GOLD: 1\nREQUIRED_LEVEL: 1\nPREREQUISITE: ghost\n\n"
+        "QUEST_ID: b\nTITLE: Again\nREWARD_XP: 1\nREWARD_GOLD: 1\nREQUIRED_LEVEL: 1\nPREREQUISITE: NONE\n"
+    )
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(main.game_data_state, 'loaded', False)
+    output = io.StringIO()
+    renderer.set_renderer(renderer.new_renderer("text", output), this_thread=True)
+    try:
+        assert not main.ensure_game_data()
+    finally:
+        renderer.set_renderer(None, this_thread=True)
+
+    text = output.getvalue()
+    assert "CATALOG VALIDATION" in text
+    assert "(invalid_record)" in text and "(duplicate_id)" in text and "(missing_prerequisite)" in text
+
+def test_record_validators():
+    """Test the single-record validators"""
+    assert game_data.validate_quest_data(quest('fine'))
+    with pytest.raises(InvalidDataFormatError):
+        game_data.validate_quest_data(quest('loop', 'loop'))
+    with pytest.raises(InvalidDataFormatError):
+        game_data.validate_item_data({'name': 'Broken', 'type': 'weapon', 'effect': 'strength:x', 'cost': 5})
+
+def test_large_catalog():
+    """Test a long chain plus a large cycle without recursion or quadratic work"""
+    quests = {}
+    i = 0
+    while i < 100000:
+        quests[f'q{i}'] = quest(f'q{i}', f'q{i - 1}' if i else 'NONE')
+        i += 1
+    quests['q0']['prerequisite'] = 'q99999'
+
+    report = catalog_validator.validate_catalogs(quests)
+
+    assert report['counts'] == {'cycle': 1}
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,86 @@
+"""
+Test Damage Table
+Tests SimpleBattle's per-matchup damage cache and its invalidation
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import combat_system
+import inventory_system
+
+SWORD = {'NAME': 'Sword', 'TYPE': 'weapon', 'EFFECT': 'strength:5', 'COST': '50'}
+VEST = {'NAME': 'Vest', 'TYPE': 'armor', 'EFFECT': 'defense:3', 'COST': '30'}
+
+pytestmark = pytest.mark.usefixtures("silent_output")
+
+def expected(attacker, defender):
+    return max(1, attacker['strength'] - defender['strength'] // 4 - defender.get('defense', 0))
+
+def test_long_battle_computes_each_matchup_once(monkeypatch):
+    """Test that a many-turn dragon fight works damage out only twice"""
+    calls = []
+    original = combat_system.calculate_damage
+
+    def counting(attacker, defender):
+        calls.append((attacker['name'], defender['name']))
+        return original(attacker, defender)
+
+    monkeypatch.setattr(combat_system, "calculate_damage", counting)
+    character = character_manager.create_character("Tank", "Warrior")
+    character['health'] = character['max_health'] = 5000
+    battle = combat_system.SimpleBattle(character, combat_system.create_enemy("dragon"))
+    result = battle.start_battle()
+
+    assert result['winner'] == 'player'
+    assert battle.turn_counter > 10
+    assert sorted(calls) == [("Dragon", "Tank"), ("Tank", "Dragon")]
+
+def test_stat_changes_invalidate_the_table():
+    """Test that equipment, stat effects and level-ups change the damage"""
+    character = character_manager.create_character("Grower", "Warrior")
+    enemy = combat_system.create_enemy("orc")
+    battle = combat_system.SimpleBattle(character, enemy)
+    assert battle.calculate_damage(character, enemy) == expected(character, enemy)
+    assert battle.calculate_damage(enemy, character) == expected(enemy, character)
+
+    inventory_system.add_item_to_inventory(character, 'sword')
+    inventory_system.equip_item(character, 'sword', SWORD)
+    assert battle.calculate_damage(character, enemy) == expected(character, enemy)
+    assert battle.calculate_damage(enemy, character) == expected(enemy, character)
+
+    inventory_system.apply_stat_effect(character, 'strength', 7)
+    assert battle.calculate_damage(character, enemy) == expected(character, enemy)
+
+    character_manager.gain_experience(character, 500)
+    assert battle.calculate_damage(character, enemy) == expected(character, enemy)
+    assert battle.calculate_damage(enemy, character) == expected(enemy, character)
+
+def test_armor_defense_reduces_damage():
+    """Test that defense from armor is taken off the damage a character receives"""
+    character = character_manager.create_character("Tank", "Warrior")
+    enemy = combat_system.create_enemy("orc")
+    battle = combat_system.SimpleBattle(character, enemy)
+    unarmored = battle.calculate_damage(enemy, character)
+
+    inventory_system.add_item_to_inventory(character, 'vest')
+    inventory_system.equip_item(character, 'vest', VEST)
+    assert character['defense'] == 3
+    assert battle.calculate_damage(enemy, character) == unarmored - 3 == expected(enemy, character)
+
+def test_other_pairs_are_not_cached():
+    """Test that combatants outside the battle are computed directly"""
+    character = character_manager.create_character("Host", "Warrior")
+    enemy = combat_system.create_enemy("goblin")
+    stranger = combat_system.create_enemy("dragon")
+    battle = combat_system.SimpleBattle(character, enemy)
+
+    assert battle.calculate_damage(stranger, character) == expected(stranger, character)
+    assert battle.damage_table == [None, None]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
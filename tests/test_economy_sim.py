@@ -0,0 +1,55 @@
+"""
+Test Economy Simulation
+Tests the offline shop pricing simulator
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import economy_sim
+import game_data
+
+def test_simulation_uses_game_catalog():
+    """Test that the simulator prices the game's own item catalog"""
+    items = game_data.load_items("data/items.txt")
+
+    report = economy_sim.run_economy_simulation(items, num_agents=10, num_cycles=2, seed=1)
+
+    assert set(report['items_bought']) == set(items)
+    assert items['health_potion']['COST'] == '25'
+
+def test_simulation_is_reproducible():
+    """Test that the same seed gives the same report"""
+    items = game_data.load_items("data/items.txt")
+
+    first = economy_sim.run_economy_simulation(items, num_agents=50, num_cycles=10, seed=1)
+    second = economy_sim.run_economy_simulation(items, num_agents=50, num_cycles=10, seed=1)
+
+    assert first == second
+    assert len(first['mean_gold']) == 11
+
+def test_gold_books_balance():
+    """Test that final gold equals starting gold plus all recorded flows"""
+    items = game_data.load_items("data/items.txt")
+    report = economy_sim.run_economy_simulation(items, num_agents=40, num_cycles=15, seed=7)
+
+    start_total = report['mean_gold'][0] * 40
+    end_total = report['mean_gold'][-1] * 40
+    flows = report['gold_earned'] - report['gold_spent'] + report['gold_refunded']
+
+    assert end_total == pytest.approx(start_total + flows)
+
+def test_higher_prices_mean_fewer_purchases():
+    """Test that price sensitivity reacts to the price multiplier"""
+    items = game_data.load_items("data/items.txt")
+    results = economy_sim.price_sensitivity(items, multipliers=(0.5, 3.0), num_agents=100, num_cycles=20, seed=3)
+
+    cheap = sum(results[0][1]['items_bought'].values())
+    expensive = sum(results[1][1]['items_bought'].values())
+    assert cheap > expensive
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,106 @@
+"""
+Test Equipment Modifiers
+Tests that equipment bonuses are applied and retracted incrementally
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import inventory_system
+
+ITEMS = {
+    'iron_sword': {'NAME': 'Iron Sword', 'TYPE': 'weapon', 'EFFECT': 'strength:5', 'COST': '100'},
+    'steel_sword': {'NAME': 'Steel Sword', 'TYPE': 'weapon', 'EFFECT': 'strength:10', 'COST': '250'},
+    'steel_armor': {'NAME': 'Steel Armor', 'TYPE': 'armor', 'EFFECT': 'max_health:25', 'COST': '200'},
+}
+
+# ============================================================================
+# INCREMENTAL EQUIP TESTS
+# ============================================================================
+
+def test_equip_and_unequip_weapon_updates_stats():
+    """Test that a weapon's bonus is added on equip and removed on unequip"""
+    char = character_manager.create_character("ModTest", "Warrior")
+    base_strength = char['strength']
+
+    inventory_system.add_item_to_inventory(char, 'iron_sword')
+    inventory_system.equip_weapon(char, 'iron_sword', ITEMS['iron_sword'])
+    assert char['strength'] == base_strength + 5
+    assert char['equipment_bonuses']['strength'] == 5
+
+    inventory_system.unequip_weapon(char)
+    assert char['strength'] == base_strength
+    assert char['equipment_bonuses']['strength'] == 0
+    assert 'iron_sword' in char['inventory']
+
+def test_weapon_swap_retracts_old_bonus():
+    """Test that swapping weapons only keeps the new weapon's bonus"""
+    char = character_manager.create_character("SwapTest", "Rogue")
+    base_strength = char['strength']
+
+    inventory_system.add_item_to_inventory(char, 'iron_sword')
+    inventory_system.add_item_to_inventory(char, 'steel_sword')
+    inventory_system.equip_weapon(char, 'iron_sword', ITEMS['iron_sword'])
+    inventory_system.equip_weapon(char, 'steel_sword', ITEMS['steel_sword'])
+
+    assert char['strength'] == base_strength + 10
+    assert char['slot_modifiers'] == {'weapon': {'strength': 10}}
+
+def test_armor_keeps_health_percentage():
+    """Test that changing max_health keeps health at the same percentage"""
+    char = character_manager.create_character("ArmorTest", "Cleric")
+    char['health'] = 50  # 50 / 100
+
+    inventory_system.add_item_to_inventory(char, 'steel_armor')
+    inventory_system.equip_armor(char, 'steel_armor', ITEMS['steel_armor'])
+
+    assert char['max_health'] == 125
+    assert char['health'] == 62
+
+def test_incremental_matches_full_recalculation():
+    """Test that incremental stats match a full recalculate_stats rebuild"""
+    char = character_manager.create_character("RecalcTest", "Mage")
+    inventory_system.add_item_to_inventory(char, 'steel_sword')
+    inventory_system.add_item_to_inventory(char, 'steel_armor')
+    inventory_system.equip_weapon(char, 'steel_sword', ITEMS['steel_sword'])
+    inventory_system.equip_armor(char, 'steel_armor', ITEMS['steel_armor'])
+
+    incremental = dict(char)
+    character_manager.recalculate_stats(char, ITEMS)
+
+    for stat in ['max_health', 'strength', 'magic', 'defense', 'attack', 'health']:
+        assert char[stat] == incremental[stat]
+
+def test_level_up_keeps_equipment_bonus():
+    """Test that leveling up does not drop equipment bonuses"""
+    char = character_manager.create_character("LevelModTest", "Warrior")
+    inventory_system.add_item_to_inventory(char, 'iron_sword')
+    inventory_system.equip_weapon(char, 'iron_sword', ITEMS['iron_sword'])
+
+    character_manager.gain_experience(char, 100)
+
+    assert char['strength'] == char['base_strength'] + 5
+    assert char['health'] == char['max_health']
+
+def test_slot_modifiers_survive_save_and_load():
+    """Test that slot bonuses are saved and restored without the catalog"""
+    char = character_manager.create_character("ModSaveTest", "Warrior")
+    inventory_system.add_item_to_inventory(char, 'iron_sword')
+    inventory_system.equip_weapon(char, 'iron_sword', ITEMS['iron_sword'])
+    character_manager.save_character(char)
+
+    try:
+        loaded = character_manager.load_character("ModSaveTest")
+        assert loaded['slot_modifiers'] == {'weapon': {'strength': 5}}
+
+        inventory_system.unequip_weapon(loaded)
+        assert loaded['strength'] == loaded['base_strength']
+    finally:
+        character_manager.delete_character("ModSaveTest")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
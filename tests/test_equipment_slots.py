@@ -0,0 +1,107 @@
+"""
+Test Equipment Slots
+Tests the data-driven slot layout and cached derived stats
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import inventory_system
+import combat_system
+import game_data
+from custom_exceptions import InvalidItemTypeError
+
+RING = {'NAME': 'Ruby Ring', 'TYPE': 'ring', 'EFFECT': 'strength:2', 'COST': '90'}
+HELM = {'NAME': 'Iron Helm', 'TYPE': 'head', 'EFFECT': 'max_health:8', 'COST': '60'}
+
+@pytest.fixture(autouse=True)
+def slot_layout():
+    """Use the shipped slot layout, then restore the defaults"""
+    inventory_system.set_equipment_slots(game_data.load_equipment_slots("data/equipment_slots.txt"))
+    yield
+    inventory_system.set_equipment_slots({})
+
+# ============================================================================
+# SLOT TESTS
+# ============================================================================
+
+def test_load_equipment_slots():
+    """Test that the slot file loads every slot in order"""
+    slots = game_data.load_equipment_slots("data/equipment_slots.txt")
+
+    assert list(slots)[0] == 'weapon'
+    assert slots['ring_2']['ITEM_TYPE'] == 'ring'
+    assert 'armor' in slots
+
+def test_rings_fill_both_slots():
+    """Test that two rings go into the two ring slots"""
+    char = character_manager.create_character("RingTest", "Rogue")
+    base_strength = char['strength']
+    inventory_system.add_item_to_inventory(char, 'ruby_ring')
+    inventory_system.add_item_to_inventory(char, 'ruby_ring')
+
+    inventory_system.equip_item(char, 'ruby_ring', RING)
+    inventory_system.equip_item(char, 'ruby_ring', RING)
+
+    assert char['equipment'] == {'ring_1': 'ruby_ring', 'ring_2': 'ruby_ring'}
+    assert char['strength'] == base_strength + 4
+    assert 'ruby_ring' not in char['inventory']
+
+    inventory_system.unequip_item(char, 'ring_1')
+    assert char['strength'] == base_strength + 2
+
+def test_wrong_slot_raises():
+    """Test that an item cannot go into a slot for another type"""
+    char = character_manager.create_character("SlotTest", "Warrior")
+    inventory_system.add_item_to_inventory(char, 'iron_helm')
+
+    with pytest.raises(InvalidItemTypeError):
+        inventory_system.equip_item(char, 'iron_helm', HELM, slot='ring_1')
+
+def test_extra_slots_survive_save_and_load():
+    """Test that extra slots are written to and read from the save file"""
+    char = character_manager.create_character("SlotSaveTest", "Cleric")
+    inventory_system.add_item_to_inventory(char, 'iron_helm')
+    inventory_system.equip_item(char, 'iron_helm', HELM)
+    character_manager.save_character(char)
+
+    try:
+        loaded = character_manager.load_character("SlotSaveTest")
+        assert loaded['equipment'] == {'head': 'iron_helm'}
+        assert loaded['max_health'] == char['max_health']
+    finally:
+        character_manager.delete_character("SlotSaveTest")
+
+# ============================================================================
+# DERIVED STAT CACHE TESTS
+# ============================================================================
+
+def test_derived_stats_invalidated_by_slot_change():
+    """Test that the derived stat cache is rebuilt after equipping"""
+    char = character_manager.create_character("DerivedTest", "Warrior")
+    before = character_manager.get_derived_stats(char)
+    assert character_manager.get_derived_stats(char) is before
+
+    inventory_system.add_item_to_inventory(char, 'ruby_ring')
+    inventory_system.equip_item(char, 'ruby_ring', RING)
+
+    after = character_manager.get_derived_stats(char)
+    assert after['attack_power'] == before['attack_power'] + 2
+
+def test_combat_damage_uses_derived_stats():
+    """Test that combat damage matches the strength-based formula"""
+    char = character_manager.create_character("DamageTest", "Warrior")
+    goblin = combat_system.create_enemy("goblin")
+    battle = combat_system.SimpleBattle(char, goblin)
+
+    assert battle.calculate_damage(char, goblin) == char['strength'] - goblin['strength'] // 4
+
+    character_manager.gain_experience(char, 100)
+    assert battle.calculate_damage(char, goblin) == char['strength'] - goblin['strength'] // 4
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
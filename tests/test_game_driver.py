@@ -0,0 +1,77 @@
+"""
+Test Game Driver
+Tests that scripted sessions run main.main without a console
+"""
+
+import io
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_driver
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NEW_GAME = ["1", "Driver Hero", "1", "6", "3"]
+
+@pytest.fixture(autouse=True)
+def repo_directory(monkeypatch):
+    """main.main loads data files relative to the repository root"""
+    monkeypatch.chdir(ROOT)
+
+def test_session_finishes(tmp_path):
+    """Test that a script ending in Exit finishes normally and saves to the given directory"""
+    output = io.StringIO()
+    result = game_driver.run_session(NEW_GAME, output_stream=output, save_directory=str(tmp_path))
+
+    assert result['finished']
+    assert result['inputs'] == len(NEW_GAME)
+    assert "Thanks for playing" in output.getvalue()
+    assert os.listdir(tmp_path)
+
+def test_bad_quantity_reprompts(tmp_path):
+    """Test that a non-numeric or zero quantity asks again instead of failing the action"""
+    script = ["1", "Potion Hero", "1", "5", "1", "health_potion", "3",
+              "2", "1", "health_potion", "many", "0", "1", "3", "6", "3"]
+    output = io.StringIO()
+    result = game_driver.run_session(script, output_stream=output, save_directory=str(tmp_path))
+
+    text = output.getvalue()
+    assert result['finished']
+    assert text.count("How many?") == 3
+    assert text.count("Invalid quantity") == 2
+    assert "SYSTEM ERROR" not in text
+
+def test_script_runs_out(tmp_path):
+    """Test that a script without an exit stops the session instead of hanging"""
+    result = game_driver.run_session(["1", "Stuck Hero"], save_directory=str(tmp_path))
+
+    assert not result['finished']
+    assert result['inputs'] == 2
+
+def test_generator_script(tmp_path):
+    """Test that any iterable of commands can drive a session"""
+    result = game_driver.run_session((line for line in NEW_GAME), save_directory=str(tmp_path))
+
+    assert result['finished']
+
+def test_silent_session(tmp_path):
+    """Test that a silent session plays through without writing output"""
+    output = io.StringIO()
+    result = game_driver.run_session(NEW_GAME, output_stream=output, save_directory=str(tmp_path),
+                                     render_mode="silent")
+
+    assert result['finished']
+    assert output.getvalue() == ""
+
+def test_shipped_script_batch():
+    """Test that the shipped script replays cleanly many times"""
+    script = game_driver.load_script(os.path.join(ROOT, "data", "scripts", "basic_session.txt"))
+    totals = game_driver.run_batch(script, sessions=5, seed=1)
+
+    assert totals['finished'] == 5
+    assert totals['inputs'] == 5 * len(script)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,103 @@
+"""
+Test Game Server
+Tests that concurrent players get separate sessions over one server
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import game_server
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture(autouse=True)
+def repo_directory(monkeypatch):
+    """Game data files are loaded relative to the repository root"""
+    monkeypatch.chdir(ROOT)
+
+async def play(port, lines):
+    """Connect, send every line, hang up, and return everything the server sent"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for line in lines:
+        writer.write(f"{line}\n".encode())
+    await writer.drain()
+    writer.write_eof()
+    output = await asyncio.wait_for(reader.read(), timeout=10)
+    writer.close()
+    return output.decode()
+
+def run_with_server(save_directory, client, max_sessions=20):
+    async def scenario():
+        server, state = await game_server.start_server(port=0, save_directory=save_directory,
+                                                      max_sessions=max_sessions)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await client(port, state)
+        finally:
+            await game_server.stop_server(server, state)
+    return asyncio.run(scenario())
+
+def test_concurrent_sessions(tmp_path):
+    """Test that many players play at once, each with their own character"""
+    async def client(port, state):
+        return await asyncio.gather(*[
+            play(port, ["1", f"Hero{i}", "1", "1", "6", "3"]) for i in range(10)
+        ])
+
+    outputs = run_with_server(str(tmp_path), client)
+
+    i = 0
+    while i < 10:
+        assert f"Welcome, Hero{i} the Warrior!" in outputs[i]
+        assert "Thanks for playing" in outputs[i]
+        assert f"Hero{i}" in character_manager.list_saved_characters(str(tmp_path))
+        j = 0
+        while j < 10:
+            if j != i:
+                assert f"Hero{j} " not in outputs[i]
+            j += 1
+        i += 1
+
+def test_disconnect_saves_game(tmp_path):
+    """Test that a player who disconnects mid-game has their character saved"""
+    async def client(port, state):
+        output = await play(port, ["1", "Quitter"])
+        while state['active']:
+            await asyncio.sleep(0.01)
+        return output
+
+    output = run_with_server(str(tmp_path), client)
+
+    assert "Select your class" in output
+    assert character_manager.list_saved_characters(str(tmp_path)) == []
+
+    async def midgame(port, state):
+        output = await play(port, ["1", "Leaver", "2", "1"])
+        while state['active']:
+            await asyncio.sleep(0.01)
+        return output
+
+    run_with_server(str(tmp_path), midgame)
+
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Leaver"]
+
+def test_server_full(tmp_path):
+    """Test that players beyond max_sessions are turned away"""
+    async def client(port, state):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        await reader.readuntil(b"(1-3): ")
+        output = await play(port, [])
+        writer.close()
+        return output
+
+    output = run_with_server(str(tmp_path), client, max_sessions=1)
+
+    assert "Server is full" in output
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
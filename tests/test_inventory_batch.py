@@ -0,0 +1,72 @@
+"""
+Test Batched Item Use
+Tests using several consumables in one call
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import inventory_system
+from custom_exceptions import InsufficientResourcesError, InvalidItemTypeError
+
+POTION = {'NAME': 'Health Potion', 'TYPE': 'consumable', 'EFFECT': 'health:20', 'COST': '25'}
+ELIXIR = {'NAME': 'Strength Elixir', 'TYPE': 'consumable', 'EFFECT': 'strength:3', 'COST': '50'}
+
+def make_char(potions):
+    return {'inventory': ['health_potion'] * potions + ['iron_sword'], 'health': 40, 'max_health': 100, 'strength': 10}
+
+def test_use_items_stops_at_max_health():
+    """Test that only the potions needed to reach max_health are consumed"""
+    char = make_char(5)
+
+    inventory_system.use_items(char, 'health_potion', 5, POTION)
+
+    assert char['health'] == 100
+    assert inventory_system.count_item(char, 'health_potion') == 2
+    assert 'iron_sword' in char['inventory']
+
+def test_use_items_matches_repeated_use_item():
+    """Test that a batch gives the same result as single uses"""
+    batched = make_char(2)
+    single = make_char(2)
+
+    inventory_system.use_items(batched, 'health_potion', 2, POTION)
+    inventory_system.use_item(single, 'health_potion', POTION)
+    inventory_system.use_item(single, 'health_potion', POTION)
+
+    assert batched == single
+
+def test_use_items_full_health_consumes_nothing():
+    """Test that nothing is used when health is already full"""
+    char = make_char(3)
+    char['health'] = 100
+
+    inventory_system.use_items(char, 'health_potion', 3, POTION)
+
+    assert inventory_system.count_item(char, 'health_potion') == 3
+
+def test_use_items_non_health_effect_uses_all():
+    """Test that non-health effects apply once per item"""
+    char = {'inventory': ['strength_elixir'] * 3, 'strength': 10}
+
+    inventory_system.use_items(char, 'strength_elixir', 3, ELIXIR)
+
+    assert char['strength'] == 19
+    assert char['inventory'] == []
+
+def test_use_items_errors():
+    """Test quantity and type errors"""
+    char = make_char(1)
+
+    with pytest.raises(InsufficientResourcesError):
+        inventory_system.use_items(char, 'health_potion', 2, POTION)
+    with pytest.raises(InvalidItemTypeError):
+        inventory_system.use_items(char, 'iron_sword', 1, {'TYPE': 'weapon', 'EFFECT': 'strength:5'})
+    with pytest.raises(ValueError):
+        inventory_system.use_items(char, 'health_potion', 0, POTION)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
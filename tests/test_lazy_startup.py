@@ -0,0 +1,45 @@
+"""
+Test Lazy Startup
+Tests that main.py reaches its first menu without loading the game subsystems
+"""
+
+import subprocess
+import sys
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run_python(*args):
+    return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True, timeout=60)
+
+def test_import_main_loads_no_subsystems():
+    """Test that importing main leaves the subsystems and catalogs unloaded"""
+    result = run_python("-c",
+        "import sys, main\n"
+        "loaded = [m for m in main.SUBSYSTEMS if m in sys.modules]\n"
+        "print(loaded, main.game_data_state['loaded'])")
+
+    assert result.stdout.strip() == "[] False"
+
+def test_subsystem_loads_on_first_use():
+    """Test that using a subsystem imports it and replaces the stand-in"""
+    result = run_python("-c",
+        "import sys, main\n"
+        "main.combat_system.create_enemy('goblin')\n"
+        "print(type(main.combat_system).__name__, main.startup_times[0]['name'])")
+
+    assert result.stdout.strip() == "module import combat_system"
+
+def test_startup_report():
+    """Test that --startup-report times every subsystem and catalog"""
+    result = run_python("main.py", "--startup-report")
+
+    assert result.returncode == 0
+    assert "Time to first menu" in result.stdout
+    assert "import character_manager" in result.stdout
+    assert "load" in result.stdout and "quests" in result.stdout
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,94 @@
+"""
+Test Metrics
+Tests counters, histograms, hot-path timers and snapshot export
+"""
+
+import json
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import metrics
+import character_manager
+import combat_system
+import quest_handler
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.disable()
+    metrics.reset()
+    yield
+    metrics.disable()
+    metrics.reset()
+
+def test_disabled_is_free():
+    """Test that nothing is wrapped or recorded while metrics are off"""
+    original = character_manager.recalculate_stats
+    metrics.increment("anything")
+    metrics.observe("anything", 1.0)
+
+    assert character_manager.recalculate_stats is original
+    assert not hasattr(combat_system.SimpleBattle._play_turn, '__wrapped__')
+    assert metrics.snapshot() == {'counters': {}, 'histograms': {}}
+
+def test_enable_times_hot_paths_and_disable_restores():
+    """Test that hot paths are timed only between enable() and disable()"""
+    original_turn = combat_system.SimpleBattle._play_turn
+    metrics.enable()
+
+    character = character_manager.create_character("Timed", "Warrior")
+    battle = combat_system.SimpleBattle(character, combat_system.create_enemy("goblin"))
+    battle.start_battle()
+
+    histograms = metrics.snapshot()['histograms']
+    assert histograms['quest_battle_turn_seconds']['count'] == battle.turn_counter
+
+    metrics.disable()
+    assert combat_system.SimpleBattle._play_turn is original_turn
+
+def test_errors_counted():
+    """Test that a failing hot path counts an error and still records its time"""
+    metrics.enable()
+    with pytest.raises(Exception):
+        quest_handler.complete_quest({'active_quests': [], 'completed_quests': []}, "missing", {})
+
+    data = metrics.snapshot()
+    assert data['counters']['quest_complete_quest_errors_total'] == 1
+    assert data['histograms']['quest_complete_quest_seconds']['count'] == 1
+
+def test_histogram_buckets_and_timer():
+    metrics.enable()
+    metrics.observe("size", 3, buckets=[1, 5, 10])
+    metrics.observe("size", 7)
+    metrics.observe("size", 50)
+    with metrics.Timer("block"):
+        pass
+
+    histograms = metrics.snapshot()['histograms']
+    assert histograms['quest_size']['buckets'] == [(1, 0), (5, 1), (10, 2)]
+    assert histograms['quest_size']['count'] == 3
+    assert histograms['quest_block_seconds']['count'] == 1
+
+def test_export_formats(tmp_path):
+    """Test the JSON and Prometheus snapshot files"""
+    metrics.enable()
+    metrics.increment("battles_total", 2)
+    metrics.observe("size", 3, buckets=[1, 5])
+
+    json_path = tmp_path / "metrics.json"
+    prom_path = tmp_path / "metrics.prom"
+    metrics.write_snapshot(str(json_path))
+    metrics.write_snapshot(str(prom_path))
+
+    assert json.loads(json_path.read_text())['counters'] == {'quest_battles_total': 2}
+    lines = prom_path.read_text().splitlines()
+    assert "# TYPE quest_battles_total counter" in lines
+    assert "quest_battles_total 2" in lines
+    assert 'quest_size_bucket{le="5"} 1' in lines
+    assert 'quest_size_bucket{le="+Inf"} 1' in lines
+    assert "quest_size_count 1" in lines
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
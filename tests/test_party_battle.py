@@ -0,0 +1,117 @@
+"""
+Test Party Battle
+Tests initiative ordering, joining and leaving mid-fight, and raid-sized battles
+"""
+
+import random
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import combat_system
+import event_bus
+import party_battle
+from custom_exceptions import CharacterDeadError, CombatNotActiveError
+
+pytestmark = pytest.mark.usefixtures("silent_output")
+
+@pytest.fixture(autouse=True)
+def clear_subscribers():
+    yield
+    event_bus.clear_subscribers()
+
+def dummy(name, speed, health=100000):
+    return {'name': name, 'health': health, 'max_health': health, 'strength': 10, 'magic': 0, 'speed': speed}
+
+def test_speed_sets_turn_frequency():
+    """Test that a twice-as-fast combatant acts twice as often"""
+    fast = dummy("Fast", 12)
+    slow = dummy("Slow", 6)
+    battle = party_battle.PartyBattle([fast], [slow], rng=random.Random(1))
+    battle.combat_active = True
+
+    i = 0
+    while i < 300:
+        assert battle.play_turn() is None
+        i += 1
+
+    damage_by_fast = slow['max_health'] - slow['health']
+    damage_by_slow = fast['max_health'] - fast['health']
+    assert damage_by_fast == 2 * damage_by_slow
+
+def test_class_speed_for_characters():
+    """Test that characters without a speed stat get their class speed"""
+    rogue = character_manager.create_character("Quick", "Rogue")
+    assert party_battle.get_speed(rogue) == party_battle.CLASS_SPEED['rogue']
+    assert party_battle.get_speed(combat_system.create_enemy("dragon")) == 6
+    assert party_battle.get_speed({'speed': 0}) == 1
+
+def test_join_and_leave_mid_fight():
+    """Test that removed combatants stop acting and newcomers start"""
+    hero = dummy("Hero", 10)
+    goblins = [dummy(f"Goblin{i}", 10) for i in range(3)]
+    battle = party_battle.PartyBattle([hero], goblins, rng=random.Random(2))
+    battle.combat_active = True
+
+    battle.remove_combatant(2)
+    battle.remove_combatant(2)
+    assert battle.live_combatants('enemy') == [goblins[0], goblins[2]]
+
+    helper = dummy("Helper", 10)
+    helper_slot = battle.add_combatant(helper, 'player')
+    i = 0
+    while i < 200:
+        battle.play_turn()
+        i += 1
+
+    # The fled goblin was never attacked; the helper both fought and got hit
+    assert goblins[1]['health'] == goblins[1]['max_health']
+    assert helper['health'] < helper['max_health']
+    assert battle.live['player'] == [0, helper_slot]
+    assert len(battle.queue) <= len(battle.slots)
+
+def test_party_wins_and_counts_kills():
+    """Test a full battle's winner, rewards and kill events"""
+    kills = []
+    event_bus.subscribe(event_bus.ENEMY_DEFEATED, 'goblin',
+                        lambda character, event_type, key, amount: kills.append(character['name']))
+    party = [character_manager.create_character(f"Hero{i}", "Warrior") for i in range(4)]
+    goblins = [combat_system.create_enemy("goblin") for i in range(3)]
+
+    result = party_battle.PartyBattle(party, goblins, rng=random.Random(3)).start_battle()
+
+    assert result['winner'] == 'player'
+    assert result['xp_gained'] == 3 * 25 and result['gold_gained'] == 3 * 10
+    assert len(kills) == 3 and all(name.startswith("Hero") for name in kills)
+    assert all(goblin['health'] == 0 for goblin in goblins)
+    assert result['survivors'] == [hero for hero in party if hero['health'] > 0]
+
+def test_errors():
+    """Test that dead combatants and unstarted battles are rejected"""
+    hero = dummy("Hero", 10)
+    with pytest.raises(CharacterDeadError):
+        party_battle.PartyBattle([hero], [dummy("Ghost", 10, health=0)])
+
+    battle = party_battle.PartyBattle([hero], [dummy("Goblin", 10)])
+    with pytest.raises(CombatNotActiveError):
+        battle.play_turn()
+    with pytest.raises(ValueError):
+        battle.add_combatant(dummy("Bystander", 10), 'neutral')
+
+def test_raid_is_deterministic():
+    """Test that a large seeded raid finishes the same way every time"""
+    def raid():
+        party = [character_manager.create_character(f"Hero{i}", "Warrior") for i in range(300)]
+        enemies = [combat_system.create_enemy("goblin") for i in range(300)]
+        result = party_battle.PartyBattle(party, enemies, rng=random.Random(163)).start_battle()
+        return result['winner'], result['turns'], len(result['survivors'])
+
+    first = raid()
+    assert first == raid()
+    assert first[1] > 600
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,90 @@
+"""
+Test Profiling
+Tests profile mode selection, the profile output files and memory checkpoints
+"""
+
+import pstats
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import profiling
+
+@pytest.fixture(autouse=True)
+def profile_env(monkeypatch, tmp_path):
+    monkeypatch.delenv("QUEST_PROFILE", raising=False)
+    monkeypatch.setenv("QUEST_PROFILE_DIR", str(tmp_path))
+    yield
+    profiling._active['profile'] = None
+
+def busy_work(count):
+    total = 0
+    i = 0
+    while i < count:
+        profiling.checkpoint(f"step_{i}")
+        total += sum([j * j for j in range(20000)])
+        i += 1
+    return total
+
+def test_modes_from_env_and_flag(monkeypatch):
+    """Test that --profile overrides QUEST_PROFILE and bad modes are rejected"""
+    assert profiling.get_profile_modes([]) == []
+
+    monkeypatch.setenv("QUEST_PROFILE", "cpu, memory")
+    assert profiling.get_profile_modes([]) == ["cpu", "memory"]
+    assert profiling.get_profile_modes(["script.txt", "--profile=sample"]) == ["sample"]
+
+    with pytest.raises(ValueError):
+        profiling.get_profile_modes(["--profile=cpu,gpu"])
+
+def test_unprofiled_run_writes_nothing(tmp_path):
+    """Test that without modes the function just runs"""
+    assert profiling.run_profiled("plain", busy_work, 2, argv=[]) == busy_work(2)
+    assert os.listdir(tmp_path) == []
+
+def test_all_modes_write_named_files(tmp_path):
+    """Test that each mode writes its files under the run name"""
+    result = profiling.run_profiled("batch", busy_work, 5, argv=["--profile=cpu,memory,sample"])
+    assert result == busy_work(5)
+
+    files = sorted(os.listdir(tmp_path))
+    suffixes = [name.split("-", 3)[-1] for name in files]
+    assert all(name.startswith("batch-") for name in files)
+    assert len(files) == 6
+    for suffix in ["cpu.txt", "memory.txt", "samples.folded", "samples.txt"]:
+        assert any(name.endswith(suffix) for name in suffixes)
+
+    prof_file = [name for name in files if name.endswith(".prof")][0]
+    stats = pstats.Stats(str(tmp_path / prof_file))
+    assert any(key[2] == "busy_work" for key in stats.stats)
+
+    cpu_text = (tmp_path / [name for name in files if name.endswith("-cpu.txt")][0]).read_text()
+    assert "busy_work" in cpu_text
+
+def test_memory_checkpoints(tmp_path):
+    """Test that checkpoints are recorded only while memory profiling"""
+    profiling.checkpoint("ignored")
+
+    profile = profiling.start_profile("menus", ["memory"])
+    busy_work(3)
+    paths = profiling.stop_profile(profile)
+
+    assert profiling._active['profile'] is None
+    assert [entry['label'] for entry in profile['memory']['checkpoints']] == ["step_0", "step_1", "step_2"]
+    text = open([path for path in paths if path.endswith("-memory.txt")][0]).read()
+    assert "step_2" in text and "ignored" not in text
+    assert "allocation sites at exit" in text
+
+def test_sampler_sees_running_code(tmp_path):
+    """Test that the sampler records the profiled function's stack"""
+    profile = profiling.start_profile("sampled", ["sample"])
+    busy_work(40)
+    profiling.stop_profile(profile)
+
+    assert profile['sampler']['samples'] > 0
+    assert any("busy_work" in stack for stack in profile['sampler']['stacks'])
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,104 @@
+"""
+Test Quest Availability Index
+Tests that the incrementally maintained available-quest set stays correct
+"""
+
+import pytest
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quest_handler
+
+QUESTS = {
+    'first_steps': {'quest_id': 'first_steps', 'required_level': 1, 'prerequisite': 'NONE'},
+    'goblin_hunter': {'quest_id': 'goblin_hunter', 'required_level': 2, 'prerequisite': 'first_steps'},
+    'equipment_upgrade': {'quest_id': 'equipment_upgrade', 'required_level': 2, 'prerequisite': 'first_steps'},
+    'orc_menace': {'quest_id': 'orc_menace', 'required_level': 3, 'prerequisite': 'goblin_hunter'},
+    'side_job': {'quest_id': 'side_job', 'required_level': 1, 'prerequisite': 'NONE'},
+}
+
+def available_ids(char, quests):
+    return [quest['quest_id'] for quest in quest_handler.get_available_quests(char, quests)]
+
+def brute_force_ids(char, quests):
+    return [quest_id for quest_id in quests if quest_handler.can_accept_quest(char, quest_id, quests)]
+
+def new_char():
+    return {'level': 1, 'active_quests': [], 'completed_quests': [], 'experience': 0, 'gold': 0}
+
+def test_completion_unlocks_children():
+    """Test that completing a quest adds the quests it unlocks"""
+    char = new_char()
+    assert available_ids(char, QUESTS) == ['first_steps', 'side_job']
+
+    quest_handler.accept_quest(char, 'first_steps', QUESTS)
+    assert available_ids(char, QUESTS) == ['side_job']
+
+    quest_handler.complete_quest(char, 'first_steps', QUESTS)
+    # Children need level 2
+    assert available_ids(char, QUESTS) == ['side_job']
+
+    char['level'] = 2
+    assert available_ids(char, QUESTS) == ['goblin_hunter', 'equipment_upgrade', 'side_job']
+
+def test_abandon_returns_quest():
+    """Test that abandoning puts a quest back into the available set"""
+    char = new_char()
+    quest_handler.accept_quest(char, 'side_job', QUESTS)
+    quest_handler.abandon_quest(char, 'side_job')
+
+    assert 'side_job' in available_ids(char, QUESTS)
+
+def test_external_changes_trigger_rebuild():
+    """Test that editing the quest lists directly is noticed"""
+    char = new_char()
+    char['level'] = 5
+    available_ids(char, QUESTS)
+
+    char['completed_quests'].append('first_steps')
+
+    assert available_ids(char, QUESTS) == brute_force_ids(char, QUESTS)
+
+def test_same_length_replacement_triggers_rebuild():
+    """Test that swapping a quest list for another of the same length is noticed"""
+    char = new_char()
+    char['level'] = 2
+    char['active_quests'] = ['first_steps']
+    assert available_ids(char, QUESTS) == ['side_job']
+
+    char['active_quests'] = ['side_job']
+    assert available_ids(char, QUESTS) == ['first_steps']
+    assert available_ids(char, QUESTS) == brute_force_ids(char, QUESTS)
+
+def test_random_play_matches_brute_force():
+    """Test the index against can_accept_quest over random actions"""
+    rng = random.Random(163)
+    quests = {}
+    i = 0
+    while i < 200:
+        prereq = f'q{rng.randrange(i)}' if i and rng.random() < 0.8 else 'NONE'
+        quests[f'q{i}'] = {'quest_id': f'q{i}', 'required_level': rng.randint(1, 8), 'prerequisite': prereq}
+        i += 1
+
+    char = new_char()
+    step = 0
+    while step < 400:
+        roll = rng.random()
+        available = available_ids(char, quests)
+        assert available == brute_force_ids(char, quests)
+
+        if roll < 0.5 and available:
+            quest_handler.accept_quest(char, rng.choice(available), quests)
+        elif roll < 0.85 and char['active_quests']:
+            quest_handler.complete_quest(char, rng.choice(char['active_quests']), quests)
+        elif roll < 0.9 and char['active_quests']:
+            quest_handler.abandon_quest(char, rng.choice(char['active_quests']))
+        elif char['level'] < 8:
+            char['level'] += 1
+        step += 1
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
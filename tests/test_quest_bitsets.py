@@ -0,0 +1,136 @@
+"""
+Test Quest Bitsets
+Tests bitset quest state and its compact save-file encoding
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quest_handler
+import character_manager
+from custom_exceptions import InvalidSaveDataError
+
+QUESTS = {
+    'first_steps': {'quest_id': 'first_steps', 'required_level': 1, 'prerequisite': 'NONE',
+                    'reward_xp': 50, 'reward_gold': 25},
+    'goblin_hunter': {'quest_id': 'goblin_hunter', 'required_level': 1, 'prerequisite': 'first_steps',
+                      'reward_xp': 100, 'reward_gold': 50},
+    'side_job': {'quest_id': 'side_job', 'required_level': 1, 'prerequisite': 'NONE',
+                 'reward_xp': 20, 'reward_gold': 10},
+}
+
+def test_membership_uses_bitsets():
+    """Test that completed/active checks follow accept and complete"""
+    char = {'level': 1, 'active_quests': [], 'completed_quests': [], 'experience': 0, 'gold': 0}
+    quest_handler.get_available_quests(char, QUESTS)
+
+    quest_handler.accept_quest(char, 'first_steps', QUESTS)
+    assert quest_handler.is_quest_active(char, 'first_steps')
+    assert not quest_handler.is_quest_completed(char, 'first_steps')
+
+    quest_handler.complete_quest(char, 'first_steps', QUESTS)
+    assert quest_handler.is_quest_completed(char, 'first_steps')
+    assert not quest_handler.is_quest_active(char, 'first_steps')
+    assert char['quest_index']['completed_bits'] == 1
+
+def test_encoding_round_trip():
+    """Test both encodings decode back to the same bitset"""
+    dense = (1 << 300) - 1
+    sparse = (1 << 5000) | (1 << 3)
+
+    assert quest_handler.encode_quest_bits(dense).startswith("B:")
+    assert quest_handler.encode_quest_bits(sparse).startswith("V:")
+    for bits in (0, 1, dense, sparse):
+        assert quest_handler.decode_quest_bits(quest_handler.encode_quest_bits(bits)) == bits
+
+def test_bits_to_ids_in_catalog_order():
+    """Test converting between quest IDs and bitsets"""
+    graph = quest_handler.get_quest_graph(QUESTS)
+    bits, extra = quest_handler.quest_ids_to_bits(['side_job', 'first_steps', 'ghost'], graph)
+
+    assert extra == {'ghost'}
+    assert quest_handler.bits_to_quest_ids(bits, graph) == ['first_steps', 'side_job']
+
+def test_save_and_load_bitsets(tmp_path):
+    """Test that a save written with a quest index loads back the same quests"""
+    char = character_manager.create_character("Bits", "Warrior")
+    quest_handler.accept_quest(char, 'first_steps', QUESTS)
+    quest_handler.complete_quest(char, 'first_steps', QUESTS)
+    quest_handler.accept_quest(char, 'goblin_hunter', QUESTS)
+    character_manager.save_character(char, str(tmp_path))
+
+    with open(tmp_path / "Bits_save.txt") as f:
+        text = f.read()
+    assert "COMPLETED_QUESTS: B:" in text
+
+    loaded = character_manager.load_character("Bits", str(tmp_path), quest_data_dict=QUESTS)
+    assert loaded['completed_quests'] == ['first_steps']
+    assert loaded['active_quests'] == ['goblin_hunter']
+
+def test_saves_survive_catalog_changes(tmp_path):
+    """Test that bitset saves load after quests are added, reordered or without a catalog"""
+    char = character_manager.create_character("Steady", "Mage")
+    quest_handler.accept_quest(char, 'side_job', QUESTS)
+    quest_handler.accept_quest(char, 'first_steps', QUESTS)
+    quest_handler.complete_quest(char, 'first_steps', QUESTS)
+    character_manager.save_character(char, str(tmp_path))
+
+    grown = dict(QUESTS)
+    grown['new_quest'] = {'quest_id': 'new_quest', 'required_level': 1, 'prerequisite': 'NONE'}
+    reversed_catalog = dict(reversed(list(QUESTS.items())))
+    for catalog in (None, grown, reversed_catalog):
+        loaded = character_manager.load_character("Steady", str(tmp_path), quest_data_dict=catalog)
+        assert loaded['active_quests'] == ['side_job']
+        assert loaded['completed_quests'] == ['first_steps']
+
+    # Later saves only append to the registry
+    other = character_manager.create_character("Later", "Rogue")
+    quest_handler.accept_quest(other, 'new_quest', grown)
+    quest_handler.accept_quest(other, 'side_job', grown)
+    character_manager.save_character(other, str(tmp_path))
+    assert (tmp_path / "quest_bits.txt").read_text().split() == ['side_job', 'first_steps', 'new_quest']
+    assert character_manager.load_character("Steady", str(tmp_path))['completed_quests'] == ['first_steps']
+
+def test_changed_registry_is_rejected(tmp_path):
+    """Test that a save is not decoded against a registry it wasn't written with"""
+    char = character_manager.create_character("Picky", "Mage")
+    quest_handler.accept_quest(char, 'side_job', QUESTS)
+    character_manager.save_character(char, str(tmp_path))
+
+    # As seen by a process that hasn't read the registry yet
+    (tmp_path / "quest_bits.txt").write_text("first_steps\n")
+    character_manager._quest_bit_registries.clear()
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.load_character("Picky", str(tmp_path))
+
+def test_legacy_catalog_saves(tmp_path):
+    """Test that saves from before the registry still load against their catalog"""
+    char = character_manager.create_character("Old", "Cleric")
+    character_manager.save_character(char, str(tmp_path))
+    graph = quest_handler.get_quest_graph(QUESTS)
+    bits = quest_handler.quest_ids_to_bits(['goblin_hunter'], graph)[0]
+    save_file = tmp_path / "Old_save.txt"
+    lines = [line for line in save_file.read_text().splitlines()
+             if not line.startswith(("QUEST_BITS", "ACTIVE_QUESTS"))]
+    lines += [f"QUEST_CATALOG: {graph['fingerprint']}", f"ACTIVE_QUESTS: {quest_handler.encode_quest_bits(bits)}"]
+    save_file.write_text("\n".join(lines) + "\n")
+
+    loaded = character_manager.load_character("Old", str(tmp_path), quest_data_dict=QUESTS)
+    assert loaded['active_quests'] == ['goblin_hunter']
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.load_character("Old", str(tmp_path))
+
+def test_saves_without_index_stay_plain(tmp_path):
+    """Test that characters without a quest index still save ID lists"""
+    char = character_manager.create_character("Plain", "Rogue")
+    char['completed_quests'] = ['first_steps']
+    character_manager.save_character(char, str(tmp_path))
+
+    loaded = character_manager.load_character("Plain", str(tmp_path))
+    assert loaded['completed_quests'] == ['first_steps']
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,116 @@
+"""
+Test Quest Graph
+Tests the precomputed prerequisite graph and memoized chains
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quest_handler
+from custom_exceptions import InvalidDataFormatError, QuestNotFoundError
+
+def make_quests(links):
+    """Build a quest catalog from {quest_id: prerequisite}"""
+    quests = {}
+    for quest_id in links:
+        quests[quest_id] = {'quest_id': quest_id, 'required_level': 1, 'prerequisite': links[quest_id]}
+    return quests
+
+def test_graph_order_and_depth():
+    """Test that prerequisites come first and depths count the chain"""
+    quests = make_quests({'c': 'b', 'b': 'a', 'a': 'NONE', 'd': 'a'})
+    graph = quest_handler.build_quest_graph(quests)
+
+    order = graph['order']
+    assert order.index('a') < order.index('b') < order.index('c')
+    assert graph['depth'] == {'a': 0, 'b': 1, 'c': 2, 'd': 1}
+    assert sorted(graph['unlocks']['a']) == ['b', 'd']
+
+def test_prerequisite_chain():
+    """Test that chains list the earliest prerequisite first"""
+    quests = make_quests({'a': 'NONE', 'b': 'a', 'c': 'b'})
+
+    assert quest_handler.get_quest_prerequisite_chain('c', quests) == ['a', 'b', 'c']
+    assert quest_handler.get_quest_prerequisite_chain('a', quests) == ['a']
+    assert quest_handler.get_quest_depth('c', quests) == 2
+
+def test_chain_is_memoized_and_copied():
+    """Test that chains are cached but callers get their own list"""
+    quests = make_quests({'a': 'NONE', 'b': 'a'})
+
+    first = quest_handler.get_quest_prerequisite_chain('b', quests)
+    first.append('tampered')
+
+    assert quest_handler.get_quest_prerequisite_chain('b', quests) == ['a', 'b']
+    assert 'b' in quest_handler.get_quest_graph(quests)['chains']
+
+def test_missing_prerequisite_is_marked():
+    """Test that a chain ending in an unknown quest is flagged"""
+    quests = make_quests({'b': 'ghost', 'c': 'b'})
+
+    chain = quest_handler.get_quest_prerequisite_chain('c', quests)
+    assert chain == ['INVALID_PREREQUISITE', 'ghost', 'b', 'c']
+
+def test_cycle_is_detected():
+    """Test that a prerequisite cycle raises instead of looping forever"""
+    quests = make_quests({'a': 'NONE', 'x': 'z', 'y': 'x', 'z': 'y', 'tail': 'x'})
+
+    with pytest.raises(InvalidDataFormatError):
+        quest_handler.build_quest_graph(quests)
+    with pytest.raises(InvalidDataFormatError):
+        quest_handler.get_quest_prerequisite_chain('tail', quests)
+
+def test_unknown_quest_raises():
+    """Test that asking about an unknown quest raises QuestNotFoundError"""
+    with pytest.raises(QuestNotFoundError):
+        quest_handler.get_quest_prerequisite_chain('nope', make_quests({'a': 'NONE'}))
+
+def test_deep_chain_builds_quickly():
+    """Test that a long chain is handled without recursion limits"""
+    links = {'q0': 'NONE'}
+    i = 1
+    while i < 20000:
+        links[f'q{i}'] = f'q{i - 1}'
+        i += 1
+    quests = make_quests(links)
+
+    graph = quest_handler.build_quest_graph(quests)
+    assert graph['depth']['q19999'] == 19999
+    assert len(quest_handler.get_quest_prerequisite_chain('q19999', quests)) == 20000
+
+def test_quests_by_level_range():
+    """Test that level range queries match a full scan"""
+    quests = {}
+    i = 0
+    while i < 50:
+        quests[f'q{i}'] = {'quest_id': f'q{i}', 'required_level': (i * 7) % 10 + 1, 'prerequisite': 'NONE'}
+        i += 1
+
+    found = quest_handler.get_quests_by_level(quests, 3, 5)
+    expected = [q for q in quests.values() if 3 <= q['required_level'] <= 5]
+
+    assert sorted(q['quest_id'] for q in found) == sorted(q['quest_id'] for q in expected)
+    assert [q['required_level'] for q in found] == sorted(q['required_level'] for q in found)
+    assert quest_handler.get_quests_by_level(quests, 11, 20) == []
+
+def test_quests_unlocking_at_level():
+    """Test the next-level preview only lists quests the character could take"""
+    quests = make_quests({'a': 'NONE', 'b': 'a', 'c': 'NONE', 'd': 'b'})
+    quests['b']['required_level'] = 2
+    quests['c']['required_level'] = 2
+    quests['d']['required_level'] = 2
+    char = {'level': 1, 'active_quests': [], 'completed_quests': [], 'experience': 0, 'gold': 0}
+
+    upcoming = quest_handler.get_quests_unlocking_at_level(char, quests, 2)
+    assert [q['quest_id'] for q in upcoming] == ['c']
+
+    quest_handler.accept_quest(char, 'a', quests)
+    quest_handler.complete_quest(char, 'a', quests)
+    upcoming = quest_handler.get_quests_unlocking_at_level(char, quests, 2)
+    assert [q['quest_id'] for q in upcoming] == ['b', 'c']
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
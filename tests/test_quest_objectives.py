@@ -0,0 +1,120 @@
+"""
+Test Quest Objectives
+Tests event-driven objective tracking through the event bus
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import event_bus
+import quest_handler
+import character_manager
+import inventory_system
+import combat_system
+from custom_exceptions import InvalidDataFormatError
+
+QUESTS = {
+    'goblin_hunter': {'quest_id': 'goblin_hunter', 'required_level': 1, 'prerequisite': 'NONE',
+                      'reward_xp': 100, 'reward_gold': 75, 'objective': 'enemy_defeated:goblin:3'},
+    'equipment_upgrade': {'quest_id': 'equipment_upgrade', 'required_level': 1, 'prerequisite': 'NONE',
+                          'reward_xp': 75, 'reward_gold': 50, 'objective': 'item_purchased:weapon|armor:1'},
+    'side_job': {'quest_id': 'side_job', 'required_level': 1, 'prerequisite': 'NONE',
+                 'reward_xp': 20, 'reward_gold': 10},
+}
+
+SWORD = {'ITEM_ID': 'iron_sword', 'NAME': 'Iron Sword', 'TYPE': 'weapon', 'EFFECT': 'strength:5', 'COST': '100'}
+
+@pytest.fixture(autouse=True)
+def objectives():
+    """Register the test catalog and clean up the bus afterwards"""
+    quest_handler.register_quest_objectives(QUESTS)
+    yield
+    quest_handler.unregister_quest_objectives()
+    event_bus.clear_subscribers()
+
+def test_parse_objective():
+    """Test objective parsing and validation"""
+    assert quest_handler.parse_quest_objective('item_purchased:Weapon|armor:1') == ('item_purchased', ('weapon', 'armor'), 1)
+
+    with pytest.raises(InvalidDataFormatError):
+        quest_handler.parse_quest_objective('enemy_defeated:goblin')
+    with pytest.raises(InvalidDataFormatError):
+        quest_handler.parse_quest_objective('dance:goblin:2')
+    with pytest.raises(InvalidDataFormatError):
+        quest_handler.parse_quest_objective('enemy_defeated:goblin:0')
+
+def test_bus_dispatches_by_key():
+    """Test that only handlers for the published key are called"""
+    calls = []
+    event_bus.subscribe(event_bus.ENEMY_DEFEATED, 'orc', lambda c, e, k, a: calls.append(k))
+
+    event_bus.emit(event_bus.ENEMY_DEFEATED, 'goblin', {})
+    event_bus.emit(event_bus.ENEMY_DEFEATED, 'orc', {})
+
+    assert calls == ['orc']
+
+def test_battle_victory_counts_toward_objective():
+    """Test that winning battles advances enemy objectives"""
+    char = character_manager.create_character("Hunter", "Warrior")
+    quest_handler.accept_quest(char, 'goblin_hunter', QUESTS)
+
+    battle = combat_system.SimpleBattle(char, combat_system.create_enemy('goblin'))
+    battle._handle_victory('player')
+    assert quest_handler.get_objective_progress(char, 'goblin_hunter', QUESTS) == (1, 3)
+
+    event_bus.emit(event_bus.ENEMY_DEFEATED, 'goblin', char, 5)
+    assert quest_handler.get_objective_progress(char, 'goblin_hunter', QUESTS) == (3, 3)
+    assert quest_handler.is_objective_complete(char, 'goblin_hunter', QUESTS)
+
+def test_inactive_quests_are_not_tracked():
+    """Test that events before accepting a quest don't count"""
+    char = character_manager.create_character("Late", "Rogue")
+    event_bus.emit(event_bus.ENEMY_DEFEATED, 'goblin', char)
+
+    quest_handler.accept_quest(char, 'goblin_hunter', QUESTS)
+    assert quest_handler.get_objective_progress(char, 'goblin_hunter', QUESTS) == (0, 3)
+
+def test_purchase_by_item_type():
+    """Test that shop events match objectives on item type"""
+    char = character_manager.create_character("Shopper", "Mage")
+    char['gold'] = 500
+    quest_handler.accept_quest(char, 'equipment_upgrade', QUESTS)
+
+    inventory_system.purchase_item(char, 'iron_sword', SWORD, character_manager.add_gold)
+
+    assert quest_handler.is_objective_complete(char, 'equipment_upgrade', QUESTS)
+
+def test_item_event_counts_once_per_quest():
+    """Test that an objective naming an item and its type counts one purchase once"""
+    quests = dict(QUESTS)
+    quests['arms_dealer'] = {'quest_id': 'arms_dealer', 'required_level': 1, 'prerequisite': 'NONE',
+                             'reward_xp': 30, 'reward_gold': 20, 'objective': 'item_purchased:iron_sword|weapon:2'}
+    quest_handler.register_quest_objectives(quests)
+    char = character_manager.create_character("Dealer", "Rogue")
+    char['gold'] = 500
+    quest_handler.accept_quest(char, 'arms_dealer', quests)
+    quest_handler.accept_quest(char, 'equipment_upgrade', quests)
+
+    inventory_system.purchase_item(char, 'iron_sword', SWORD, character_manager.add_gold)
+
+    assert quest_handler.get_objective_progress(char, 'arms_dealer', quests) == (1, 2)
+    assert quest_handler.is_objective_complete(char, 'equipment_upgrade', quests)
+
+def test_progress_cleared_and_saved(tmp_path):
+    """Test that counters survive a save and are dropped on completion"""
+    char = character_manager.create_character("Saver", "Cleric")
+    quest_handler.accept_quest(char, 'goblin_hunter', QUESTS)
+    event_bus.emit(event_bus.ENEMY_DEFEATED, 'goblin', char, 2)
+    character_manager.save_character(char, str(tmp_path))
+
+    loaded = character_manager.load_character("Saver", str(tmp_path), quest_data_dict=QUESTS)
+    assert loaded['quest_progress'] == {'goblin_hunter': 2}
+
+    quest_handler.complete_quest(loaded, 'goblin_hunter', QUESTS)
+    assert loaded['quest_progress'] == {}
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
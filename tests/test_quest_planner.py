@@ -0,0 +1,81 @@
+"""
+Test Quest Planner
+Tests route planning toward a target quest
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quest_planner
+import character_manager
+from custom_exceptions import QuestNotFoundError, QuestRequirementsNotMetError
+
+QUESTS = {
+    'first_steps': {'quest_id': 'first_steps', 'required_level': 1, 'prerequisite': 'NONE', 'reward_xp': 50},
+    'goblin_hunter': {'quest_id': 'goblin_hunter', 'required_level': 2, 'prerequisite': 'first_steps', 'reward_xp': 100},
+    'orc_menace': {'quest_id': 'orc_menace', 'required_level': 3, 'prerequisite': 'goblin_hunter', 'reward_xp': 200},
+    'side_job': {'quest_id': 'side_job', 'required_level': 1, 'prerequisite': 'NONE', 'reward_xp': 500},
+    'lost': {'quest_id': 'lost', 'required_level': 1, 'prerequisite': 'ghost', 'reward_xp': 10},
+}
+
+def new_char(level=1, experience=0):
+    return {'level': level, 'experience': experience, 'active_quests': [], 'completed_quests': []}
+
+def test_route_follows_chain_and_level_curve():
+    """Test quests, order and the extra XP needed before each one"""
+    plan = quest_planner.plan_quest_route(new_char(), 'orc_menace', QUESTS)
+
+    assert plan['quests'] == ['first_steps', 'goblin_hunter']
+    assert [step['extra_xp'] for step in plan['steps']] == [0, 50, 100]
+    assert plan['extra_xp_needed'] == 150
+    assert plan['quest_xp'] == 150
+    assert plan['unlock_level'] == 3
+
+def test_plan_matches_gain_experience():
+    """Test that following the plan with the real level curve unlocks the target"""
+    char = character_manager.create_character("Planner", "Warrior")
+    plan = quest_planner.plan_quest_route(char, 'orc_menace', QUESTS)
+
+    i = 0
+    while i < len(plan['steps']):
+        step = plan['steps'][i]
+        character_manager.gain_experience(char, step['extra_xp'])
+        assert char['level'] >= step['required_level']
+        assert char['level'] == step['level']
+        if step['quest_id'] != 'orc_menace':
+            character_manager.gain_experience(char, step['reward_xp'])
+        i += 1
+
+def test_completed_prefix_is_skipped():
+    """Test that finished prerequisites drop out of the route"""
+    char = new_char(level=2)
+    char['completed_quests'] = ['first_steps']
+    plan = quest_planner.plan_quest_route(char, 'orc_menace', QUESTS)
+
+    assert plan['quests'] == ['goblin_hunter']
+    assert quest_planner.get_xp_to_unlock(char, 'orc_menace', QUESTS) == 100
+
+    char['completed_quests'] = ['first_steps', 'goblin_hunter', 'orc_menace']
+    assert quest_planner.plan_quest_route(char, 'orc_menace', QUESTS)['already_completed']
+
+def test_plans_are_memoized_but_copied():
+    """Test that repeated queries reuse the cache without sharing results"""
+    first = quest_planner.plan_quest_route(new_char(), 'orc_menace', QUESTS)
+    first['quests'].append('tampered')
+
+    second = quest_planner.plan_quest_route(new_char(), 'orc_menace', QUESTS)
+    assert second['quests'] == ['first_steps', 'goblin_hunter']
+    assert len(quest_planner._planner_cache['plans']) >= 1
+
+def test_planner_errors():
+    """Test unknown and unreachable targets"""
+    with pytest.raises(QuestNotFoundError):
+        quest_planner.plan_quest_route(new_char(), 'nope', QUESTS)
+    with pytest.raises(QuestRequirementsNotMetError):
+        quest_planner.plan_quest_route(new_char(), 'lost', QUESTS)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
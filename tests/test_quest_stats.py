@@ -0,0 +1,81 @@
+"""
+Test Quest Statistics
+Tests the running quest totals kept by complete_quest
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quest_handler
+import character_manager
+
+QUESTS = {
+    'first_steps': {'quest_id': 'first_steps', 'required_level': 1, 'prerequisite': 'NONE',
+                    'reward_xp': 50, 'reward_gold': 25},
+    'side_job': {'quest_id': 'side_job', 'required_level': 1, 'prerequisite': 'NONE',
+                 'reward_xp': 20, 'reward_gold': 10},
+}
+
+def finish(char, quest_id):
+    quest_handler.accept_quest(char, quest_id, QUESTS)
+    quest_handler.complete_quest(char, quest_id, QUESTS)
+
+def test_totals_follow_completions():
+    """Test that completing quests updates the running totals"""
+    char = character_manager.create_character("Counter", "Warrior")
+    finish(char, 'first_steps')
+    finish(char, 'side_job')
+
+    assert char['quest_stats'] == {'total_xp': 70, 'total_gold': 35, 'completed': 2}
+    assert quest_handler.get_total_quest_rewards_earned(char, QUESTS) == {'total_xp': 70, 'total_gold': 35}
+    assert quest_handler.get_quest_completion_percentage(char, QUESTS) == 100.0
+
+def test_stale_totals_are_rebuilt():
+    """Test that editing the completed list directly triggers a rebuild"""
+    char = {'level': 1, 'active_quests': [], 'completed_quests': ['side_job'],
+            'quest_stats': {'total_xp': 0, 'total_gold': 0, 'completed': 0}}
+
+    assert quest_handler.get_quest_stats(char, QUESTS) == {'total_xp': 20, 'total_gold': 10, 'completed': 1}
+
+def test_replaced_list_of_same_length_is_rebuilt():
+    """Test that totals follow a completed list swapped for one of the same length"""
+    char = character_manager.create_character("Swapper", "Warrior")
+    finish(char, 'first_steps')
+    char['completed_quests'] = ['side_job']
+
+    assert quest_handler.get_quest_stats(char, QUESTS) == {'total_xp': 20, 'total_gold': 10, 'completed': 1}
+
+def test_verify_detects_mismatch():
+    """Test that verification rebuilds and reports tampered totals"""
+    char = character_manager.create_character("Auditor", "Mage")
+    finish(char, 'first_steps')
+    assert quest_handler.verify_quest_stats(char, QUESTS)
+
+    char['quest_stats']['total_gold'] = 9999
+    assert not quest_handler.verify_quest_stats(char, QUESTS)
+    assert char['quest_stats']['total_gold'] == 25
+
+def test_totals_saved_and_loaded(tmp_path):
+    """Test that totals round-trip through the save file"""
+    char = character_manager.create_character("Keeper", "Rogue")
+    finish(char, 'side_job')
+    character_manager.save_character(char, str(tmp_path))
+
+    loaded = character_manager.load_character("Keeper", str(tmp_path), quest_data_dict=QUESTS)
+    assert loaded['quest_stats'] == {'total_xp': 20, 'total_gold': 10, 'completed': 1}
+
+def test_old_saves_rebuild_totals(tmp_path):
+    """Test that saves without QUEST_STATS get totals from quest history"""
+    char = character_manager.create_character("Veteran", "Cleric")
+    char['completed_quests'] = ['first_steps']
+    char['quest_stats'] = None
+    character_manager.save_character(char, str(tmp_path))
+
+    loaded = character_manager.load_character("Veteran", str(tmp_path), quest_data_dict=QUESTS)
+    assert loaded['quest_stats'] == {'total_xp': 50, 'total_gold': 25, 'completed': 1}
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,102 @@
+"""
+Test Renderer
+Tests the text, buffered, silent and JSON-lines output modes
+"""
+
+import io
+import json
+import pytest
+import sys
+import os
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import renderer
+import combat_system
+import quest_handler
+
+@pytest.fixture(autouse=True)
+def restore_renderer():
+    yield
+    renderer.set_renderer(None, this_thread=True)
+    renderer.set_renderer(None)
+
+def use(mode, **options):
+    stream = io.StringIO()
+    renderer.set_renderer(renderer.new_renderer(mode, stream, **options))
+    return stream
+
+def test_text_mode_matches_print():
+    """Test that text mode writes exactly what print() would"""
+    stream = use("text")
+    combat_system.display_battle_log("Hello")
+    renderer.line("Menu", end="")
+
+    assert stream.getvalue() == ">>> Hello\nMenu"
+
+def test_buffered_mode():
+    """Test that buffered output is held until flushed or the buffer fills"""
+    stream = use("buffered", flush_at=20)
+    renderer.line("short")
+    assert stream.getvalue() == ""
+
+    renderer.line("a much longer line of text")
+    assert stream.getvalue() == "short\na much longer line of text\n"
+
+    renderer.line("tail")
+    renderer.flush()
+    assert stream.getvalue().endswith("tail\n")
+
+def test_silent_mode():
+    """Test that silent mode drops everything but still counts outputs"""
+    stream = use("silent")
+    quest_handler.display_quest_list([{'quest_id': 'q', 'title': 'Q'}])
+    renderer.line("gone")
+    renderer.flush()
+
+    assert stream.getvalue() == ""
+    assert not renderer.enabled()
+    assert renderer.get_renderer()['events'] == 1
+
+def test_jsonl_mode():
+    """Test that display functions emit one structured event per call"""
+    stream = use("jsonl")
+    character = {'name': 'Hero', 'class': 'Warrior', 'health': 50, 'max_health': 100}
+    enemy = {'name': 'Goblin', 'health': 10, 'max_health': 50}
+    combat_system.display_combat_stats(character, enemy)
+    quest_handler.display_quest_list([{'quest_id': 'q1', 'title': 'One'}, {'quest_id': 'q2', 'title': 'Two'}])
+    renderer.line("plain")
+    renderer.flush()
+
+    events = [json.loads(text) for text in stream.getvalue().splitlines()]
+    assert [e['event'] for e in events] == ['combat_stats', 'quest_list', 'text']
+    assert events[0]['enemy_health'] == 10
+    assert events[1]['quests'] == ['q1', 'q2']
+    assert events[2]['text'] == "plain"
+
+def test_per_thread_renderers():
+    """Test that a thread's own renderer doesn't capture other threads' output"""
+    shared = use("buffered")
+    mine = io.StringIO()
+
+    def worker():
+        renderer.set_renderer(renderer.new_renderer("text", mine), this_thread=True)
+        renderer.line("worker")
+        renderer.set_renderer(None, this_thread=True)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    renderer.line("main")
+    renderer.flush()
+
+    assert mine.getvalue() == "worker\n"
+    assert shared.getvalue() == "main\n"
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        renderer.new_renderer("loud")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,166 @@
+"""
+Test Status Effects
+Tests effect ticking and expiry on the timer wheel, and status effects in SimpleBattle
+"""
+
+import copy
+import random
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import battle_log
+import character_manager
+import combat_system
+import status_effects
+from custom_exceptions import InvalidTargetError
+
+pytestmark = pytest.mark.usefixtures("silent_output")
+
+def dummy(name, health=1000):
+    return {'name': name, 'health': health, 'max_health': health, 'strength': 10, 'magic': 5}
+
+def test_effects_last_their_duration():
+    """Test that ticks land once per active turn and stats revert on expiry"""
+    engine = status_effects.StatusEngine()
+    target = dummy("Target")
+    engine.apply(target, 'poison', duration=3, amount=7)
+    engine.apply(target, 'strength_up')
+    engine.apply(target, 'stun', duration=2)
+    assert target['strength'] == 15 and target['derived_stats'] is None
+
+    healths = []
+    stunned = []
+    i = 0
+    while i < 5:
+        engine.advance()
+        healths.append(target['health'])
+        stunned.append(engine.is_stunned(target))
+        i += 1
+
+    assert healths == [993, 986, 979, 979, 979]
+    assert stunned == [True, True, False, False, False]
+    assert target['strength'] == 10
+    assert engine.active == 0 and engine.over_time == {} and engine.stuns == {}
+
+def test_stacks_net_out_and_clamp():
+    """Test that stacked poison and regen tick as one change, within health limits"""
+    engine = status_effects.StatusEngine()
+    target = dummy("Target", health=100)
+    target['health'] = 98
+    engine.apply(target, 'poison', duration=2, amount=5)
+    engine.apply(target, 'regen', duration=4, amount=5)
+    engine.apply(target, 'regen', duration=4, amount=5)
+
+    assert engine.advance() == [(target, 2)]
+    assert engine.advance() == []
+    assert engine.advance() == []
+    assert target['health'] == 100
+    assert engine.health_per_turn(target) == 10
+
+    with pytest.raises(ValueError):
+        engine.apply(target, 'curse')
+    with pytest.raises(ValueError):
+        engine.apply(target, 'poison', duration=0)
+
+def test_long_effects_wait_out_wheel_laps():
+    """Test that durations past the wheel size expire on the right turn"""
+    engine = status_effects.StatusEngine(wheel_size=4)
+    target = dummy("Target")
+    engine.apply(target, 'magic_up', duration=10, amount=1)
+    engine.apply(target, 'magic_up', duration=4, amount=1)
+    engine.apply(target, 'magic_up', duration=1, amount=1)
+
+    magic = []
+    i = 0
+    while i < 12:
+        engine.advance()
+        magic.append(target['magic'])
+        i += 1
+    assert magic == [8, 7, 7, 7, 6, 6, 6, 6, 6, 6, 5, 5]
+
+def test_expiry_only_touches_due_buckets():
+    """Test that a turn looks at the effects ending then, not all active ones"""
+    engine = status_effects.StatusEngine()
+    target = dummy("Target", health=10 ** 9)
+    i = 0
+    while i < 5000:
+        engine.apply(target, 'poison', duration=50, amount=1)
+        i += 1
+    engine.apply(target, 'stun', duration=1)
+
+    engine.advance()
+    assert engine.advance() == [(target, -5000)]
+    assert not engine.is_stunned(target)
+    assert sum(len(bucket) for bucket in engine.wheel) == 5000
+    assert len(engine.over_time) == 1
+
+def test_battle_ticks_stuns_and_logs():
+    """Test that a poisoned, stunned enemy loses turns and the log replays it"""
+    character = character_manager.create_character("Hero", "Warrior")
+    enemy = combat_system.create_enemy("orc")
+    battle = combat_system.SimpleBattle(character, enemy)
+    start = copy.deepcopy(character)
+
+    with pytest.raises(InvalidTargetError):
+        battle.apply_status(dummy("Bystander"), 'poison')
+
+    battle.apply_status(enemy, 'poison', duration=20, amount=10)
+    battle.apply_status(enemy, 'stun', duration=20)
+    result = battle.start_battle()
+
+    assert result['winner'] == 'player'
+    assert character['health'] == start['health']
+    replayed = battle_log.replay(battle.log)
+    assert [combatant['health'] for combatant in replayed['combatants']] == [character['health'], 0]
+    kinds = [kind for kind, actor, fields in battle_log.iter_events(battle.log)]
+    assert kinds.count(battle_log.DAMAGE) == battle.turn_counter
+
+def test_status_applied_mid_battle_is_logged():
+    """Test that effects started in a battle get STATUS events and ticks end battles"""
+    character = character_manager.create_character("Hero", "Mage")
+    enemy = combat_system.create_enemy("goblin")
+    battle = combat_system.SimpleBattle(character, enemy)
+    battle.log = battle_log.start_log([character, enemy])
+    battle.combat_active = True
+
+    amount = enemy['health']
+    battle.apply_status(enemy, 'poison', duration=5, amount=amount)
+    events = list(battle_log.iter_events(battle.log))
+    assert events[-1] == (battle_log.STATUS, 1,
+                          (1, status_effects.STATUS_NUMBERS['poison'], 5, battle_log.signed(amount)))
+
+    result = battle._play_turn()
+    assert result['winner'] == 'player'
+    assert enemy['health'] == 0
+
+class RunAway:
+    """Player policy that always runs"""
+    def choose_action(self, battle, side):
+        return '3'
+
+def test_stat_effects_end_with_the_battle():
+    """Test that buffs still active when a battle is won, lost or fled are undone"""
+    random.seed(163)
+    setups = [("goblin", None, 'player'), ("dragon", None, 'enemy'), ("dragon", RunAway(), 'none')]
+    for enemy_type, policy, winner in setups:
+        character = character_manager.create_character("Hero", "Warrior")
+        strength = character['strength']
+        reduction = character_manager.get_derived_stats(character)['damage_reduction']
+        enemy = combat_system.create_enemy(enemy_type)
+        enemy_magic = enemy['magic']
+        battle = combat_system.SimpleBattle(character, enemy, player_policy=policy)
+        battle.apply_status(character, 'strength_up', duration=10)
+        battle.apply_status(enemy, 'magic_up', duration=500)
+        battle.apply_status(enemy, 'poison', duration=500, amount=1)
+
+        assert battle.start_battle()['winner'] == winner
+        assert character['strength'] == strength
+        assert enemy['magic'] == enemy_magic
+        assert character_manager.get_derived_stats(character)['damage_reduction'] == reduction
+        assert battle.status.active == 0 and battle.status.over_time == {}
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])